@@ -0,0 +1,62 @@
+"""Benchmarks for building graphs out of many ``dask.delayed`` calls"""
+from __future__ import annotations
+
+from dask import delayed
+
+
+def f(*args):
+    return None
+
+
+def arguments(ncalls):
+    """Moderately sized arguments: scalars, a short list and a small dict"""
+    return [(i, f"x-{i}", [i, i + 1, i + 2], {"a": i, "b": 2.0}) for i in range(ncalls)]
+
+
+class DelayedCalls:
+    """Calling a delayed function in a loop versus ``delayed.map``"""
+
+    params = (["loop", "map"], [False, True], [10_000, 100_000])
+    param_names = ["method", "pure", "ncalls"]
+    timeout = 300
+
+    def setup(self, method, pure, ncalls):
+        self.args = arguments(ncalls)
+
+    def time_build(self, method, pure, ncalls):
+        if method == "loop":
+            g = delayed(f, pure=pure)
+            [g(*args) for args in self.args]
+        else:
+            delayed.map(f, *zip(*self.args), pure=pure)
+
+
+class DelayedChain:
+    """Calls that each take the result of the previous one"""
+
+    params = [1_000, 10_000]
+    param_names = ["ncalls"]
+
+    def time_build(self, ncalls):
+        g = delayed(f)
+        x = g(0)
+        for i in range(ncalls):
+            x = g(x, i)
+
+
+if __name__ == "__main__":
+    import sys
+    from time import perf_counter
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    bench = DelayedCalls()
+    for method in ["loop", "map"]:
+        for pure in [False, True]:
+            bench.setup(method, pure, n)
+            start = perf_counter()
+            bench.time_build(method, pure, n)
+            duration = perf_counter() - start
+            print(
+                f"{method:>5} pure={pure!s:>5}: {duration:6.2f} s, "
+                f"{duration / n * 1e6:5.1f} us/call"
+            )
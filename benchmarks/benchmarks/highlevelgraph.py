@@ -0,0 +1,131 @@
+"""Benchmarks for building, culling and optimizing high level graphs"""
+from __future__ import annotations
+
+
+def flatten_keys(x):
+    from dask.core import flatten
+
+    return flatten(x.__dask_keys__())
+
+
+def overlap(nchunks):
+    import dask.array as da
+    from dask.array.overlap import overlap_internal
+
+    side = int(nchunks**0.5)
+    x = da.ones((side, side), chunks=1)
+    return overlap_internal(x, {0: 1, 1: 1}) + 1
+
+
+def shuffle(nchunks):
+    import pandas as pd
+
+    import dask.dataframe as dd
+    from dask.dataframe.shuffle import shuffle
+
+    df = pd.DataFrame({"x": range(nchunks)})
+    return shuffle(dd.from_pandas(df, npartitions=nchunks), "x", shuffle="tasks")
+
+
+def tree_reduction(nchunks):
+    import pandas as pd
+
+    import dask.dataframe as dd
+
+    df = pd.DataFrame({"x": range(nchunks)})
+    return dd.from_pandas(df, npartitions=nchunks).x.sum(split_every=8)
+
+
+collections = {"overlap": overlap, "shuffle": shuffle, "tree": tree_reduction}
+
+
+class Cull:
+    """Cull a large graph down to a single output key
+
+    This should take time proportional to the part of the graph that is kept.
+    """
+
+    params = (list(collections), [10_000, 250_000])
+    param_names = ["collection", "nchunks"]
+    timeout = 300
+
+    def setup(self, collection, nchunks):
+        if collection == "shuffle" and nchunks > 10_000:
+            # The number of tasks grows quadratically
+            raise NotImplementedError
+        x = collections[collection](nchunks)
+        self.dsk = x.__dask_graph__()
+        self.key = next(iter(flatten_keys(x)))
+
+    def time_cull(self, collection, nchunks):
+        self.dsk.cull({self.key})
+
+
+def elementwise(nchunks, depth=20):
+    """``depth`` elementwise operations on an array with ``nchunks`` chunks"""
+    import dask.array as da
+
+    x = da.ones(nchunks, chunks=1)
+    for i in range(depth):
+        x = x + i
+    return x
+
+
+class Construct:
+    """Building a high level graph out of a chain of Blockwise layers"""
+
+    params = [10_000, 250_000]
+    param_names = ["nchunks"]
+
+    def time_construct(self, nchunks):
+        elementwise(nchunks)
+
+
+class OptimizeBlockwise:
+    """Fusing a chain of Blockwise layers, then materializing the result"""
+
+    params = [10_000, 250_000]
+    param_names = ["nchunks"]
+    timeout = 300
+
+    def setup(self, nchunks):
+        from dask.blockwise import optimize_blockwise
+
+        x = elementwise(nchunks)
+        self.dsk = x.__dask_graph__()
+        self.keys = list(flatten_keys(x))
+        self.fused = optimize_blockwise(self.dsk, keys=self.keys)
+
+    def time_optimize_blockwise(self, nchunks):
+        from dask.blockwise import optimize_blockwise
+
+        optimize_blockwise(self.dsk, keys=self.keys)
+
+    def time_materialize(self, nchunks):
+        dict(self.fused)
+
+
+if __name__ == "__main__":
+    import sys
+    from time import perf_counter
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 250_000
+    bench = Cull()
+    for collection in collections:
+        try:
+            bench.setup(collection, n)
+        except NotImplementedError:
+            continue
+        start = perf_counter()
+        bench.time_cull(collection, n)
+        print(f"{collection:>10}: {perf_counter() - start:6.3f} s")
+
+    start = perf_counter()
+    elementwise(n)
+    print(f"{'construct':>10}: {perf_counter() - start:6.3f} s")
+    bench = OptimizeBlockwise()
+    bench.setup(n)
+    for name in ["optimize_blockwise", "materialize"]:
+        start = perf_counter()
+        getattr(bench, f"time_{name}")(n)
+        print(f"{name:>10}: {perf_counter() - start:6.3f} s")
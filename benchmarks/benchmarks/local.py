@@ -0,0 +1,104 @@
+"""Benchmarks for the single-machine schedulers in ``dask.local``"""
+from __future__ import annotations
+
+from time import perf_counter
+
+import dask
+from dask.local import _start_state, get_sync
+from dask.threaded import get, get_stealing
+
+schedulers = {"sync": get_sync, "threads": get, "work-stealing": get_stealing}
+
+
+def noop(*args):
+    return None
+
+
+def embarrassingly_parallel(n):
+    dsk = {("x", i): (noop, i) for i in range(n)}
+    dsk["out"] = (noop, list(dsk))
+    return dsk
+
+
+def chains(n, width=100):
+    """``width`` independent linear chains, ``n`` tasks in total"""
+    depth = max(n // width, 1)
+    dsk = {}
+    for i in range(width):
+        dsk[("x", i, 0)] = (noop, i)
+        for j in range(1, depth):
+            dsk[("x", i, j)] = (noop, ("x", i, j - 1))
+    dsk["out"] = (noop, [("x", i, depth - 1) for i in range(width)])
+    return dsk
+
+
+def tree(n, split=4):
+    """A tree reduction over ``n`` leaves"""
+    dsk = {("x", 0, i): (noop, i) for i in range(n)}
+    level, width = 0, n
+    while width > 1:
+        nwidth = -(width // -split)
+        for i in range(nwidth):
+            deps = [
+                ("x", level, j) for j in range(i * split, min((i + 1) * split, width))
+            ]
+            dsk[("x", level + 1, i)] = (noop, deps)
+        level, width = level + 1, nwidth
+    dsk["out"] = (noop, ("x", level, 0))
+    return dsk
+
+
+graphs = {"parallel": embarrassingly_parallel, "chains": chains, "tree": tree}
+
+
+class SchedulerOverhead:
+    """Per-task overhead of the local schedulers on graphs of no-op tasks"""
+
+    params = (list(graphs), list(schedulers), [10_000])
+    param_names = ["graph", "scheduler", "ntasks"]
+    timeout = 120
+
+    def setup(self, graph, scheduler, ntasks):
+        self.dsk = graphs[graph](ntasks)
+        self.get = schedulers[scheduler]
+
+    def time_get(self, graph, scheduler, ntasks):
+        self.get(self.dsk, "out")
+
+    def track_tasks_per_second(self, graph, scheduler, ntasks):
+        start = perf_counter()
+        self.get(self.dsk, "out")
+        return len(self.dsk) / (perf_counter() - start)
+
+    track_tasks_per_second.unit = "tasks/s"
+
+
+class StartState:
+    """Startup cost of the scheduler state, with and without compact state"""
+
+    params = ([False, True], [100_000])
+    param_names = ["compact", "ntasks"]
+    timeout = 300
+
+    def setup(self, compact, ntasks):
+        self.dsk = tree(ntasks)
+
+    def time_start_state(self, compact, ntasks):
+        with dask.config.set({"local-scheduler.compact-state": compact}):
+            _start_state(self.dsk, None)
+
+    def peakmem_start_state(self, compact, ntasks):
+        with dask.config.set({"local-scheduler.compact-state": compact}):
+            _start_state(self.dsk, None)
+
+
+if __name__ == "__main__":
+    import sys
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    bench = SchedulerOverhead()
+    for graph in graphs:
+        for scheduler in schedulers:
+            bench.setup(graph, scheduler, n)
+            rate = bench.track_tasks_per_second(graph, scheduler, n)
+            print(f"{graph:>10} {scheduler:>14}: {rate:>12,.0f} tasks/s")
@@ -0,0 +1,58 @@
+"""Benchmarks for the low-level graph optimizations in ``dask.optimization``"""
+from __future__ import annotations
+
+
+def bag(npartitions):
+    import dask.bag as db
+
+    b = db.from_sequence(range(npartitions), npartitions=npartitions)
+    return b.map(abs).filter(bool).map(str), {}
+
+
+def dataframe(npartitions):
+    import pandas as pd
+
+    import dask.dataframe as dd
+
+    df = dd.from_pandas(pd.DataFrame({"x": range(npartitions)}), npartitions)
+    # As in ``dask.dataframe.optimize`` when low-level fusion is turned on
+    return (df.x + 1).map_partitions(abs) * 2, {"fuse_subgraphs": True}
+
+
+collections = {"bag": bag, "dataframe": dataframe}
+
+
+class Fuse:
+    """Low-level fusion of linear pipelines over many partitions"""
+
+    params = (list(collections), [10_000, 200_000])
+    param_names = ["collection", "npartitions"]
+    timeout = 300
+
+    def setup(self, collection, npartitions):
+        import dask
+        from dask.optimization import cull
+
+        x, self.kwargs = collections[collection](npartitions)
+        self.keys = x.__dask_keys__()
+        with dask.config.set({"optimization.fuse.active": False}):
+            dsk = x.__dask_optimize__(x.__dask_graph__(), self.keys)
+        self.dsk, self.dependencies = cull(dict(dsk), self.keys)
+
+    def time_fuse(self, collection, npartitions):
+        from dask.optimization import fuse
+
+        fuse(self.dsk, self.keys, self.dependencies, **self.kwargs)
+
+
+if __name__ == "__main__":
+    import sys
+    from time import perf_counter
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    bench = Fuse()
+    for collection in collections:
+        bench.setup(collection, n)
+        start = perf_counter()
+        bench.time_fuse(collection, n)
+        print(f"{collection:>10}: {perf_counter() - start:6.2f} s")
@@ -0,0 +1,105 @@
+"""Benchmarks for the static task ordering in ``dask.order``"""
+from __future__ import annotations
+
+from dask.core import get_deps
+from dask.order import order, simulate
+
+
+def noop(*args):
+    return None
+
+
+def tree(n, split=4):
+    """A tree reduction over ``n`` leaves"""
+    dsk = {("x", 0, i): (noop, i) for i in range(n)}
+    level, width = 0, n
+    while width > 1:
+        nwidth = -(width // -split)
+        for i in range(nwidth):
+            deps = [
+                ("x", level, j) for j in range(i * split, min((i + 1) * split, width))
+            ]
+            dsk[("x", level + 1, i)] = (noop, deps)
+        level, width = level + 1, nwidth
+    return dsk
+
+
+def stencil(n, depth=10):
+    """``depth`` layers of tasks that each depend on three neighbors below"""
+    width = max(n // depth, 1)
+    dsk = {("x", 0, i): (noop, i) for i in range(width)}
+    for j in range(1, depth):
+        for i in range(width):
+            deps = [("x", j - 1, k) for k in (i - 1, i, i + 1) if 0 <= k < width]
+            dsk[("x", j, i)] = (noop, deps)
+    return dsk
+
+
+def chains(n, width=100):
+    """``width`` independent linear chains, ``n`` tasks in total"""
+    depth = max(n // width, 1)
+    dsk = {}
+    for i in range(width):
+        dsk[("x", i, 0)] = (noop, i)
+        for j in range(1, depth):
+            dsk[("x", i, j)] = (noop, ("x", i, j - 1))
+    return dsk
+
+
+graphs = {"tree": tree, "stencil": stencil, "chains": chains}
+
+
+class Order:
+    """Time to order graphs of a million tasks"""
+
+    params = (list(graphs), [100_000, 1_000_000])
+    param_names = ["graph", "ntasks"]
+    timeout = 600
+
+    def setup(self, graph, ntasks):
+        self.dsk = graphs[graph](ntasks)
+        self.dependencies, _ = get_deps(self.dsk)
+
+    def time_order(self, graph, ntasks):
+        order(self.dsk, dependencies=self.dependencies)
+
+    def peakmem_order(self, graph, ntasks):
+        order(self.dsk, dependencies=self.dependencies)
+
+
+class OrderQuality:
+    """Simulated peak memory and makespan of the ordering with four workers
+
+    These don't depend on the machine, so changes point at the ordering.
+    """
+
+    params = (list(graphs), [10_000])
+    param_names = ["graph", "ntasks"]
+
+    def setup(self, graph, ntasks):
+        self.info = simulate(graphs[graph](ntasks), num_workers=4)
+
+    def track_peak_memory(self, graph, ntasks):
+        return self.info.peak_memory
+
+    track_peak_memory.unit = "results"
+
+    def track_makespan(self, graph, ntasks):
+        return self.info.makespan
+
+    track_makespan.unit = "tasks"
+
+
+if __name__ == "__main__":
+    import sys
+    from time import perf_counter
+
+    # Pass 10_000_000 to check that the cost stays linear
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    bench = Order()
+    for graph in graphs:
+        bench.setup(graph, n)
+        start = perf_counter()
+        bench.time_order(graph, n)
+        duration = perf_counter() - start
+        print(f"{graph:>10}: {duration:6.2f} s, {duration / n * 1e6:5.2f} us/task")
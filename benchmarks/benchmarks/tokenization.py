@@ -0,0 +1,131 @@
+"""Benchmarks for ``dask.base.tokenize`` of large NumPy and pandas objects"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+import dask
+from dask.base import normalize_token, tokenize
+from dask.hashing import new_hasher, streaming_hashers
+
+modes = {
+    "full": {"tokenize.chunk-size": None},
+    "chunked": {},
+    "sampled": {"tokenize.sample": True},
+}
+
+
+def make_array(nbytes):
+    return np.random.default_rng(0).random(nbytes // 8)
+
+
+def make_dataframe(nbytes):
+    x = make_array(nbytes // 2)
+    return pd.DataFrame({"a": x, "b": x.astype("i8")})
+
+
+objects = {"array": make_array, "dataframe": make_dataframe}
+
+
+class Tokenize:
+    """Time to tokenize large arrays and DataFrames, by size"""
+
+    params = (list(objects), list(modes), [10**6, 10**8, 10**9])
+    param_names = ["object", "mode", "nbytes"]
+    timeout = 300
+
+    def setup(self, obj, mode, nbytes):
+        self.obj = objects[obj](nbytes)
+
+    def time_tokenize(self, obj, mode, nbytes):
+        with dask.config.set(modes[mode]):
+            tokenize(self.obj)
+
+
+class TokenizeCached:
+    """Time to tokenize a read-only array a second time"""
+
+    params = [10**6, 10**9]
+    param_names = ["nbytes"]
+
+    def setup(self, nbytes):
+        self.x = make_array(nbytes)
+        self.x.flags.writeable = False
+        tokenize(self.x)
+
+    def time_tokenize(self, nbytes):
+        tokenize(self.x)
+
+
+def inc(x):
+    return x + 1
+
+
+small = {
+    "int": lambda: 1,
+    "str": lambda: "x" * 100,
+    "key": lambda: ("x-" + "0" * 32, 1, 2),
+    "list": lambda: list(range(1000)),
+    "dict": lambda: {str(i): i for i in range(100)},
+    "function": lambda: inc,
+    "array": lambda: np.arange(1000),
+    "dict-of-arrays": lambda: {str(i): np.arange(100) for i in range(100)},
+    "series": lambda: pd.Series(np.arange(1000)),
+    "wide-dataframe": lambda: pd.DataFrame(
+        {str(i): np.arange(100, dtype=["i8", "f8"][i % 2]) for i in range(100)}
+    ),
+}
+
+
+class NormalizeToken:
+    """Time to tokenize common small objects"""
+
+    params = [list(small)]
+    param_names = ["object"]
+
+    def setup(self, obj):
+        self.obj = small[obj]()
+        normalize_token(self.obj)  # register lazy types
+
+    def time_tokenize(self, obj):
+        tokenize(self.obj)
+
+
+class HashBuffer:
+    """Throughput of the streaming hashers"""
+
+    params = (list(streaming_hashers), [10**3, 10**6, 10**8])
+    param_names = ["hasher", "nbytes"]
+
+    def setup(self, hasher, nbytes):
+        self.buf = make_array(nbytes).view("i1")
+
+    def time_hash(self, hasher, nbytes):
+        h = new_hasher(hasher)
+        h.update(self.buf)
+        h.digest()
+
+
+if __name__ == "__main__":
+    import sys
+    from time import perf_counter
+
+    # Pass larger sizes, like 10_000_000_000, given enough memory
+    sizes = [int(n) for n in sys.argv[1:]] or [10**6, 10**8, 10**9]
+    bench = Tokenize()
+    for nbytes in sizes:
+        for obj in objects:
+            bench.setup(obj, None, nbytes)
+            for mode in modes:
+                start = perf_counter()
+                bench.time_tokenize(obj, mode, nbytes)
+                duration = perf_counter() - start
+                print(f"{nbytes:>14,} {obj:>10} {mode:>8}: {duration:8.4f} s")
+
+    from timeit import repeat
+
+    bench = NormalizeToken()
+    for obj in small:
+        bench.setup(obj)
+        duration = min(repeat(lambda: bench.time_tokenize(obj), number=100)) / 100
+        print(f"{obj:>15}: {duration * 1e6:8.1f} us")
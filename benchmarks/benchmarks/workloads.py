@@ -0,0 +1,180 @@
+"""Graph construction and optimization costs of common collection workloads
+
+Nothing here is computed; the benchmarks time building each collection
+(``time_build``) and running its optimizations (``time_optimize``), the
+overhead that is paid before the first task runs.
+"""
+from __future__ import annotations
+
+
+def optimize(x):
+    return x.__dask_optimize__(x.__dask_graph__(), x.__dask_keys__())
+
+
+class ArraySum:
+    """``da.ones(...).sum()`` over a square array with ``nchunks`` chunks"""
+
+    params = [10_000, 250_000]
+    param_names = ["nchunks"]
+    timeout = 300
+
+    def build(self, nchunks):
+        import dask.array as da
+
+        side = int(nchunks**0.5)
+        return da.ones((side, side), chunks=1).sum()
+
+    def setup(self, nchunks):
+        self.x = self.build(nchunks)
+
+    def time_build(self, nchunks):
+        self.build(nchunks)
+
+    def time_optimize(self, nchunks):
+        optimize(self.x)
+
+
+class Rechunk:
+    """Planning and building a rechunk that swaps the chunked axis"""
+
+    params = [100, 1_000]
+    param_names = ["nchunks"]
+    timeout = 300
+
+    def setup(self, nchunks):
+        import dask.array as da
+
+        self.x = da.ones((nchunks, nchunks), chunks=(1, nchunks))
+        self.new = (nchunks, 1)
+
+    def time_plan(self, nchunks):
+        from dask.array.core import normalize_chunks
+        from dask.array.rechunk import plan_rechunk
+
+        new_chunks = normalize_chunks(self.new, self.x.shape)
+        plan_rechunk(self.x.chunks, new_chunks, self.x.dtype.itemsize)
+
+    def time_build(self, nchunks):
+        self.x.rechunk(self.new)
+
+
+class ReadCSV:
+    """``dd.read_csv`` over many small files"""
+
+    nfiles = 10_000
+    timeout = 600
+
+    def setup_cache(self):
+        import os
+
+        os.mkdir("csv")
+        for i in range(self.nfiles):
+            with open(os.path.join("csv", f"{i:05d}.csv"), "w") as f:
+                f.write(f"x,y\n{i},{i * 2}\n")
+        return os.path.abspath("csv")
+
+    def build(self, path):
+        import dask.dataframe as dd
+
+        return dd.read_csv(f"{path}/*.csv").x.sum()
+
+    def setup(self, path):
+        self.x = self.build(path)
+
+    def time_build(self, path):
+        self.build(path)
+
+    def time_optimize(self, path):
+        optimize(self.x)
+
+
+class Shuffle:
+    """Task-based shuffle and ``set_index`` with known divisions"""
+
+    params = (["shuffle", "set_index"], [1_000])
+    param_names = ["method", "npartitions"]
+    timeout = 300
+
+    def build(self, method, npartitions):
+        if method == "shuffle":
+            return self.df.shuffle("x", shuffle="tasks")
+        divisions = list(range(0, npartitions * 10 + 1, 10))
+        return self.df.set_index("x", divisions=divisions, shuffle="tasks")
+
+    def setup(self, method, npartitions):
+        import pandas as pd
+
+        import dask.dataframe as dd
+
+        pdf = pd.DataFrame({"x": range(npartitions * 10), "y": 1})
+        self.df = dd.from_pandas(pdf, npartitions=npartitions)
+        self.x = self.build(method, npartitions)
+
+    def time_build(self, method, npartitions):
+        self.build(method, npartitions)
+
+    def time_optimize(self, method, npartitions):
+        optimize(self.x)
+
+
+def _add(acc, x):
+    return acc + x
+
+
+def _key(x):
+    return x % 10
+
+
+class Foldby:
+    """``bag.foldby`` over many partitions"""
+
+    params = [10_000, 100_000]
+    param_names = ["npartitions"]
+    timeout = 300
+
+    def build(self, npartitions):
+        import dask.bag as db
+
+        b = db.from_sequence(range(npartitions), npartitions=npartitions)
+        return b.foldby(_key, _add, 0, _add, 0)
+
+    def setup(self, npartitions):
+        self.x = self.build(npartitions)
+
+    def time_build(self, npartitions):
+        self.build(npartitions)
+
+    def time_optimize(self, npartitions):
+        optimize(self.x)
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    from dask.utils import tmp_cwd
+
+    def report(name, bench, *args):
+        start = perf_counter()
+        bench.setup(*args)
+        build = perf_counter() - start
+        start = perf_counter()
+        bench.time_optimize(*args)
+        print(
+            f"{name:>20}: build {build:6.2f} s, optimize {perf_counter() - start:6.2f} s"
+        )
+
+    report("array sum", ArraySum(), 250_000)
+    report("shuffle", Shuffle(), "shuffle", 1_000)
+    report("set_index", Shuffle(), "set_index", 1_000)
+    report("foldby", Foldby(), 100_000)
+    with tmp_cwd():
+        bench = ReadCSV()
+        report("read_csv", bench, bench.setup_cache())
+    bench = Rechunk()
+    bench.setup(1_000)
+    start = perf_counter()
+    bench.time_plan(1_000)
+    plan = perf_counter() - start
+    start = perf_counter()
+    bench.time_build(1_000)
+    print(f"{'rechunk':>20}: plan {plan:6.2f} s, build {perf_counter() - start:6.2f} s")
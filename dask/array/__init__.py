@@ -5,6 +5,7 @@ try:
     from dask.array.core import (
         Array,
         PerformanceWarning,
+        StoreWriter,
         asanyarray,
         asarray,
         block,
@@ -7,10 +7,11 @@ import os
 import pickle
 import re
 import sys
+import time
 import traceback
 import uuid
 import warnings
-from bisect import bisect
+from bisect import bisect, bisect_left
 from collections.abc import (
     Collection,
     Hashable,
@@ -19,11 +20,12 @@ from collections.abc import (
     Mapping,
     MutableMapping,
 )
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial, reduce, wraps
 from itertools import product, zip_longest
 from numbers import Integral, Number
 from operator import add, mul
-from threading import Lock
+from threading import Condition, Lock
 from typing import Any, TypeVar, Union, cast
 
 import numpy as np
@@ -1068,6 +1070,7 @@ def store(
     regions: tuple[slice, ...] | Collection[tuple[slice, ...]] | None = None,
     compute: bool = True,
     return_stored: bool = False,
+    writer: bool | StoreWriter = False,
     **kwargs,
 ):
     """Store dask arrays in array-like objects, overwrite data in target
@@ -1092,6 +1095,11 @@ def store(
         Whether or not to lock the data stores while storing.
         Pass True (lock each file individually), False (don't lock) or a
         particular :class:`threading.Lock` object to be shared among all writes.
+        With True, targets that are stored in chunks, like HDF5 datasets and
+        Zarr arrays, are only locked per storage chunk that several blocks
+        write to, and not at all if the blocks align with the storage chunks.
+        A :class:`PerformanceWarning` suggests aligned chunks when most
+        blocks share storage chunks.
     regions: tuple of slices or collection of tuples of slices, optional
         Each ``region`` tuple in ``regions`` should be such that
         ``target[region].shape = source.shape``
@@ -1102,6 +1110,14 @@ def store(
         If true compute immediately; return :class:`dask.delayed.Delayed` otherwise.
     return_stored: boolean, optional
         Optionally return the stored result (default False).
+    writer: boolean or StoreWriter, optional
+        Hand writes to a pool of I/O threads so that computing blocks
+        overlaps with writing them, see :class:`StoreWriter`.  Pass True to
+        use a new writer configured by ``array.store.max-in-flight`` and
+        ``array.store.num-threads``, or a ``StoreWriter`` to choose its
+        settings and inspect its statistics afterwards.  Only supported
+        with the synchronous and threaded schedulers, and ignored if
+        ``return_stored=True`` and ``compute=False`` (default False).
     kwargs:
         Parameters passed to compute/persist (only used if compute=True)
 
@@ -1129,6 +1145,10 @@ def store(
     Alternatively store many arrays at the same time
 
     >>> store([x, y, z], [dset1, dset2, dset3])  # doctest: +SKIP
+
+    Or overlap computing and writing blocks
+
+    >>> store(x, dset, writer=True)  # doctest: +SKIP
     """
 
     if isinstance(sources, Array):
@@ -1185,6 +1205,10 @@ def store(
         dependencies[targets_name] = set()
 
     load_stored = return_stored and not compute
+    if writer is True:
+        writer = StoreWriter()
+    if not writer or load_stored:
+        writer = None
 
     map_names = [
         "store-map-" + tokenize(s, t if isinstance(t, Delayed) else id(t), r)
@@ -1202,6 +1226,7 @@ def store(
             region=r,
             return_stored=return_stored,
             load_stored=load_stored,
+            writer=writer,
         )
         layers[n] = map_layer
         if isinstance(t, Delayed):
@@ -1210,12 +1235,20 @@ def store(
             dependencies[n] = {sources_name}
         map_keys += map_layer.keys()
 
+    key = "store-" + tokenize(map_names)
+    if writer is not None:
+        # Wait for the queued writes once all blocks have been handed over
+        layers[key] = {key: (wait_for_writes, writer, map_keys)}
+        dependencies[key] = set(map_names)
+
     if return_stored:
         store_dsk = HighLevelGraph(layers, dependencies)
         load_store_dsk: HighLevelGraph | dict[tuple, Any] = store_dsk
         if compute:
             store_dlyds = [Delayed(k, store_dsk, layer=k[0]) for k in map_keys]
-            store_dlyds = persist(*store_dlyds, **kwargs)
+            if writer is not None:
+                store_dlyds.append(Delayed(key, store_dsk, layer=key))
+            store_dlyds = persist(*store_dlyds, **kwargs)[: len(map_keys)]
             store_dsk_2 = HighLevelGraph.merge(*[e.dask for e in store_dlyds])
             load_store_dsk = retrieve_from_ooc(map_keys, store_dsk, store_dsk_2)
             map_names = ["load-" + n for n in map_names]
@@ -1227,13 +1260,14 @@ def store(
 
     elif compute:
         store_dsk = HighLevelGraph(layers, dependencies)
-        compute_as_if_collection(Array, store_dsk, map_keys, **kwargs)
+        keys = map_keys if writer is None else [key]
+        compute_as_if_collection(Array, store_dsk, keys, **kwargs)
         return None
 
     else:
-        key = "store-" + tokenize(map_names)
-        layers[key] = {key: map_keys}
-        dependencies[key] = set(map_names)
+        if writer is None:
+            layers[key] = {key: map_keys}
+            dependencies[key] = set(map_names)
         store_dsk = HighLevelGraph(layers, dependencies)
         return Delayed(key, store_dsk)
 
@@ -2715,7 +2749,12 @@ class Array(DaskMethodsMixin):
         return squeeze(self, axis)
 
     def rechunk(
-        self, chunks="auto", threshold=None, block_size_limit=None, balance=False
+        self,
+        chunks="auto",
+        threshold=None,
+        block_size_limit=None,
+        balance=False,
+        method=None,
     ):
         """Convert blocks in dask array x for new chunks.
 
@@ -2727,7 +2766,7 @@ class Array(DaskMethodsMixin):
         """
         from dask.array.rechunk import rechunk  # avoid circular import
 
-        return rechunk(self, chunks, threshold, block_size_limit, balance)
+        return rechunk(self, chunks, threshold, block_size_limit, balance, method)
 
     @property
     def real(self):
@@ -4363,6 +4402,338 @@ def load_chunk(out: A, index: slice, lock: Any) -> A:
     return load_store_chunk(None, out, index, lock, True, True)
 
 
+class StoreWriter:
+    """Write blocks to their targets from a dedicated pool of I/O threads
+
+    Passed as ``store(..., writer=...)``, each store task hands its block
+    to the writer and returns as soon as the write is queued, so that
+    computing the next blocks overlaps with writing the previous ones.
+    Tasks block while more than ``max_in_flight`` bytes are queued or being
+    written ("backpressure"), which bounds the memory held by pending
+    writes.  A final task waits for all writes to finish and raises the
+    first error encountered.
+
+    The writer keeps statistics about the writes it performed, which can be
+    inspected after the computation finished.
+
+    Writers live in the process that created them, so they can only be
+    used with the synchronous and threaded schedulers.
+
+    Parameters
+    ----------
+    max_in_flight: int or str, optional
+        Maximum number of bytes queued or being written at any time.
+        Defaults to the ``array.store.max-in-flight`` config value.
+    num_threads: int, optional
+        Number of I/O threads.  Defaults to the ``array.store.num-threads``
+        config value.
+
+    Attributes
+    ----------
+    nbytes: int
+        Number of bytes written
+    nwrites: int
+        Number of blocks written
+    write_time: float
+        Total time spent in writes, summed over all I/O threads
+    elapsed: float
+        Time between the first write being queued and the last one finishing
+    backpressure_events: int
+        Number of times a task had to wait for writes to finish
+    backpressure_time: float
+        Total time tasks spent waiting for writes to finish
+
+    Examples
+    --------
+    >>> import dask.array as da
+    >>> x = da.ones((10, 10), chunks=5)
+    >>> out = np.empty(x.shape)
+    >>> writer = StoreWriter(max_in_flight="1 MiB")
+    >>> da.store(x, out, writer=writer)
+    >>> writer.nwrites, writer.nbytes
+    (4, 800)
+    """
+
+    def __init__(self, max_in_flight=None, num_threads=None):
+        if max_in_flight is None:
+            max_in_flight = config.get("array.store.max-in-flight")
+        if num_threads is None:
+            num_threads = config.get("array.store.num-threads")
+        self.max_in_flight = parse_bytes(max_in_flight)
+        self.num_threads = num_threads
+        self._condition = Condition()
+        self._executor = None
+        self._futures = []
+        self._in_flight = 0
+        self._error = None
+        self._start = None
+        self._stop = None
+        self.nbytes = 0
+        self.nwrites = 0
+        self.write_time = 0.0
+        self.backpressure_events = 0
+        self.backpressure_time = 0.0
+
+    def __repr__(self):
+        return "<StoreWriter: %d writes, %s, %s/s, %d backpressure events>" % (
+            self.nwrites,
+            format_bytes(self.nbytes),
+            format_bytes(int(self.throughput)),
+            self.backpressure_events,
+        )
+
+    def __reduce__(self):
+        raise TypeError(
+            "StoreWriter cannot be sent to other processes, use it with the "
+            "synchronous or threaded schedulers"
+        )
+
+    @property
+    def elapsed(self) -> float:
+        if self._start is None:
+            return 0.0
+        return (self._stop or time.perf_counter()) - self._start
+
+    @property
+    def throughput(self) -> float:
+        """Bytes written per second of elapsed time"""
+        elapsed = self.elapsed
+        return self.nbytes / elapsed if elapsed else 0.0
+
+    def submit(self, x, out, index, lock):
+        """Queue writing ``x`` into ``out[index]``, waiting if too much is queued"""
+        if not is_arraylike(x):
+            x = np.asanyarray(x)
+        nbytes = int(getattr(x, "nbytes", 0))
+        with self._condition:
+            # Always admit a write when nothing is in flight, even if it is
+            # larger than the limit on its own
+            if self._error is None and self._over_limit(nbytes):
+                self.backpressure_events += 1
+                start = time.perf_counter()
+                while self._error is None and self._over_limit(nbytes):
+                    self._condition.wait()
+                self.backpressure_time += time.perf_counter() - start
+            error = self._error
+            if error is None:
+                self._in_flight += nbytes
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        self.num_threads, thread_name_prefix="dask-store"
+                    )
+                    self._start = time.perf_counter()
+                    self._stop = None
+                future = self._executor.submit(self._write, x, out, index, lock, nbytes)
+                self._futures.append(future)
+                return future
+        # A previous write failed: stop the I/O threads and report the error
+        self.wait()
+        raise error
+
+    def _over_limit(self, nbytes):
+        return self._in_flight and self._in_flight + nbytes > self.max_in_flight
+
+    def _write(self, x, out, index, lock, nbytes):
+        start = time.perf_counter()
+        try:
+            if lock:
+                lock.acquire()
+            try:
+                out[index] = x
+            finally:
+                if lock:
+                    lock.release()
+        except BaseException as e:
+            with self._condition:
+                if self._error is None:
+                    self._error = e
+            raise
+        finally:
+            stop = time.perf_counter()
+            with self._condition:
+                self._in_flight -= nbytes
+                self.nbytes += nbytes
+                self.nwrites += 1
+                self.write_time += stop - start
+                self._stop = stop
+                self._condition.notify_all()
+
+    def wait(self):
+        """Wait for all queued writes and shut down the I/O threads"""
+        with self._condition:
+            futures, self._futures = self._futures, []
+            executor, self._executor = self._executor, None
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+            with self._condition:
+                self._error = None
+
+
+def store_chunk_async(
+    x: ArrayLike,
+    out: ArrayLike,
+    index: slice,
+    lock: Any,
+    return_stored: bool,
+    writer: StoreWriter,
+):
+    """Queue storing a chunk on ``writer`` without waiting for the write"""
+    if x is not None:
+        writer.submit(x, out, index, lock)
+    return out if return_stored else None
+
+
+def wait_for_writes(writer: StoreWriter, results: Any) -> Any:
+    """Wait for all writes queued on ``writer``, then return ``results``"""
+    writer.wait()
+    return results
+
+
+class ChunkLocks:
+    """Hold the locks of several storage chunks, acquired in a fixed order"""
+
+    def __init__(self, locks):
+        self.locks = locks
+
+    def acquire(self):
+        for lock in self.locks:
+            lock.acquire()
+        return True
+
+    def release(self):
+        for lock in reversed(self.locks):
+            lock.release()
+
+    def __repr__(self):
+        return "<ChunkLocks: %d locks>" % len(self.locks)
+
+
+def _aligned_chunks(chunks, bounds, offset):
+    """Chunks close to ``chunks`` that start and end on storage boundaries
+
+    >>> _aligned_chunks((3, 3, 3, 1), (0, 4, 8, 10), 0)
+    (4, 4, 2)
+    >>> _aligned_chunks((5, 5), (0, 4, 8, 12), 2)
+    (2, 4, 4)
+    """
+    size = sum(chunks)
+    inner = [b for b in bounds if offset < b < offset + size]
+    if not inner:
+        return (size,)
+    # Group as many storage chunks as fit in a typical block
+    widths = [b - a for a, b in zip(bounds[:-1], bounds[1:]) if b - a]
+    step = max(1, round(sorted(chunks)[len(chunks) // 2] / max(widths)))
+    edges = [offset] + inner[step - 1 :: step] + [offset + size]
+    edges = sorted(set(edges))
+    return tuple(b - a for a, b in zip(edges[:-1], edges[1:]))
+
+
+def _storage_chunk_locks(
+    out: Any,
+    chunks: tuple[tuple[int, ...], ...],
+    region: tuple[slice, ...] | slice | None,
+    max_locks: int = 100,
+) -> list | None:
+    """Locks scoped to the storage chunks of ``out`` that blocks write to
+
+    Targets like Zarr arrays and HDF5 datasets store their data in chunks.
+    Blocks that write to disjoint storage chunks can write concurrently, so
+    only the storage chunks that several blocks write to need a lock.
+
+    Returns one lock per block, in the order of ``slices_from_chunks``:
+    ``False`` for blocks that write whole storage chunks only, and a
+    :class:`ChunkLocks` holding the locks of the shared storage chunks
+    otherwise.  Returns ``None`` if the storage chunks of ``out`` are
+    unknown, the region cannot be analysed, or blocks would need more than
+    ``max_locks`` locks each, in which case a single lock should be used.
+
+    Warns when most blocks share storage chunks with other blocks, with
+    chunks to rechunk to so that they don't.
+    """
+    from dask.array.rechunk import _storage_chunks
+
+    shape = getattr(out, "shape", None)
+    if shape is None or len(shape) != len(chunks):
+        return None
+    storage = _storage_chunks(out, shape)
+    if storage is None:
+        return None
+
+    if region is None:
+        region = ()
+    elif not isinstance(region, tuple):
+        region = (region,)
+    if len(region) > len(shape) or not all(
+        isinstance(r, slice) and r.step in (None, 1) for r in region
+    ):
+        return None
+    offsets = [r.indices(n)[0] for r, n in zip(region, shape)]
+    offsets += [0] * (len(shape) - len(offsets))
+
+    # Per dimension, the storage chunks each block writes to, and the
+    # storage chunks written to by more than one block
+    ranges = []
+    shared = []
+    for c, bds, offset in zip(chunks, storage, offsets):
+        bounds = cached_cumsum(bds, initial_zero=True)
+        edges = cached_cumsum(c, initial_zero=True)
+        rngs = [
+            range(bisect(bounds, offset + a) - 1, bisect_left(bounds, offset + b))
+            if b > a
+            else range(0)
+            for a, b in zip(edges[:-1], edges[1:])
+        ]
+        counts = frequencies(concat(rngs))
+        ranges.append(rngs)
+        shared.append({j for j, n in counts.items() if n > 1})
+
+    if not any(shared):
+        return [False] * reduce(mul, map(len, chunks), 1)
+
+    locks: dict[tuple[int, ...], Lock] = {}
+    block_locks: list = []
+    for rngs in product(*ranges):
+        ntotal = reduce(mul, map(len, rngs), 1)
+        nprivate = reduce(
+            mul, [len([j for j in r if j not in s]) for r, s in zip(rngs, shared)], 1
+        )
+        if ntotal - nprivate > max_locks:
+            return None
+        if ntotal == nprivate:
+            block_locks.append(False)
+            continue
+        keys = [
+            idx for idx in product(*rngs) if any(j in s for j, s in zip(idx, shared))
+        ]
+        block_locks.append(ChunkLocks([locks.setdefault(k, Lock()) for k in keys]))
+
+    nshared = sum(1 for lock in block_locks if lock)
+    if len(block_locks) > 1 and nshared > len(block_locks) / 2:
+        aligned = tuple(
+            _aligned_chunks(c, cached_cumsum(bds, initial_zero=True), offset)
+            for c, bds, offset in zip(chunks, storage, offsets)
+        )
+        # Show regular chunks by their size
+        aligned = tuple(
+            c[0] if len(set(c[:-1])) <= 1 and c[-1] <= c[0] else c for c in aligned
+        )
+        warnings.warn(
+            f"{nshared} of {len(block_locks)} blocks write to storage chunks "
+            "shared with other blocks, so their writes have to wait for each "
+            "other.  The target is stored in chunks of "
+            f"{tuple(bds[0] for bds in storage)}; consider calling "
+            f".rechunk({aligned}) before storing, so that blocks can be "
+            "written concurrently without locking.",
+            PerformanceWarning,
+            stacklevel=4,
+        )
+    return block_locks
+
+
 def insert_to_ooc(
     keys: list,
     chunks: tuple[tuple[int, ...], ...],
@@ -4373,6 +4744,7 @@ def insert_to_ooc(
     region: tuple[slice, ...] | slice | None = None,
     return_stored: bool = False,
     load_stored: bool = False,
+    writer: StoreWriter | None = None,
 ) -> dict:
     """
     Creates a Dask graph for storing chunks from ``arr`` in ``out``.
@@ -4389,7 +4761,8 @@ def insert_to_ooc(
         First element of dask keys
     lock: Lock-like or bool, optional
         Whether to lock or with what (default is ``True``,
-        which means a :class:`threading.Lock` instance).
+        which means a :class:`threading.Lock` instance, or locks scoped to
+        the storage chunks of ``out`` if it has a ``chunks`` attribute).
     region: slice-like, optional
         Where in ``out`` to store ``arr``'s results
         (default is ``None``, meaning all of ``out``).
@@ -4400,6 +4773,10 @@ def insert_to_ooc(
         Whether to handling loading from ``out`` at the same time.
         Ignored if ``return_stored`` is not ``True``.
         (default is ``False``, meaning defer to ``return_stored``).
+    writer: StoreWriter, optional
+        Queue writes on this writer instead of writing within the tasks.
+        Ignored if ``load_stored`` is ``True``, which needs the write to
+        finish before loading.
 
     Returns
     -------
@@ -4413,23 +4790,30 @@ def insert_to_ooc(
     >>> insert_to_ooc(d.__dask_keys__(), d.chunks, a, "store-123")  # doctest: +SKIP
     """
 
+    block_locks = None
     if lock is True:
+        block_locks = _storage_chunk_locks(out, chunks, region)
         lock = Lock()
 
     slices = slices_from_chunks(chunks)
     if region:
         slices = [fuse_slice(region, slc) for slc in slices]
+    if block_locks is None:
+        block_locks = [lock] * len(slices)
 
     if return_stored and load_stored:
         func = load_store_chunk
         args = (load_stored,)
+    elif writer is not None:
+        func = store_chunk_async  # type: ignore
+        args = (writer,)  # type: ignore
     else:
         func = store_chunk  # type: ignore
         args = ()  # type: ignore
 
     dsk = {
-        (name,) + t[1:]: (func, t, out, slc, lock, return_stored) + args
-        for t, slc in zip(core.flatten(keys), slices)
+        (name,) + t[1:]: (func, t, out, slc, block_lock, return_stored) + args
+        for t, slc, block_lock in zip(core.flatten(keys), slices, block_locks)
     }
     return dsk
 
@@ -4458,7 +4842,7 @@ def retrieve_from_ooc(
     >>> retrieve_from_ooc(g.keys(), g, {k: k for k in g.keys()})  # doctest: +SKIP
     """
     load_dsk = {
-        ("load-" + k[0],) + k[1:]: (load_chunk, dsk_post[k]) + dsk_pre[k][3:-1]  # type: ignore
+        ("load-" + k[0],) + k[1:]: (load_chunk, dsk_post[k]) + dsk_pre[k][3:5]  # type: ignore
         for k in keys
     }
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 from itertools import zip_longest
 from numbers import Integral
 from typing import Any, Callable
@@ -9,11 +10,12 @@ import numpy as np
 from dask import config
 from dask.array.chunk import getitem
 from dask.array.core import getter, getter_inline, getter_nofancy
-from dask.blockwise import fuse_roots, optimize_blockwise
+from dask.blockwise import Blockwise, fuse_roots, optimize_blockwise
 from dask.core import flatten, reverse_dict
 from dask.highlevelgraph import HighLevelGraph
+from dask.layers import ArraySliceDep, RechunkLayer
 from dask.optimization import SubgraphCallable, fuse, inline_functions
-from dask.utils import ensure_dict
+from dask.utils import apply, cached_cumsum, ensure_dict, parse_bytes
 
 # All get* functions the optimizations know about
 GETTERS = (getter, getter_nofancy, getter_inline, getitem)
@@ -34,9 +36,10 @@ def optimize(
 ):
     """Optimize dask for array computation
 
-    1.  Cull tasks not necessary to evaluate keys
-    2.  Remove full slicing, e.g. x[:]
-    3.  Inline fast functions like getitem and np.transpose
+    1.  Read arrays from their source in the chunks they are rechunked to
+    2.  Cull tasks not necessary to evaluate keys
+    3.  Remove full slicing, e.g. x[:]
+    4.  Inline fast functions like getitem and np.transpose
     """
     if not isinstance(keys, (list, set)):
         keys = [keys]
@@ -45,6 +48,7 @@ def optimize(
     if not isinstance(dsk, HighLevelGraph):
         dsk = HighLevelGraph.from_collections(id(dsk), dsk, dependencies=())
 
+    dsk = optimize_rechunk_reads(dsk, keys=keys)
     dsk = optimize_blockwise(dsk, keys=keys)
     dsk = fuse_roots(dsk, keys=keys)
     dsk = dsk.cull(set(keys))
@@ -80,6 +84,152 @@ def optimize(
     return optimize_slices(dsk)
 
 
+def optimize_rechunk_reads(dsk, keys=()):
+    """Read arrays from their source in the chunks they are rechunked to
+
+    Arrays created with ``from_array`` read every block by slicing their
+    source with a getter.  When such an array is rechunked, in one or more
+    steps, the rechunk is replaced by reading the source in the new chunks
+    directly, under the same keys.  Sources with native chunks, like Zarr
+    arrays and HDF5 datasets, are read in blocks made of whole native
+    chunks where the new chunks would split them, as long as these blocks
+    stay below ``array.chunk-size``.  These blocks are then sliced into
+    the new chunks, so that no native chunk is read twice.
+
+    Only rechunks that are the sole user of their source are replaced.  If
+    other layers, or the requested ``keys``, need the source in its own
+    chunks as well, this would read it twice.
+    """
+    if not any(isinstance(layer, RechunkLayer) for layer in dsk.layers.values()):
+        return dsk
+    dependents = reverse_dict(dsk.dependencies)
+    # Requested outputs are used outside of the graph
+    for name in {key[0] if isinstance(key, tuple) else key for key in keys}:
+        dependents.setdefault(name, set()).add(None)
+    rewrites = {}
+    for name, layer in dsk.layers.items():
+        if isinstance(layer, RechunkLayer):
+            source = _rechunk_source(dsk, layer, dependents)
+            if source is not None:
+                rewrites[name] = source
+    if not rewrites:
+        return dsk
+
+    layers = dict(dsk.layers)
+    dependencies = dict(dsk.dependencies)
+    for name, source in rewrites.items():
+        layer = dsk.layers[name]
+        read_chunks = _read_chunks(dsk, source, layer.new_chunks)
+        if read_chunks == layer.new_chunks:
+            layers[name] = _read_layer(source, name, read_chunks, layer.output_blocks)
+            dependencies[name] = dependencies[source.output]
+        else:
+            read_name = "rechunk-read-" + layer.token
+            layers[read_name] = _read_layer(source, read_name, read_chunks)
+            dependencies[read_name] = dependencies[source.output]
+            layers[name] = RechunkLayer(
+                name,
+                read_name,
+                read_chunks,
+                layer.new_chunks,
+                layer.token,
+                method=layer.method,
+                output_blocks=layer.output_blocks,
+            )
+            dependencies[name] = {read_name}
+    return HighLevelGraph(layers, dependencies)
+
+
+def _rechunk_source(dsk, layer, dependents):
+    """The ``from_array`` layer that a chain of rechunks starts from, if any
+
+    Every array in the chain must only be used by the next rechunk.
+    """
+    while True:
+        if dsk.dependencies.get(layer.name) != {layer.input_name}:
+            return None
+        if dependents.get(layer.input_name) != {layer.name}:
+            return None
+        source = dsk.layers.get(layer.input_name)
+        if not isinstance(source, RechunkLayer):
+            break
+        layer = source
+
+    if not (
+        isinstance(source, Blockwise)
+        and source.output == layer.input_name
+        and len(source.dsk) == 1
+        and len(source.indices) == 2
+        and len(source.io_deps) == 1
+        and not source.new_axes
+    ):
+        return None
+    (_, array_index), (dep_name, dep_index) = source.indices
+    dep = source.io_deps.get(dep_name)
+    if (
+        array_index is not None
+        or type(dep) is not ArraySliceDep
+        or tuple(dep_index) != source.output_indices
+        or dep.chunks != layer.old_chunks
+    ):
+        return None
+    # Only rewrite reads with known getters, whose blocks are the slices
+    # of the source array
+    task = source.dsk[source.output]
+    get = task[1] if task[0] is apply else task[0]
+    if get not in GETTERS:
+        return None
+    return source
+
+
+def _read_layer(source, name, chunks, output_blocks=None):
+    """Blockwise layer reading the source of *source* in *chunks*"""
+    (array, _), (_, index) = source.indices
+    return Blockwise(
+        name,
+        source.output_indices,
+        {name: source.dsk[source.output]},
+        [(array, None), (ArraySliceDep(chunks), index)],
+        numblocks={},
+        output_blocks=output_blocks,
+        annotations=source.annotations,
+    )
+
+
+def _read_chunks(dsk, source, chunks):
+    """Chunks to read the source of *source* in, to produce *chunks*
+
+    Along every dimension where *chunks* split native chunks of the source,
+    reads are merged up to boundaries shared by both, while the blocks read
+    stay below ``array.chunk-size``.
+    """
+    from dask.array.rechunk import _largest_block_size, _storage_chunks
+
+    array = source.indices[0][0]
+    if isinstance(array, str):
+        if array not in dsk.layers:
+            return chunks
+        array = dsk.layers[array].get(array)
+    shape = tuple(map(sum, chunks))
+    native = _storage_chunks(array, shape)
+    if native is None or any(math.isnan(s) for s in shape):
+        return chunks
+
+    limit = parse_bytes(config.get("array.chunk-size"))
+    itemsize = getattr(getattr(array, "dtype", None), "itemsize", 8)
+    read_chunks = list(chunks)
+    for dim, (c, n) in enumerate(zip(chunks, native)):
+        bounds = sorted(
+            set(cached_cumsum(c, initial_zero=True))
+            & set(cached_cumsum(n, initial_zero=True))
+        )
+        merged = tuple(b - a for a, b in zip(bounds[:-1], bounds[1:]))
+        candidate = read_chunks[:dim] + [merged] + read_chunks[dim + 1 :]
+        if _largest_block_size(candidate) * itemsize <= limit:
+            read_chunks[dim] = merged
+    return tuple(read_chunks)
+
+
 def hold_keys(dsk, dependencies):
     """Find keys to avoid fusion
 
@@ -7,25 +7,27 @@ The rechunk module defines:
 """
 from __future__ import annotations
 
+import bisect
 import heapq
 import math
-from functools import reduce
-from itertools import chain, count, product
+from collections import namedtuple
+from functools import lru_cache, reduce
+from itertools import chain, product
+from numbers import Integral
 from operator import add, itemgetter, mul
 from warnings import warn
 
 import numpy as np
-import tlz as toolz
 from tlz import accumulate
 
 from dask import config
-from dask.array.chunk import getitem
 from dask.array.core import Array, concatenate3, normalize_chunks
 from dask.array.utils import validate_axis
 from dask.array.wrap import empty
 from dask.base import tokenize
 from dask.highlevelgraph import HighLevelGraph
-from dask.utils import parse_bytes
+from dask.layers import RechunkLayer, reshapelist
+from dask.utils import cached_cumsum, parse_bytes
 
 
 def cumdims_label(chunks, const):
@@ -225,7 +227,14 @@ def intersect_chunks(old_chunks, new_chunks):
     return cross
 
 
-def rechunk(x, chunks="auto", threshold=None, block_size_limit=None, balance=False):
+def rechunk(
+    x,
+    chunks="auto",
+    threshold=None,
+    block_size_limit=None,
+    balance=False,
+    method=None,
+):
     """
     Convert blocks in dask array x for new chunks.
 
@@ -249,6 +258,25 @@ def rechunk(x, chunks="auto", threshold=None, block_size_limit=None, balance=Fal
         This means ``balance=True`` will remove any small leftover chunks, so
         using ``x.rechunk(chunks=len(x) // N, balance=True)``
         will almost certainly result in ``N`` chunks.
+    method : {"tasks", "disk"}, optional
+        How to move the data between blocks.  ``"tasks"`` slices and
+        concatenates blocks in the task graph, going through intermediate
+        chunks if that keeps the graph small.  ``"disk"`` writes the pieces
+        of every old block to a temporary directory and reads back the
+        pieces of every new block, in a single step whose number of tasks
+        and memory use are linear in the number of blocks.  This suits
+        rechunks where every new block needs a piece of every old block
+        on a single machine.  Defaults to the configuration value
+        ``array.rechunk-method``.
+
+    Notes
+    -----
+    With ``"tasks"``, the intermediate steps are chosen by
+    :func:`plan_rechunk` by default.  Setting the configuration value
+    ``array.rechunk-planner`` to ``"cost"`` chooses them with
+    :func:`search_rechunk_plan` instead, which ignores *threshold* and
+    takes the native chunks of Zarr arrays or HDF5 datasets passed to
+    :func:`dask.array.from_array` into account.
 
     Examples
     --------
@@ -314,15 +342,56 @@ def rechunk(x, chunks="auto", threshold=None, block_size_limit=None, balance=Fal
         if new != old and not math.isnan(old) and not math.isnan(new):
             raise ValueError("Provided chunks are not consistent with shape")
 
-    steps = plan_rechunk(
-        x.chunks, chunks, x.dtype.itemsize, threshold, block_size_limit
-    )
+    method = method or config.get("array.rechunk-method")
+    if method not in ("tasks", "disk"):
+        raise ValueError(f"Unknown rechunk method {method!r}")
+
+    planner = config.get("array.rechunk-planner")
+    if planner not in ("heuristic", "cost"):
+        raise ValueError(f"Unknown rechunk planner {planner!r}")
+
+    if method == "disk":
+        # The number of tasks does not depend on how blocks overlap
+        steps = [chunks]
+    elif planner == "cost":
+        steps = search_rechunk_plan(
+            x.chunks,
+            chunks,
+            x.dtype.itemsize,
+            block_size_limit,
+            native_chunks=_native_chunks(x),
+        ).steps
+    else:
+        steps = plan_rechunk(
+            x.chunks, chunks, x.dtype.itemsize, threshold, block_size_limit
+        )
     for c in steps:
-        x = _compute_rechunk(x, c)
+        x = _compute_rechunk(x, c, method=method)
 
     return x
 
 
+def _native_chunks(x):
+    """Chunks of the storage *x* was created from with ``from_array``, if any"""
+    name = "original-" + x.name
+    layer = x.dask.layers.get(name)
+    if layer is None:
+        return None
+    return _storage_chunks(layer.get(name), x.shape)
+
+
+def _storage_chunks(arr, shape):
+    """Chunks of a Zarr array, HDF5 dataset or similar *arr*, if any"""
+    chunks = getattr(arr, "chunks", None)
+    if (
+        isinstance(chunks, tuple)
+        and len(chunks) == len(shape)
+        and all(isinstance(c, Integral) and c > 0 for c in chunks)
+    ):
+        return normalize_chunks(chunks, shape)
+    return None
+
+
 def _number_of_blocks(chunks):
     return reduce(mul, map(len, chunks))
 
@@ -597,65 +666,327 @@ def plan_rechunk(
     return steps + [new_chunks]
 
 
-def _compute_rechunk(x, chunks):
+RechunkCost = namedtuple(
+    "RechunkCost", ["tasks", "bytes_moved", "peak_memory", "io_bytes", "seconds"]
+)
+RechunkCost.__doc__ = """Estimated cost of a rechunk plan
+
+tasks
+    Number of tasks in the rechunk graphs.
+bytes_moved
+    Bytes copied into new blocks, summed over all steps.
+peak_memory
+    Largest number of bytes held by a single task.
+io_bytes
+    Bytes read from storage with native chunks, if the pieces of the
+    first step are read from it directly.
+seconds
+    The above weighted into a single estimate, which the planner minimizes.
+"""
+
+RechunkPlan = namedtuple("RechunkPlan", ["steps", "cost"])
+RechunkPlan.__doc__ = """Rechunk plan chosen by :func:`search_rechunk_plan`
+
+steps
+    Chunks of every intermediate step, ending with the requested chunks.
+cost
+    Estimated :class:`RechunkCost` of running all of the steps.
+"""
+
+
+@lru_cache(maxsize=1000)
+def _dimension_cost(old, new, native=None):
+    """Cost of rechunking one dimension from *old* to *new* chunks
+
+    Returns the number of pieces, the number of pieces that are whole old
+    chunks, the extent covered by new chunks that are whole old chunks,
+    and the extent of the native chunks overlapping each piece.
+    """
+    (pieces,) = _old_to_new((old,), (new,))
+    cumnative = cached_cumsum(native, initial_zero=True) if native else None
+    npieces = nwhole = aliased = io = 0
+    for j, p in enumerate(pieces):
+        npieces += len(p)
+        for i, slc in p:
+            nwhole += slc.start == 0 and slc.stop == old[i]
+        if len(p) == 1 and p[0][1] == slice(0, old[p[0][0]]):
+            aliased += new[j]
+    if native:
+        cumold = cached_cumsum(old, initial_zero=True)
+        for p in pieces:
+            for i, slc in p:
+                start = cumold[i] + slc.start
+                stop = cumold[i] + slc.stop
+                if start == stop:
+                    continue
+                first = bisect.bisect_right(cumnative, start) - 1
+                last = bisect.bisect_left(cumnative, stop)
+                io += cumnative[last] - cumnative[first]
+    return npieces, nwhole, aliased, io
+
+
+def rechunk_cost(
+    old_chunks,
+    new_chunks,
+    itemsize,
+    native_chunks=None,
+    task_overhead=1e-3,
+    bandwidth=1e9,
+    io_bandwidth=1e8,
+):
+    """Estimate the cost of rechunking from *old_chunks* to *new_chunks*
+
+    Parameters
+    ----------
+    old_chunks, new_chunks : tuple of tuples
+        Chunks before and after the rechunk.  Must be known.
+    itemsize : int
+        The item size of the array.
+    native_chunks : tuple of tuples, optional
+        Chunks of the storage the array is read from, like a Zarr array or
+        an HDF5 dataset.  If given, reading every piece of an old block
+        that a new block needs is charged for the native chunks it touches.
+    task_overhead : float
+        Seconds of scheduling overhead per task.
+    bandwidth : float
+        Bytes per second copied into new blocks.
+    io_bandwidth : float
+        Bytes per second read from storage.
+
+    Returns
+    -------
+    RechunkCost
+
+    Examples
+    --------
+    >>> rechunk_cost(((4, 4), (8,)), ((8,), (4, 4)), itemsize=8)
+    RechunkCost(tasks=6, bytes_moved=512, peak_memory=512, io_bytes=0, seconds=0.006000512)
+    """
+    if native_chunks is None:
+        native_chunks = (None,) * len(old_chunks)
+    dims = [
+        _dimension_cost(tuple(o), tuple(n), native and tuple(native))
+        for o, n, native in zip(old_chunks, new_chunks, native_chunks)
+    ]
+    npieces, nwhole, aliased, io = (math.prod(d[k] for d in dims) for k in range(4))
+    if not any(native_chunks):
+        io = 0
+
+    tasks = _number_of_blocks(new_chunks) + npieces - nwhole
+    size = math.prod(map(sum, new_chunks))
+    bytes_moved = (size - aliased) * itemsize
+    # A merge task holds the pieces of its new block as well as the result
+    peak_memory = itemsize * max(
+        _largest_block_size(old_chunks), 2 * _largest_block_size(new_chunks)
+    )
+    io_bytes = io * itemsize
+    seconds = tasks * task_overhead + bytes_moved / bandwidth + io_bytes / io_bandwidth
+    return RechunkCost(tasks, bytes_moved, peak_memory, io_bytes, seconds)
+
+
+def _plan_cost(old_chunks, steps, itemsize, native_chunks=None, **weights):
+    """Add up the cost of rechunking *old_chunks* through *steps*"""
+    costs = []
+    for chunks in steps:
+        costs.append(
+            rechunk_cost(old_chunks, chunks, itemsize, native_chunks, **weights)
+        )
+        old_chunks = chunks
+        # Only the first step reads from storage
+        native_chunks = None
+    return RechunkCost(
+        sum(c.tasks for c in costs),
+        sum(c.bytes_moved for c in costs),
+        max(c.peak_memory for c in costs),
+        costs[0].io_bytes,
+        sum(c.seconds for c in costs),
+    )
+
+
+def _intermediate_chunks(old_chunks, new_chunks, block_size_limit, nsteps=4):
+    """Candidate intermediate chunks between *old_chunks* and *new_chunks*
+
+    Along every dimension that changes, chunk widths are interpolated
+    geometrically between the old and the new widths.  Candidates change one
+    dimension of *old_chunks* or of *new_chunks* at a time, or all of the
+    dimensions by the same step of the interpolation, so that their number
+    only grows linearly with the number of dimensions.  Candidates with
+    blocks larger than *block_size_limit* elements are dropped.
+    """
+    old_chunks, new_chunks = tuple(old_chunks), tuple(new_chunks)
+    options = {}
+    for d, (old, new) in enumerate(zip(old_chunks, new_chunks)):
+        if old == new:
+            continue
+        start, stop = max(old), max(new)
+        widths = [
+            round(start ** (1 - t / nsteps) * stop ** (t / nsteps))
+            for t in range(1, nsteps)
+        ]
+        options[d] = [_get_chunks(sum(old), w) for w in widths]
+
+    candidates = {}  # Ordered set
+    for t in range(nsteps - 1):
+        chunks = list(old_chunks)
+        for d, dim in options.items():
+            chunks[d] = dim[t]
+        candidates[tuple(chunks)] = None
+    for d, dim in options.items():
+        for base in (old_chunks, new_chunks):
+            for c in dim + [old_chunks[d], new_chunks[d]]:
+                candidates[base[:d] + (c,) + base[d + 1 :]] = None
+
+    for chunks in candidates:
+        if chunks not in (old_chunks, new_chunks):
+            if _largest_block_size(chunks) <= block_size_limit:
+                yield chunks
+
+
+def search_rechunk_plan(
+    old_chunks,
+    new_chunks,
+    itemsize,
+    block_size_limit=None,
+    native_chunks=None,
+    max_steps=4,
+    **weights,
+):
+    """Search for the cheapest rechunk from *old_chunks* to *new_chunks*
+
+    Unlike :func:`plan_rechunk`, which builds intermediate steps greedily
+    to keep the graph small, this compares plans with an explicit cost
+    model, see :func:`rechunk_cost`.  Going through intermediate chunks
+    trades fewer tasks for copying the data more often.  Starting from the
+    direct rechunk and from the plan of :func:`plan_rechunk`, steps are
+    dropped, or split in two through chunks interpolated between the
+    chunks before and after the step, as long as that lowers the
+    estimated cost.
+
+    Parameters
+    ----------
+    itemsize: int
+        The item size of the array
+    block_size_limit: int
+        The maximum block size (in bytes) we want to produce during an
+        intermediate step.  Defaults to the configuration value
+        ``array.chunk-size``.
+    native_chunks: tuple of tuples, optional
+        Chunks of the storage the array is read from, see
+        :func:`rechunk_cost`.
+    max_steps: int
+        The largest number of steps of a plan.
+    **weights:
+        ``task_overhead``, ``bandwidth`` and ``io_bandwidth`` to weigh
+        costs with, see :func:`rechunk_cost`.
+
+    Returns
+    -------
+    RechunkPlan
+
+    Examples
+    --------
+    >>> old = ((20, 20), (2,) * 20)
+    >>> new = ((2,) * 20, (20, 20))
+    >>> plan = search_rechunk_plan(old, new, itemsize=8, block_size_limit=3200)
+    >>> format_plan(plan.steps)
+    [(2*[20], 2*[20]), (20*[2], 2*[20])]
+    >>> plan.cost.tasks, rechunk_cost(old, new, itemsize=8).tasks
+    (84, 440)
+    """
+    block_size_limit = block_size_limit or config.get("array.chunk-size")
+    if isinstance(block_size_limit, str):
+        block_size_limit = parse_bytes(block_size_limit)
+
+    if len(new_chunks) <= 1 or not all(new_chunks):
+        steps = [new_chunks]
+        return RechunkPlan(steps, _plan_cost(old_chunks, steps, itemsize))
+    if any(math.isnan(y) for c in old_chunks + new_chunks for y in c):
+        # Nothing to estimate
+        return RechunkPlan([new_chunks], None)
+
+    block_size_limit = max(
+        block_size_limit / itemsize,
+        _largest_block_size(old_chunks),
+        _largest_block_size(new_chunks),
+    )
+
+    def cost(steps):
+        return _plan_cost(old_chunks, steps, itemsize, native_chunks, **weights)
+
+    def improve(steps):
+        """Drop intermediate steps or split steps in two while that helps"""
+        seconds = cost(steps).seconds
+        while True:
+            candidates = [steps[:i] + steps[i + 1 :] for i in range(len(steps) - 1)]
+            if len(steps) < max_steps:
+                for i, stop in enumerate(steps):
+                    start = steps[i - 1] if i else old_chunks
+                    candidates.extend(
+                        steps[:i] + [chunks] + steps[i:]
+                        for chunks in _intermediate_chunks(
+                            start, stop, block_size_limit
+                        )
+                    )
+            best = min(candidates, key=lambda c: cost(c).seconds, default=None)
+            if best is None or cost(best).seconds >= seconds:
+                return steps
+            steps, seconds = best, cost(best).seconds
+
+    heuristic = plan_rechunk(
+        old_chunks, new_chunks, itemsize, block_size_limit=block_size_limit * itemsize
+    )
+    plans = [improve([new_chunks])]
+    if len(heuristic) <= max_steps:
+        plans.append(improve(heuristic))
+    steps = min(plans, key=lambda c: cost(c).seconds)
+    return RechunkPlan(steps, cost(steps))
+
+
+def _compute_rechunk(x, chunks, method="tasks"):
     """Compute the rechunk of *x* to the given *chunks*."""
     if x.size == 0:
         # Special case for empty array, as the algorithm below does not behave correctly
         return empty(x.shape, chunks=chunks, dtype=x.dtype)
 
-    ndim = x.ndim
-    crossed = intersect_chunks(x.chunks, chunks)
-    x2 = dict()
-    intermediates = dict()
-    token = tokenize(x, chunks)
+    if method == "tasks":
+        token = tokenize(x, chunks)
+    else:
+        token = tokenize(x, chunks, method)
     merge_name = "rechunk-merge-" + token
-    split_name = "rechunk-split-" + token
-    split_name_suffixes = count()
-
-    # Pre-allocate old block references, to allow re-use and reduce the
-    # graph's memory footprint a bit.
-    old_blocks = np.empty([len(c) for c in x.chunks], dtype="O")
-    for index in np.ndindex(old_blocks.shape):
-        old_blocks[index] = (x.name,) + index
-
-    # Iterate over all new blocks
-    new_index = product(*(range(len(c)) for c in chunks))
-
-    for new_idx, cross1 in zip(new_index, crossed):
-        key = (merge_name,) + new_idx
-        old_block_indices = [[cr[i][0] for cr in cross1] for i in range(ndim)]
-        subdims1 = [len(set(old_block_indices[i])) for i in range(ndim)]
-
-        rec_cat_arg = np.empty(subdims1, dtype="O")
-        rec_cat_arg_flat = rec_cat_arg.flat
-
-        # Iterate over the old blocks required to build the new block
-        for rec_cat_index, ind_slices in enumerate(cross1):
-            old_block_index, slices = zip(*ind_slices)
-            name = (split_name, next(split_name_suffixes))
-            old_index = old_blocks[old_block_index][1:]
-            if all(
-                slc.start == 0 and slc.stop == x.chunks[i][ind]
-                for i, (slc, ind) in enumerate(zip(slices, old_index))
-            ):
-                rec_cat_arg_flat[rec_cat_index] = old_blocks[old_block_index]
-            else:
-                intermediates[name] = (getitem, old_blocks[old_block_index], slices)
-                rec_cat_arg_flat[rec_cat_index] = name
+    layer = RechunkLayer(merge_name, x.name, x.chunks, chunks, token, method=method)
+    graph = HighLevelGraph.from_collections(merge_name, layer, dependencies=[x])
+    return Array(graph, merge_name, chunks, meta=x)
 
-        assert rec_cat_index == rec_cat_arg.size - 1
 
-        # New block is formed by concatenation of sliced old blocks
-        if all(d == 1 for d in rec_cat_arg.shape):
-            x2[key] = rec_cat_arg.flat[0]
-        else:
-            x2[key] = (concatenate3, rec_cat_arg.tolist())
+def stage_pieces(x, index, intersections, p):
+    """Write the pieces of block *x* at *index* needed by new blocks to partd *p*
 
-    del old_blocks, new_index
-
-    layer = toolz.merge(x2, intermediates)
-    graph = HighLevelGraph.from_collections(merge_name, layer, dependencies=[x])
-    return Array(graph, merge_name, chunks, meta=x)
+    ``intersections[d][i]`` lists the ``(new chunk, position, number of
+    pieces, slice)`` of the pieces that old chunk ``i`` along dimension ``d``
+    contributes to new chunks.  Pieces are stored under the index of their
+    new block, together with their position among the pieces of that block.
+    """
+    data = {}
+    for piece in product(*(intersections[d][i] for d, i in enumerate(index))):
+        block, position, npieces, slices = zip(*piece)
+        n = 0
+        for k, m in zip(position, npieces):
+            n = n * m + k
+        data[block] = [(n, x[slices])]
+    p.append(data, fsync=True)
+
+
+def barrier(args):
+    list(args)
+    return 0
+
+
+def collect_pieces(p, index, shape, barrier_token):
+    """Concatenate the pieces of new block *index* stored in partd *p*"""
+    pieces = [piece for _, piece in sorted(p.get(index), key=itemgetter(0))]
+    if len(pieces) == 1:
+        return pieces[0]
+    return concatenate3(reshapelist(shape, pieces))
 
 
 class _PrettyBlocks:
@@ -4,11 +4,11 @@ import math
 import operator
 from collections.abc import Iterable
 from functools import partial
-from itertools import product, repeat
+from itertools import product
 from numbers import Integral, Number
 
 import numpy as np
-from tlz import accumulate, compose, drop, get, partition_all, pluck
+from tlz import compose, drop, get, partition_all
 
 from dask import config
 from dask.array import chunk
@@ -36,8 +36,10 @@ from dask.array.utils import (
 )
 from dask.array.wrap import ones, zeros
 from dask.base import tokenize
+from dask.blockwise import blockwise as core_blockwise
 from dask.blockwise import lol_tuples
 from dask.highlevelgraph import HighLevelGraph
+from dask.layers import ArrayOffsetDep
 from dask.utils import (
     apply,
     deepmap,
@@ -1088,6 +1090,16 @@ def _arg_combine(data, axis, argfunc, keepdims=False):
     return arg, vals
 
 
+def _arg_chunk_at(chunk, x, offset, axis, shape=None):
+    """Apply ``chunk`` to the block of an arg-reduction at ``offset``
+
+    ``shape`` is the shape of the full array when reducing over all of its
+    axes, in which case ``chunk`` needs the offset into the raveled array.
+    """
+    offset_info = (offset, shape) if shape is not None else offset[axis[0]]
+    return chunk(x, axis, offset_info)
+
+
 def arg_chunk(func, argfunc, x, axis, offset_info):
     arg_axis = None if len(axis) == x.ndim or x.ndim == 1 else axis[0]
     vals = func(x, axis=arg_axis, keepdims=True)
@@ -1186,21 +1198,23 @@ def arg_reduction(
                 "  x.compute_chunk_sizes()"
             )
 
-    # Map chunk across all blocks
+    # Map chunk across all blocks. This is a Blockwise layer so that it
+    # fuses with the blockwise operations that produced ``x``.
     name = f"arg-reduce-{tokenize(axis, x, chunk, combine, split_every)}"
-    old = x.name
-    keys = list(product(*map(range, x.numblocks)))
-    offsets = list(product(*(accumulate(operator.add, bd[:-1], 0) for bd in x.chunks)))
-    if ravel:
-        offset_info = zip(offsets, repeat(x.shape))
-    else:
-        offset_info = pluck(axis[0], offsets)
-
+    inds = tuple(range(x.ndim))
     chunks = tuple((1,) * len(c) if i in axis else c for (i, c) in enumerate(x.chunks))
-    dsk = {
-        (name,) + k: (chunk, (old,) + k, axis, off)
-        for (k, off) in zip(keys, offset_info)
-    }
+    layer = core_blockwise(
+        partial(_arg_chunk_at, chunk),
+        name,
+        inds,
+        x.name,
+        inds,
+        ArrayOffsetDep(x.chunks),
+        inds,
+        numblocks={x.name: x.numblocks},
+        axis=axis,
+        shape=x.shape if ravel else None,
+    )
 
     dtype = np.argmin(asarray_safe([1], like=meta_from_array(x)))
     meta = None
@@ -1210,7 +1224,7 @@ def arg_reduction(
         meta = dtype
         dtype = meta.dtype
 
-    graph = HighLevelGraph.from_collections(name, dsk, dependencies=[x])
+    graph = HighLevelGraph.from_collections(name, layer, dependencies=[x])
     tmp = Array(graph, name, chunks, dtype=dtype, meta=meta)
 
     result = _tree_reduce(
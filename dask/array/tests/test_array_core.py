@@ -1,5 +1,6 @@
 import contextlib
 import copy
+import itertools
 import pathlib
 import re
 import xml.etree.ElementTree
@@ -12,6 +13,7 @@ np = pytest.importorskip("numpy")
 import math
 import operator
 import os
+import pickle
 import time
 import warnings
 from functools import reduce
@@ -28,7 +30,9 @@ from dask.array.chunk import getitem
 from dask.array.core import (
     Array,
     BlockView,
+    ChunkLocks,
     PerformanceWarning,
+    StoreWriter,
     blockdims_from_blockshape,
     broadcast_chunks,
     broadcast_shapes,
@@ -47,6 +51,7 @@ from dask.array.core import (
     optimize,
     stack,
     store,
+    store_chunk,
 )
 from dask.array.reshape import _not_implemented_message
 from dask.array.tests.test_dispatch import EncapsulateNDArray
@@ -145,6 +150,33 @@ def test_top_literals():
     }
 
 
+@pytest.mark.parametrize(
+    "args, kwargs",
+    [
+        (("z", "ij", "x", "ji"), {}),
+        (("z", "ij", "x", "ij", "y", "j"), {}),
+        (("z", "i", "x", "ij", "y", "j"), {}),
+        (("z", "i", "x", "ij", "y", "j"), {"concatenate": True}),
+        (("z", "ij", "x", "ij", 123, None), {"c": 1}),
+        (("z", "", "x", "ij"), {"concatenate": True}),
+    ],
+)
+def test_top_key_deps(args, kwargs):
+    from dask.core import keys_in_tasks
+
+    numblocks = {"x": (2, 3), "y": (3,)}
+    numblocks = {k: v for k, v in numblocks.items() if k in args}
+    dsk, key_deps = top(add, *args, numblocks=numblocks, return_key_deps=True, **kwargs)
+    keys = {
+        (name,) + idx
+        for name, nb in numblocks.items()
+        for idx in itertools.product(*map(range, nb))
+    }
+    assert key_deps.keys() == dsk.keys()
+    for k, task in dsk.items():
+        assert key_deps[k] == set(keys_in_tasks(keys, [task]))
+
+
 def test_blockwise_literals():
     x = da.ones((10, 10), chunks=(5, 5))
     z = da.blockwise(add, "ij", x, "ij", 100, None, dtype=x.dtype)
@@ -2165,6 +2197,144 @@ def test_store_deterministic_keys(return_stored, delayed_target):
     assert st1.dask.keys() == st2.dask.keys()
 
 
+@pytest.mark.parametrize("compute", [False, True])
+@pytest.mark.parametrize("return_stored", [False, True])
+def test_store_writer(compute, return_stored):
+    d = da.ones((10, 10), chunks=(2, 2))
+    a = d + 1
+    at = np.zeros(shape=(10, 10))
+    writer = StoreWriter()
+
+    r = store(
+        a, at, writer=writer, compute=compute, return_stored=return_stored, lock=False
+    )
+    if return_stored:
+        assert_eq(r[0], a)
+    elif not compute:
+        assert (at == 0).all()
+        dask.compute(r)
+    assert_eq(at, a)
+    if return_stored and not compute:
+        # Loading needs the write to have finished, so the writer is unused
+        assert writer.nwrites == 0
+    else:
+        assert writer.nwrites == 25
+        assert writer.nbytes == a.nbytes
+        assert writer.elapsed > 0
+
+
+def test_store_writer_backpressure():
+    d = da.ones((10, 10), chunks=(2, 2))
+    at = ThreadSafeStore()
+    lock = CounterLock()
+    # Room for one block at a time
+    writer = StoreWriter(max_in_flight=d.blocks[0, 0].nbytes, num_threads=4)
+
+    store(d, at, writer=writer, lock=lock, scheduler="threads", num_workers=4)
+    assert at.max_concurrent_uses == 1
+    assert lock.acquire_count == lock.release_count == 25
+    assert writer.nwrites == 25
+    assert writer.backpressure_events > 0
+    assert writer.backpressure_time > 0
+
+
+class FailingStore:
+    def __setitem__(self, key, value):
+        raise ValueError("write failed")
+
+
+def test_store_writer_error():
+    d = da.ones((10, 10), chunks=(2, 2))
+    writer = StoreWriter()
+    with pytest.raises(ValueError, match="write failed"):
+        store(d, FailingStore(), writer=writer, lock=False)
+
+    # The writer can be used again
+    at = np.zeros(shape=(10, 10))
+    store(d, at, writer=writer, lock=False)
+    assert_eq(at, d)
+
+
+def test_store_writer_not_serializable():
+    with pytest.raises(TypeError, match="threaded schedulers"):
+        pickle.dumps(StoreWriter())
+
+
+class ChunkedStore:
+    """A target stored in chunks, which checks that no chunk is written to
+    by two threads at once"""
+
+    def __init__(self, shape, chunks):
+        self.data = np.zeros(shape)
+        self.shape = shape
+        self.chunks = chunks
+        self.in_use = set()
+
+    def __setitem__(self, key, value):
+        chunks = set(
+            itertools.product(
+                *[
+                    range(k.start // c, -(-k.stop // c))
+                    for k, c in zip(key, self.chunks)
+                ]
+            )
+        )
+        if self.in_use & chunks:
+            raise ThreadSafetyError()
+        self.in_use |= chunks
+        time.sleep(0.001)
+        self.data[key] = value
+        self.in_use -= chunks
+
+
+def store_locks(x, target, **kwargs):
+    dsk = store(x, target, compute=False, **kwargs).dask
+    return [task[4] for task in dsk.values() if task[0] is store_chunk]
+
+
+def test_store_aligned_chunks_without_lock():
+    x = da.arange(200, chunks=20, dtype="f8").reshape(10, 20).rechunk((5, 10))
+    at = ChunkedStore(x.shape, (5, 5))
+    assert store_locks(x, at) == [False] * 4
+
+    store(x, at, scheduler="threads")
+    assert_eq(at.data, x)
+
+
+def test_store_unaligned_chunks_locks():
+    x = da.arange(200, chunks=20, dtype="f8").reshape(10, 20).rechunk((5, 10))
+    at = ChunkedStore(x.shape, (5, 4))
+    with pytest.warns(PerformanceWarning, match=r"\.rechunk\(\(5, 8\)\)"):
+        locks = store_locks(x, at)
+    # Blocks in the same row share the storage chunk holding columns 8-12
+    assert all(isinstance(lock, ChunkLocks) for lock in locks)
+    assert locks[0].locks == locks[1].locks
+    assert locks[2].locks == locks[3].locks
+    assert locks[0].locks != locks[2].locks
+
+    with pytest.warns(PerformanceWarning):
+        store(x, at, scheduler="threads")
+    assert_eq(at.data, x)
+
+    # The suggested chunks align
+    assert store_locks(x.rechunk((5, 8)), at) == [False] * 6
+
+
+def test_store_region_chunk_locks():
+    x = da.ones((10, 20), chunks=(5, 10))
+    at = ChunkedStore((20, 20), (5, 5))
+    with pytest.warns(PerformanceWarning, match=r"\(2, 5, 3\)"):
+        locks = store_locks(x, at, regions=(slice(3, 13),))
+    assert [len(lock.locks) for lock in locks] == [2, 2, 2, 2]
+    assert store_locks(x, at, regions=(slice(5, 15),)) == [False] * 4
+
+    # Other locks are left alone
+    assert store_locks(x, at, lock=False) == [False] * 4
+    locks = store_locks(x, np.zeros((10, 20)))
+    assert isinstance(locks[0], type(Lock()))
+    assert all(lock is locks[0] for lock in locks)
+
+
 def test_to_hdf5():
     h5py = pytest.importorskip("h5py")
     x = da.ones((4, 4), chunks=(2, 2))
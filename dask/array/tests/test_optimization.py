@@ -14,10 +14,13 @@ from dask.array.optimization import (
     fuse_slice,
     optimize,
     optimize_blockwise,
+    optimize_rechunk_reads,
     optimize_slices,
 )
 from dask.array.utils import assert_eq
+from dask.core import flatten
 from dask.highlevelgraph import HighLevelGraph
+from dask.layers import RechunkLayer
 from dask.optimization import SubgraphCallable, fuse
 from dask.utils import SerializableLock
 
@@ -553,3 +556,95 @@ def test_optimize_blockwise_duplicate_dependency(optimize_graph):
     # Compare to known answer
     result = z.compute(optimize_graph=optimize_graph)
     assert assert_eq(result, [[12, 12], [24, 24]])
+
+
+class ChunkedStore:
+    """Array-like with native chunks, recording its reads"""
+
+    def __init__(self, x, chunks=None):
+        self.x = x
+        self.chunks = chunks
+        self.shape = x.shape
+        self.dtype = x.dtype
+        self.ndim = x.ndim
+        self.reads = []
+
+    def __getitem__(self, index):
+        self.reads.append(index)
+        return self.x[index]
+
+
+@pytest.mark.parametrize("inline_array", [False, True])
+@pytest.mark.parametrize("steps", [1, 2])
+def test_optimize_rechunk_reads(inline_array, steps):
+    a = np.arange(600).reshape(20, 30)
+    store = ChunkedStore(a)
+    x = da.from_array(store, chunks=(1, 30), inline_array=inline_array)
+    y = x.rechunk((20, 3)) if steps == 1 else x.rechunk((4, 15)).rechunk((20, 3))
+
+    dsk = optimize_rechunk_reads(y.dask)
+    assert not any(isinstance(layer, RechunkLayer) for layer in dsk.layers.values())
+    assert dsk.get_all_external_keys() >= set(flatten(y.__dask_keys__()))
+
+    store.reads.clear()
+    assert_eq(y, a)
+    assert sorted(store.reads) == sorted(
+        (slice(0, 20), slice(i, i + 3)) for i in range(0, 30, 3)
+    )
+
+    # Unless other collections read the source in its own chunks as well
+    store.reads.clear()
+    r, s = dask.compute(y, x.sum())
+    assert_eq(r, a)
+    assert s == a.sum()
+    assert len(store.reads) == 20
+    store.reads.clear()
+    r, s = dask.compute(y, x)
+    assert_eq(r, a)
+    assert_eq(s, a)
+    assert len(store.reads) == 20
+
+
+def test_optimize_rechunk_reads_native_chunks():
+    a = np.arange(600).reshape(20, 30)
+    store = ChunkedStore(a, chunks=(10, 10))
+    x = da.from_array(store, chunks=(20, 5))
+    y = x.rechunk((5, 30))
+
+    # Reads are merged up to the native chunks, then sliced
+    store.reads.clear()
+    assert_eq(y, a)
+    assert sorted(store.reads) == [
+        (slice(0, 10), slice(0, 30)),
+        (slice(10, 20), slice(0, 30)),
+    ]
+
+    # Unless they would be larger than the chunk size limit
+    store.reads.clear()
+    with dask.config.set({"array.chunk-size": 10 * 30 * a.itemsize - 1}):
+        assert_eq(y, a)
+    assert len(store.reads) == 4
+
+
+def test_optimize_rechunk_reads_keeps_method():
+    a = np.arange(600).reshape(20, 30)
+    store = ChunkedStore(a, chunks=(10, 10))
+    x = da.from_array(store, chunks=(20, 5))
+    y = x.rechunk((5, 30), method="disk")
+    dsk = optimize_rechunk_reads(y.dask)
+    (layer,) = (v for v in dsk.layers.values() if isinstance(v, RechunkLayer))
+    assert layer.method == "disk"
+    assert_eq(y, a)
+
+
+def test_optimize_rechunk_reads_other_sources():
+    a = np.arange(600).reshape(20, 30)
+    x = da.from_array(a, chunks=(1, 30))
+    y = x.rechunk((20, 3))
+    assert optimize_rechunk_reads(y.dask) is y.dask
+
+    # Rechunks of computed arrays are left alone
+    store = ChunkedStore(a)
+    z = (da.from_array(store, chunks=(1, 30)) + 1).rechunk((20, 3))
+    assert optimize_rechunk_reads(z.dask) is z.dask
+    assert_eq(z, a + 1)
@@ -1,3 +1,4 @@
+import math
 import warnings
 from itertools import product
 
@@ -1070,3 +1071,164 @@ def test_old_to_new_with_zero():
         [[(0, slice(0, 4))], [(2, slice(0, 0))], [(2, slice(0, 2))], [(2, slice(2, 4))]]
     ]
     assert result == expected
+
+
+def test_rechunk_layer_is_lazy():
+    from dask.layers import RechunkLayer
+
+    x = da.ones((10000, 10000), chunks=(1, 10000))
+    y = rechunk(x, (10000, 1), threshold=float("inf"))
+    layer = y.dask.layers[y.name]
+    assert isinstance(layer, RechunkLayer)
+    assert len(layer) == 10000 + 10000**2
+    assert not layer.is_materialized()
+
+    # Culling only builds the tasks of the requested blocks
+    z = y[:, :2]
+    dsk = z.__dask_graph__().cull(set(z.__dask_keys__()[0]) | {(y.name, 0, 0)})
+    culled = dsk.layers[y.name]
+    assert len(culled) == 2 + 2 * 10000
+    assert not layer.is_materialized()
+
+
+@pytest.mark.parametrize("method", ["tasks", "disk"])
+def test_rechunk_layer_dependencies(method):
+    x = da.ones((12, 12, 4), chunks=(5, 3, 4))
+    y = x.rechunk((3, 5, 2), method=method)
+    layer = y.dask.layers[y.name]
+    dsk = dict(layer)
+    assert len(layer) == len(dsk)
+    all_keys = y.dask.get_all_external_keys()
+    for key, task in dsk.items():
+        expected = dask.core.keys_in_tasks(set(dsk) | all_keys, [task])
+        assert layer.get_dependencies(key, all_keys) == expected
+
+
+@pytest.mark.parametrize("scheduler", ["sync", "threads"])
+@pytest.mark.parametrize(
+    "old,new",
+    [
+        ((1, 24), (24, 1)),
+        ((5, 7), (3, 11)),
+        (((7,), (10, 0, 0, 9, 0, 5)), (2, 3)),
+    ],
+)
+def test_rechunk_method_disk(old, new, scheduler):
+    a = np.arange(7 * 24).reshape(7, 24)
+    x = da.from_array(a, chunks=old)
+    y = x.rechunk(new, method="disk")
+    assert y.chunks == normalize_chunks(new, a.shape)
+    assert len(y.dask.layers[y.name]) < x.npartitions + y.npartitions + 3
+    assert_eq(y, a, scheduler=scheduler)
+    assert_eq(y[2:5, 1], a[2:5, 1], scheduler=scheduler)
+
+    with dask.config.set({"array.rechunk-method": "disk"}):
+        assert x.rechunk(new).name == y.name
+
+    with pytest.raises(ValueError, match="Unknown rechunk method"):
+        x.rechunk(new, method="p2p")
+
+
+def test_search_rechunk_plan():
+    from dask.array.rechunk import _plan_cost, rechunk_cost, search_rechunk_plan
+
+    c = (20,) * 2  # coarse
+    f = (2,) * 20  # fine
+
+    # No intermediate required
+    plan = search_rechunk_plan((c, c), (f, f), itemsize=1)
+    assert plan.steps == [(f, f)]
+    assert plan.cost == rechunk_cost((c, c), (f, f), itemsize=1)
+
+    # Never worse than the heuristic plan by the cost model
+    for old, new, limit in [
+        ((f, c), (c, f), 1e7),
+        ((f, c), (c, f), 399),
+        (((1,) * 1000, (1000,)), ((1000,), (1,) * 1000), 1e6),
+        ((c + f, f + c, c), (f + c, c + f, f), 1e4),
+    ]:
+        plan = search_rechunk_plan(old, new, itemsize=1, block_size_limit=limit)
+        assert plan.steps[-1] == new
+        assert len(plan.steps) <= 4
+        heuristic = plan_rechunk(old, new, itemsize=1, block_size_limit=limit)
+        assert plan.cost.seconds <= _plan_cost(old, heuristic, itemsize=1).seconds
+        assert plan.cost.tasks < rechunk_cost(old, new, itemsize=1).tasks
+        for chunks in plan.steps[:-1]:
+            assert max(map(max, chunks)) ** 2 <= max(limit, 400)
+
+    # Weights trade tasks against copies
+    plan = search_rechunk_plan((f, c), (c, f), itemsize=1, bandwidth=1e-9)
+    assert plan.steps == [(c, f)]
+
+
+def test_search_rechunk_plan_many_dimensions():
+    from dask.array.rechunk import (
+        _intermediate_chunks,
+        rechunk_cost,
+        search_rechunk_plan,
+    )
+
+    # Candidates grow linearly with the number of dimensions that change
+    for ndim in [2, 4, 7]:
+        old = tuple((1,) * 8 if d % 2 else (8,) for d in range(ndim))
+        new = tuple((8,) if d % 2 else (1,) * 8 for d in range(ndim))
+        candidates = list(_intermediate_chunks(old, new, math.inf))
+        assert len(candidates) == len(set(candidates)) <= 3 + 10 * ndim
+        assert all(len(chunks) == ndim for chunks in candidates)
+
+    plan = search_rechunk_plan(old, new, itemsize=8, block_size_limit=8**7 // 2)
+    assert plan.steps[-1] == new
+    assert plan.cost.seconds < rechunk_cost(old, new, itemsize=8).seconds
+
+
+def test_rechunk_cost_native_chunks():
+    from dask.array.rechunk import rechunk_cost
+
+    old = ((10,) * 4,)
+    new = ((20,) * 2,)
+    assert rechunk_cost(old, new, itemsize=1).io_bytes == 0
+    # Reading the pieces of aligned chunks reads every byte once
+    assert rechunk_cost(old, new, itemsize=1, native_chunks=old).io_bytes == 40
+    # Reading pieces of native chunks reads whole native chunks
+    native = ((40,),)
+    assert rechunk_cost(old, new, itemsize=1, native_chunks=native).io_bytes == 160
+    # Along the first dimension, the pieces [0, 10) and [10, 20) touch the
+    # native chunks [0, 12) and [6, 20), along the second dimension the
+    # pieces [0, 10) and [10, 20) both touch the whole native chunk
+    cost = rechunk_cost(
+        ((10, 10), (20,)),
+        ((20,), (10, 10)),
+        itemsize=2,
+        native_chunks=((6, 6, 8), (20,)),
+    )
+    assert cost.io_bytes == (12 + 14) * (20 + 20) * 2
+
+
+def test_rechunk_planner_config():
+    x = da.ones((40, 40), chunks=(2, 40))
+    with dask.config.set({"array.rechunk-planner": "cost"}):
+        y = x.rechunk((40, 2), block_size_limit=800 * 8)
+    assert_eq(y, np.ones((40, 40)))
+    steps = [
+        layer.new_chunks
+        for layer in y.dask.layers.values()
+        if type(layer).__name__ == "RechunkLayer"
+    ]
+    assert steps[-1] == y.chunks
+    assert len(steps) > 1
+
+    with dask.config.set({"array.rechunk-planner": "best"}):
+        with pytest.raises(ValueError, match="Unknown rechunk planner"):
+            x.rechunk((40, 2))
+
+
+def test_rechunk_native_chunks():
+    from dask.array.rechunk import _native_chunks
+
+    class Stored(np.ndarray):
+        chunks = (10, 20)
+
+    a = np.ones((40, 40)).view(Stored)
+    assert _native_chunks(da.from_array(a, chunks=20)) == ((10,) * 4, (20,) * 2)
+    assert _native_chunks(da.from_array(np.ones((40, 40)), chunks=20)) is None
+    assert _native_chunks(da.ones((40, 40), chunks=20)) is None
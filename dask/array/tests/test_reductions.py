@@ -1,3 +1,4 @@
+import math
 import os
 import warnings
 from itertools import permutations, zip_longest
@@ -13,6 +14,7 @@ import dask.config as config
 from dask.array.numpy_compat import _numpy_122
 from dask.array.utils import assert_eq, same_keys
 from dask.core import get_deps
+from dask.utils import key_split
 
 
 @pytest.mark.parametrize("dtype", ["f4", "i4"])
@@ -256,6 +258,26 @@ def test_arg_reductions(dfunc, func):
     assert_eq(dfunc(a3), func(x3))
 
 
+@pytest.mark.parametrize(
+    "func", ["sum", "mean", "var", "argmin", "argmax", "nanargmin", "nanargmax"]
+)
+@pytest.mark.parametrize("axis", [None, 0])
+def test_reduction_chunk_step_fuses(func, axis):
+    x = np.random.random((8, 6))
+    a = da.from_array(x, chunks=2)
+    b = a + 1
+    result = getattr(da, func)(b, axis=axis, split_every=2)
+
+    dsk = result.__dask_optimize__(result.__dask_graph__(), result.__dask_keys__())
+    # The chunk step runs in the same task as ``a + 1``, leaving one task per
+    # input block plus the combine/aggregate tree
+    nblocks = math.prod(a.numblocks)
+    tree_tasks = len(dsk) - nblocks - len(a.dask)
+    assert 0 < tree_tasks < nblocks
+    assert not any(key_split(k).startswith("add") for k in dsk)
+    assert_eq(result, getattr(np, func)(x + 1, axis=axis))
+
+
 @pytest.mark.parametrize(
     ["dfunc", "func"], [(da.nanargmin, np.nanargmin), (da.nanargmax, np.nanargmax)]
 )
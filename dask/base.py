@@ -7,15 +7,18 @@ import inspect
 import os
 import pathlib
 import pickle
+import sys
 import threading
 import uuid
 import warnings
+import weakref
 from collections import OrderedDict
 from collections.abc import Callable, Iterator, Mapping
-from concurrent.futures import Executor
+from concurrent.futures import Executor, ThreadPoolExecutor
 from contextlib import contextmanager
 from enum import Enum
 from functools import partial
+from itertools import chain
 from numbers import Integral, Number
 from operator import getitem
 from typing import Literal
@@ -30,10 +33,17 @@ from dask.context import thread_state
 from dask.core import flatten
 from dask.core import get as simple_get
 from dask.core import literal, quote
-from dask.hashing import hash_buffer_hex
+from dask.hashing import hash_buffer, hash_buffer_hex, new_hasher
 from dask.system import CPU_COUNT
 from dask.typing import SchedulerGetCallable
-from dask.utils import Dispatch, apply, ensure_dict, is_namedtuple_instance, key_split
+from dask.utils import (
+    Dispatch,
+    apply,
+    ensure_dict,
+    is_namedtuple_instance,
+    key_split,
+    parse_bytes,
+)
 
 __all__ = (
     "DaskMethodsMixin",
@@ -350,9 +360,15 @@ def optimization_function(x):
     return getattr(x, "__dask_optimize__", dont_optimize)
 
 
-def collections_to_dsk(collections, optimize_graph=True, optimizations=(), **kwargs):
+def collections_to_dsk(
+    collections, optimize_graph=True, optimizations=(), store=None, **kwargs
+):
     """
     Convert many collections into a single dask graph, after optimization
+
+    If a ``dask.cache.ResultStore`` is given, the tasks whose results it holds
+    are replaced by loading them, and the tasks upstream of them are dropped,
+    before the graph is optimized.
     """
     from dask.highlevelgraph import HighLevelGraph
 
@@ -364,6 +380,8 @@ def collections_to_dsk(collections, optimize_graph=True, optimizations=(), **kwa
         graphs = []
         for opt, val in groups.items():
             dsk, keys = _extract_graph_and_keys(val)
+            if store is not None:
+                dsk = store.splice(dsk, keys)
             dsk = opt(dsk, keys, **kwargs)
 
             for opt_inner in optimizations:
@@ -377,7 +395,9 @@ def collections_to_dsk(collections, optimize_graph=True, optimizations=(), **kwa
         else:
             dsk = merge(*map(ensure_dict, graphs))
     else:
-        dsk, _ = _extract_graph_and_keys(collections)
+        dsk, keys = _extract_graph_and_keys(collections)
+        if store is not None:
+            dsk = store.splice(dsk, keys)
 
     return dsk
 
@@ -537,7 +557,13 @@ def optimize(*args, traverse=True, **kwargs):
 
 
 def compute(
-    *args, traverse=True, optimize_graph=True, scheduler=None, get=None, **kwargs
+    *args,
+    traverse=True,
+    optimize_graph=True,
+    scheduler=None,
+    get=None,
+    cache_dir=None,
+    **kwargs,
 ):
     """Compute several dask collections at once.
 
@@ -563,6 +589,11 @@ def compute(
         useful for debugging.
     get : ``None``
         Should be left to ``None`` The get= keyword has been removed.
+    cache_dir : str, optional
+        A directory in which to store the results, to be reused by later
+        computations, in this or another process, that contain the same
+        tasks.  Tasks whose results are found there are not run, nor is
+        anything upstream of them.  See ``dask.cache.ResultStore``.
     kwargs
         Extra keywords to forward to the scheduler function.
 
@@ -591,13 +622,20 @@ def compute(
         get=get,
     )
 
-    dsk = collections_to_dsk(collections, optimize_graph, **kwargs)
+    store = None
+    if cache_dir is not None:
+        from dask.cache import ResultStore
+
+        store = ResultStore(cache_dir)
+    dsk = collections_to_dsk(collections, optimize_graph, store=store, **kwargs)
     keys, postcomputes = [], []
     for x in collections:
         keys.append(x.__dask_keys__())
         postcomputes.append(x.__dask_postcompute__())
 
     results = schedule(dsk, keys, **kwargs)
+    if store is not None:
+        store.save(keys, results)
     return repack([f(r, *a) for r, (f, a) in zip(results, postcomputes)])
 
 
@@ -807,7 +845,14 @@ def visualize(
         raise ValueError(f"Visualization engine {engine} not recognized")
 
 
-def persist(*args, traverse=True, optimize_graph=True, scheduler=None, **kwargs):
+def persist(
+    *args,
+    traverse=True,
+    optimize_graph=True,
+    scheduler=None,
+    cache_dir=None,
+    **kwargs,
+):
     """Persist multiple Dask collections into memory
 
     This turns lazy Dask collections into Dask collections with the same
@@ -860,6 +905,9 @@ def persist(*args, traverse=True, optimize_graph=True, scheduler=None, **kwargs)
     optimize_graph : bool, optional
         If True [default], the graph is optimized before computation.
         Otherwise the graph is run as is. This can be useful for debugging.
+    cache_dir : str, optional
+        A directory in which to store the results, see ``compute``.  Not
+        supported with the distributed scheduler.
     **kwargs
         Extra keywords to forward to the scheduler function.
 
@@ -884,13 +932,22 @@ def persist(*args, traverse=True, optimize_graph=True, scheduler=None, **kwargs)
             except ValueError:
                 pass
             else:
+                if client.get == schedule and cache_dir is not None:
+                    raise NotImplementedError(
+                        "cache_dir is not supported with the distributed scheduler"
+                    )
                 if client.get == schedule:
                     results = client.persist(
                         collections, optimize_graph=optimize_graph, **kwargs
                     )
                     return repack(results)
 
-    dsk = collections_to_dsk(collections, optimize_graph, **kwargs)
+    store = None
+    if cache_dir is not None:
+        from dask.cache import ResultStore
+
+        store = ResultStore(cache_dir)
+    dsk = collections_to_dsk(collections, optimize_graph, store=store, **kwargs)
     keys, postpersists = [], []
     for a in collections:
         a_keys = list(flatten(a.__dask_keys__()))
@@ -899,6 +956,8 @@ def persist(*args, traverse=True, optimize_graph=True, scheduler=None, **kwargs)
         postpersists.append((rebuild, a_keys, state))
 
     results = schedule(dsk, keys, **kwargs)
+    if store is not None:
+        store.save(keys, results)
     d = dict(zip(keys, results))
     results2 = [r({k: d[k] for k in ks}, *s) for r, ks, s in postpersists]
     return repack(results2)
@@ -952,11 +1011,27 @@ normalize_token.register(
     ),
     identity,
 )
+# Exact types that normalize to themselves, checked before dispatching
+_identity_types = frozenset(
+    {int, float, str, bytes, bool, type(None), complex, type(Ellipsis)}
+)
 
 
 @normalize_token.register(dict)
 def normalize_dict(d):
-    return normalize_token(sorted(d.items(), key=str))
+    # Sort by keys alone, rather than the string of whole items, which can be
+    # expensive for values like arrays.  Fall back to the latter for distinct
+    # keys that look the same.
+    sort_keys = {(str(k), type(k).__name__) for k in d}
+    if len(sort_keys) == len(d):
+        items = sorted(d.items(), key=lambda kv: (str(kv[0]), type(kv[0]).__name__))
+    else:
+        items = sorted(d.items(), key=str)
+    np = sys.modules.get("numpy")
+    if np is not None and any(type(v) is np.ndarray for v in d.values()):
+        # Feed the buffers of arrays into one hasher
+        return "dict", _normalize_stream(list(chain.from_iterable(items)))
+    return normalize_token(items)
 
 
 @normalize_token.register(OrderedDict)
@@ -973,7 +1048,7 @@ def _normalize_seq_func(seq):
     # Defined outside normalize_seq to avoid unnecessary redefinitions and
     # therefore improving computation times.
     try:
-        return list(map(normalize_token, seq))
+        return [x if type(x) in _identity_types else normalize_token(x) for x in seq]
     except RecursionError:
         if not config.get("tokenize.ensure-deterministic"):
             return uuid.uuid4().hex
@@ -1131,14 +1206,27 @@ def register_pandas():
             normalize_token(arr.closed),
         ]
 
+    NumpyArray = getattr(pd.arrays, "NumpyExtensionArray", pd.arrays.PandasArray)
+
+    def normalize_stream(objects):
+        """``_normalize_stream``, hashing the data of indices directly"""
+        stream = []
+        for obj in objects:
+            if (
+                isinstance(obj, pd.Index)
+                and not isinstance(obj, pd.MultiIndex)
+                and isinstance(obj.array, NumpyArray)
+            ):
+                # A RangeIndex and an Index of the same values are different
+                stream.append((type(obj).__name__, obj.name))
+                stream.append(obj.array.to_numpy())
+            else:
+                stream.append(obj)
+        return _normalize_stream(stream)
+
     @normalize_token.register(pd.Series)
     def normalize_series(s):
-        return [
-            s.name,
-            s.dtype,
-            normalize_token(s._values),
-            normalize_token(s.index),
-        ]
+        return [s.name, s.dtype, normalize_stream([s._values, s.index])]
 
     @normalize_token.register(pd.DataFrame)
     def normalize_dataframe(df):
@@ -1152,7 +1240,7 @@ def register_pandas():
         else:
             data = [block.values for block in mgr.blocks]
         data.extend([df.columns, df.index])
-        return list(map(normalize_token, data))
+        return normalize_stream(data)
 
     @normalize_token.register(pd.api.extensions.ExtensionArray)
     def normalize_extension_array(arr):
@@ -1170,6 +1258,142 @@ def register_pandas():
         return normalize_token(dtype.name)
 
 
+# Tokens of large arrays, by ``id``.  Entries are removed when the array is
+# garbage collected.
+_array_tokens: dict = {}
+# Don't bother caching the tokens of arrays smaller than this
+_ARRAY_TOKEN_CACHE_MIN_BYTES = 2**20
+# Sampled tokens hash this many evenly spaced blocks of this many bytes
+_SAMPLE_BLOCKS = 64
+_SAMPLE_BLOCK_BYTES = 2**16
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+
+def _get_hash_pool():
+    global _hash_pool
+    if _hash_pool is None:
+        with _hash_pool_lock:
+            if _hash_pool is None:
+                _hash_pool = ThreadPoolExecutor(
+                    CPU_COUNT, thread_name_prefix="dask-tokenize"
+                )
+    return _hash_pool
+
+
+def _flat_bytes(x):
+    """The data of NumPy array ``x`` as a flat ``int8`` array"""
+    try:
+        return x.ravel(order="K").view("i1")
+    except (BufferError, AttributeError, ValueError):
+        return x.copy().ravel(order="K").view("i1")
+
+
+def _normalize_stream(objects):
+    """Single token of ``objects``, fed into one streaming hasher
+
+    The buffers of small NumPy arrays are hashed directly, rather than hashing
+    each of them to a token of its own.  Other objects are normalized with
+    ``normalize_token`` first.  Every object is preceded by its type, so that
+    ``1`` and ``"1"`` or ``None`` and ``"None"`` give different tokens.
+    """
+    np = sys.modules.get("numpy")
+    hasher = new_hasher()
+
+    def feed(buf):
+        hasher.update(b"%d:" % len(buf))
+        hasher.update(buf)
+
+    for obj in objects:
+        typ = type(obj)
+        feed(f"{typ.__module__}.{typ.__qualname__}".encode())
+        if (
+            np is not None
+            and type(obj) is np.ndarray
+            and obj.ndim
+            and not obj.dtype.hasobject
+            and obj.nbytes < _ARRAY_TOKEN_CACHE_MIN_BYTES
+        ):
+            feed(str((obj.dtype, obj.shape, obj.strides)).encode())
+            feed(_flat_bytes(obj))
+        else:
+            feed(str(normalize_token(obj)).encode())
+    return hasher.hexdigest()
+
+
+def _hash_buffer_chunked(buf):
+    """Hash a flat ``int8`` array, in parallel for large buffers
+
+    Buffers larger than ``tokenize.chunk-size`` are hashed in pieces of that
+    size on a pool of threads.  Hash functions release the GIL, so this uses
+    all cores.  The token only depends on the chunk size, not on the number
+    of threads.
+    """
+    chunk_size = config.get("tokenize.chunk-size", None)
+    if isinstance(chunk_size, str):
+        chunk_size = parse_bytes(chunk_size)
+    if not chunk_size or len(buf) <= chunk_size:
+        return hash_buffer_hex(buf)
+    chunks = [buf[i : i + chunk_size] for i in range(0, len(buf), chunk_size)]
+    digests = _get_hash_pool().map(hash_buffer, chunks)
+    return hash_buffer_hex(b"".join(digests))
+
+
+def _hash_buffer_sampled(buf):
+    """Hash evenly spaced blocks of a flat ``int8`` array, and its length"""
+    nbytes = len(buf)
+    if nbytes <= 2 * _SAMPLE_BLOCKS * _SAMPLE_BLOCK_BYTES:
+        return hash_buffer_hex(buf)
+    step = (nbytes - _SAMPLE_BLOCK_BYTES) // (_SAMPLE_BLOCKS - 1)
+    blocks = [
+        buf[i : i + _SAMPLE_BLOCK_BYTES].tobytes()
+        for i in range(0, step * _SAMPLE_BLOCKS, step)
+    ]
+    blocks.append(str(nbytes).encode())
+    return "sampled-" + hash_buffer_hex(b"".join(blocks))
+
+
+def _cached_array_token(x, compute):
+    """Token of array ``x``, cached for as long as ``x`` is alive
+
+    Tokens are cached by the identity of ``x`` and the address of its data, so
+    they don't notice if the data is modified in place.  By default only
+    tokens of read-only arrays that own their data are cached: a read-only
+    view can still change through a writeable base.  ``tokenize.cache`` set
+    to ``True`` caches all of them, set to ``False`` none.
+    """
+    policy = config.get("tokenize.cache", None)
+    if (
+        policy is False
+        or policy is None
+        and (x.flags.writeable or x.base is not None)
+        or x.nbytes < _ARRAY_TOKEN_CACHE_MIN_BYTES
+    ):
+        return compute()
+    key = id(x)
+    identity = (
+        x.__array_interface__["data"][0],
+        x.shape,
+        x.strides,
+        config.get("tokenize.sample", False),
+    )
+    try:
+        ref, cached_identity, token = _array_tokens[key]
+    except KeyError:
+        pass
+    else:
+        if ref() is x and cached_identity == identity:
+            return token
+    token = compute()
+    try:
+        ref = weakref.ref(x, lambda _: _array_tokens.pop(key, None))
+    except TypeError:
+        return token
+    _array_tokens[key] = (ref, identity, token)
+    return token
+
+
 @normalize_token.register_lazy("numpy")
 def register_numpy():
     import numpy as np
@@ -1198,6 +1422,11 @@ def register_numpy():
                 offset,
             )
         if x.dtype.hasobject:
+            if config.get("tokenize.sample", False) and x.size > 8 * _SAMPLE_BLOCKS:
+                # Hash evenly spaced elements
+                idx = np.linspace(0, x.size - 1, 8 * _SAMPLE_BLOCKS).astype(np.intp)
+                sample = normalize_array(x.flat[idx])
+                return ("sampled", sample, x.dtype, x.shape, x.strides)
             try:
                 try:
                     # string fast-path
@@ -1224,18 +1453,23 @@ def register_numpy():
                             "for more information"
                         )
         else:
-            try:
-                data = hash_buffer_hex(x.ravel(order="K").view("i1"))
-            except (BufferError, AttributeError, ValueError):
-                data = hash_buffer_hex(x.copy().ravel(order="K").view("i1"))
+            data = _cached_array_token(x, partial(hash_array_buffer, x))
         return (data, x.dtype, x.shape, x.strides)
 
+    def hash_array_buffer(x):
+        buf = _flat_bytes(x)
+        if config.get("tokenize.sample", False):
+            return _hash_buffer_sampled(buf)
+        return _hash_buffer_chunked(buf)
+
     @normalize_token.register(np.matrix)
     def normalize_matrix(x):
         return type(x).__name__, normalize_array(x.view(type=np.ndarray))
 
     normalize_token.register(np.dtype, repr)
     normalize_token.register(np.generic, repr)
+    # Default of ``initial=`` and friends in NumPy reductions
+    normalize_token.register(type(np._NoValue), repr)
 
     @normalize_token.register(np.ufunc)
     def normalize_ufunc(x):
@@ -1304,6 +1538,7 @@ if not _EMSCRIPTEN:
         {
             "threads": threaded.get,
             "threading": threaded.get,
+            "work-stealing": threaded.get_stealing,
         }
     )
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 import itertools
 import os
 from collections.abc import Hashable, Iterable, Mapping, Sequence
-from itertools import product
+from itertools import product, repeat
 from math import prod
 from typing import Any
 
@@ -16,6 +16,7 @@ from dask.highlevelgraph import HighLevelGraph, Layer
 from dask.optimization import SubgraphCallable, fuse
 from dask.utils import (
     _deprecated,
+    _gc_paused,
     apply,
     ensure_dict,
     homogeneous_deepmap,
@@ -533,15 +534,15 @@ class Blockwise(Layer):
     def get_output_keys(self):
         if self.output_blocks:
             # Culling has already generated a list of output blocks
-            return {(self.output, *p) for p in self.output_blocks}
+            return set(map((self.output,).__add__, self.output_blocks))
 
         # Return all possible output keys (no culling)
-        return {
-            (self.output, *p)
-            for p in itertools.product(
-                *[range(self.dims[i]) for i in self.output_indices]
+        return set(
+            map(
+                (self.output,).__add__,
+                itertools.product(*[range(self.dims[i]) for i in self.output_indices]),
             )
-        }
+        )
 
     def __getitem__(self, key):
         return self._dict[key]
@@ -717,11 +718,6 @@ class Blockwise(Layer):
         This method does not require graph materialization.
         """
 
-        # Check `concatenate` option
-        concatenate = None
-        if self.concatenate is True:
-            from dask.array.core import concatenate_axes as concatenate
-
         # Generate coordinate map
         (coord_maps, concat_axes, dummies) = _get_coord_mapping(
             self.dims,
@@ -729,7 +725,7 @@ class Blockwise(Layer):
             self.output_indices,
             self.numblocks,
             self.indices,
-            concatenate,
+            self.concatenate,
         )
 
         # Gather constant dependencies (for all output keys)
@@ -743,27 +739,29 @@ class Blockwise(Layer):
                     pass  # unhashable
 
         # Get dependencies for each output block
-        key_deps = {}
-        for out_coords in output_blocks:
-            deps = set()
-            coords = out_coords + dummies
-            for cmap, axes, (arg, ind) in zip(coord_maps, concat_axes, self.indices):
-                if ind is not None and arg not in self.io_deps:
-                    arg_coords = tuple(coords[c] for c in cmap)
-                    if axes:
-                        tups = lol_product((arg,), arg_coords)
-                        deps.update(flatten(tups))
-                        if concatenate:
-                            tups = (concatenate, tups, axes)
-                    else:
-                        tups = (arg,) + arg_coords
-                        deps.add(tups)
-            key_deps[(self.output,) + out_coords] = deps | const_deps
+        with _gc_paused():
+            blocks, columns = _output_block_columns(
+                self.dims, self.output_indices, output_blocks
+            )
+            arg_keys = [
+                (
+                    _blockwise_arg_keys(arg, cmap, axes, blocks, columns, dummies),
+                    bool(axes),
+                )
+                for cmap, axes, (arg, ind) in zip(coord_maps, concat_axes, self.indices)
+                if ind is not None and arg not in self.io_deps
+            ]
+            deps = _blockwise_key_deps(arg_keys, len(blocks))
+            if const_deps:
+                for d in deps:
+                    d |= const_deps
+            out_keys = zip(repeat(self.output, len(blocks)), *columns)
+            key_deps = dict(zip(out_keys, deps))
 
         # Add valid-key dependencies from io_deps
         for key, io_dep in self.io_deps.items():
             if io_dep.produces_keys:
-                for out_coords in output_blocks:
+                for out_coords in blocks:
                     key = (self.output,) + out_coords
                     valid_key_dep = io_dep[out_coords]
                     key_deps[key] |= {valid_key_dep}
@@ -791,10 +789,13 @@ class Blockwise(Layer):
         # collect a set of required output blocks (tuples), and
         # only construct graph for these blocks in `make_blockwise_graph`
 
-        output_blocks: set[tuple[int, ...]] = set()
-        for key in keys:
-            if key[0] == self.output:
-                output_blocks.add(tuple(map(int, key[1:])))
+        if len(keys) >= len(self) and self.get_output_keys().issubset(keys):
+            # Nothing to cull
+            return self, self._cull_dependencies(all_hlg_keys, self.output_blocks)
+
+        output_blocks: set[tuple[int, ...]] = {
+            tuple(map(int, key[1:])) for key in keys if key[0] == self.output
+        }
         culled_deps = self._cull_dependencies(all_hlg_keys, output_blocks)
         out_size_iter = (self.dims[i] for i in self.output_indices)
         if prod(out_size_iter) != len(culled_deps):
@@ -803,6 +804,13 @@ class Blockwise(Layer):
         else:
             return self, culled_deps
 
+    def get_dependencies(self, key: Hashable, all_hlg_keys: Iterable) -> set:
+        """Get dependencies of `key` without materializing the layer"""
+        if type(key) is tuple and key and key[0] == self.output:
+            block = tuple(map(int, key[1:]))
+            return self._cull_dependencies(all_hlg_keys, [block])[key]
+        return super().get_dependencies(key, all_hlg_keys)
+
     def clone(
         self,
         keys: set,
@@ -958,6 +966,67 @@ def _get_coord_mapping(
     return coord_maps, concat_axes, dummies
 
 
+def _output_block_columns(dims, out_indices, output_blocks=None):
+    """Coordinates of the output blocks to construct
+
+    Returns the blocks as a list of coordinate tuples, and the same
+    coordinates column by column, with one tuple per output index.
+    All blocks are constructed if ``output_blocks`` is None.
+
+    >>> _output_block_columns({'i': 2, 'j': 3}, 'ij', [(0, 1), (1, 2)])
+    ([(0, 1), (1, 2)], [(0, 1), (1, 2)])
+    """
+    if output_blocks is None:
+        blocks = list(product(*[range(dims[i]) for i in out_indices]))
+    else:
+        blocks = list(output_blocks)
+    columns = list(zip(*blocks)) or [()] * len(out_indices)
+    return blocks, columns
+
+
+def _blockwise_arg_keys(arg, cmap, axes, blocks, columns, dummies):
+    """Keys of ``arg`` that each of the output ``blocks`` takes
+
+    These are tuple keys, or lists of them (see ``lol_product``) for
+    arguments with indices that are not in the output.  Keys of arguments
+    indexed by output indices only are built column by column from
+    ``columns``, without looping over the blocks in Python.
+    """
+    nout = len(columns)
+    if not axes and all(c < nout for c in cmap):
+        # Negative positions point at the trailing zero of `dummies`
+        cols = [columns[c] if c >= 0 else repeat(0) for c in cmap]
+        return list(zip(repeat(arg, len(blocks)), *cols))
+
+    keys = []
+    for out_coords in blocks:
+        coords = out_coords + dummies
+        arg_coords = tuple(coords[c] for c in cmap)
+        if axes:
+            keys.append(lol_product((arg,), arg_coords))
+        else:
+            keys.append((arg,) + arg_coords)
+    return keys
+
+
+def _blockwise_key_deps(arg_keys, nblocks):
+    """Sets of dependencies of each output block
+
+    ``arg_keys`` holds the output of ``_blockwise_arg_keys`` for each
+    argument, along with whether its keys are nested in lists.
+    """
+    flat = [keys for keys, nested in arg_keys if not nested]
+    if flat:
+        deps = list(map(set, zip(*flat)))
+    else:
+        deps = [set() for _ in range(nblocks)]
+    for keys, nested in arg_keys:
+        if nested:
+            for d, k in zip(deps, keys):
+                d.update(flatten(k))
+    return deps
+
+
 def make_blockwise_graph(
     func,
     output,
@@ -1118,27 +1187,58 @@ def make_blockwise_graph(
 
     # Apply Culling.
     # Only need to construct the specified set of output blocks.
-    # Note that we must convert itertools.product to list,
-    # because we may need to loop through output_blocks more than
-    # once below (itertools.product already uses an internal list,
-    # so this is not a memory regression)
-    output_blocks = output_blocks or list(
-        itertools.product(*[range(dims[i]) for i in out_indices])
+    output_blocks, columns = _output_block_columns(
+        dims, out_indices, output_blocks or None
     )
 
-    dsk = {}
-    # Create argument lists
-    for out_coords in output_blocks:
-        deps = set()
-        coords = out_coords + dummies
-        args = []
-        for cmap, axes, (arg, ind) in zip(coord_maps, concat_axes, argpairs):
-            if ind is None:
-                if deserializing:
-                    args.append(stringify_collection_keys(arg))
+    if not deserializing:
+        # Build the graph argument by argument rather than block by block,
+        # see ``_blockwise_arg_keys``
+        with _gc_paused():
+            nblocks = len(output_blocks)
+            args = []
+            arg_keys = []
+            for cmap, axes, (arg, ind) in zip(coord_maps, concat_axes, argpairs):
+                if ind is None:
+                    args.append(repeat(arg, nblocks))
+                    continue
+                keys = _blockwise_arg_keys(
+                    arg, cmap, axes, output_blocks, columns, dummies
+                )
+                if arg not in io_deps:
+                    arg_keys.append((keys, bool(axes)))
+                if axes and concatenate:
+                    keys = [(concatenate, k, axes) for k in keys]
+                if arg in io_deps:
+                    # Replace "place-holder" IO keys with "real" args
+                    get = io_deps[arg].get
+                    idx = [k[1:] for k in keys]
+                    keys = list(map(get, idx, idx))
+                args.append(keys)
+
+            out_keys = list(zip(repeat(output, nblocks), *columns))
+            if kwargs:
+                if args:
+                    arg_lists = map(list, zip(*args))
                 else:
-                    args.append(arg)
+                    arg_lists = ([] for _ in range(nblocks))
+                tasks = zip(repeat(apply), repeat(func), arg_lists, repeat(kwargs2))
             else:
+                tasks = zip(repeat(func), *args)
+            dsk = dict(zip(out_keys, tasks))
+            if return_key_deps:
+                key_deps = dict(zip(out_keys, _blockwise_key_deps(arg_keys, nblocks)))
+    else:
+        # Stringify keys and serialize tasks for the distributed scheduler
+        dsk = {}
+        for out_coords in output_blocks:
+            deps = set()
+            coords = out_coords + dummies
+            args = []
+            for cmap, axes, (arg, ind) in zip(coord_maps, concat_axes, argpairs):
+                if ind is None:
+                    args.append(stringify_collection_keys(arg))
+                    continue
                 arg_coords = tuple(coords[c] for c in cmap)
                 if axes:
                     tups = lol_product((arg,), arg_coords)
@@ -1157,41 +1257,38 @@ def make_blockwise_graph(
                     # we are replacing here
                     idx = tups[1:]
                     args.append(io_deps[arg].get(idx, idx))
-                elif deserializing:
-                    args.append(stringify_collection_keys(tups))
                 else:
-                    args.append(tups)
-        out_key = (output,) + out_coords
+                    args.append(stringify_collection_keys(tups))
+            out_key = (output,) + out_coords
 
-        if deserializing:
             deps.update(func_future_args)
             args += list(func_future_args)
 
-        if deserializing and isinstance(func, bytes):
-            # Construct a function/args/kwargs dict if we
-            # do not have a nested task (i.e. concatenate=False).
-            # TODO: Avoid using the iterate_collection-version
-            # of to_serialize if we know that are no embedded
-            # Serialized/Serialize objects in args and/or kwargs.
-            if kwargs:
-                dsk[out_key] = {
-                    "function": func,
-                    "args": to_serialize(args),
-                    "kwargs": to_serialize(kwargs2),
-                }
-            else:
-                dsk[out_key] = {"function": func, "args": to_serialize(args)}
-        else:
-            if kwargs:
-                val = (apply, func, args, kwargs2)
+            if isinstance(func, bytes):
+                # Construct a function/args/kwargs dict if we
+                # do not have a nested task (i.e. concatenate=False).
+                # TODO: Avoid using the iterate_collection-version
+                # of to_serialize if we know that are no embedded
+                # Serialized/Serialize objects in args and/or kwargs.
+                if kwargs:
+                    dsk[out_key] = {
+                        "function": func,
+                        "args": to_serialize(args),
+                        "kwargs": to_serialize(kwargs2),
+                    }
+                else:
+                    dsk[out_key] = {"function": func, "args": to_serialize(args)}
             else:
-                args.insert(0, func)
-                val = tuple(args)
-            # May still need to serialize (if concatenate=True)
-            dsk[out_key] = to_serialize(val) if deserializing else val
+                if kwargs:
+                    val = (apply, func, args, kwargs2)
+                else:
+                    args.insert(0, func)
+                    val = tuple(args)
+                # May still need to serialize (if concatenate=True)
+                dsk[out_key] = to_serialize(val)
 
-        if return_key_deps:
-            key_deps[out_key] = deps
+            if return_key_deps:
+                key_deps[out_key] = deps
 
     if dsk2:
         dsk.update(ensure_dict(dsk2))
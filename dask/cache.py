@@ -1,15 +1,500 @@
+"""
+Opportunistic caching of task results
+
+``Cache`` is a callback that stores the results of tasks as they are computed
+and, when a later computation contains the same tasks, replaces them and
+everything upstream of them with the stored results.
+
+Results are identified by token rather than by key.  The token of a task
+hashes its key, its definition including the code of the functions it calls,
+and the tokens of its dependencies, see ``task_tokens``, so a result is only
+reused when the whole subgraph that produced it is the same.  Because tokens
+are deterministic, results written to an on-disk tier are found again by a
+new process that rebuilds the same graph.
+
+Tokens start with a hash of the key, so that a computation only needs to
+tokenize the tasks whose keys have results stored, and the tasks upstream of
+them.  The tokens of the other tasks are computed as they finish.
+
+Results are held by a ``ResultCache``, a stack of tiers that are searched in
+order.  ``MemoryTier`` holds results in memory and ``DiskTier`` in a local
+directory.  Both evict the results that are cheapest to recompute per byte
+first, where the cost of a result is the time spent computing it and all the
+tasks it depends on.
+"""
+import heapq
+import os
+import pickle
 import sys
+import threading
+import types
+import uuid
+import warnings
+from collections import defaultdict
+from functools import lru_cache, partial
 from numbers import Number
 from timeit import default_timer
 
+from tlz import merge
+
+from dask import config
+from dask.base import _md5, tokenize
 from dask.callbacks import Callback
+from dask.core import flatten, get_dependencies, has_tasks, quote, reverse_dict
+from dask.optimization import SubgraphCallable, cull
+from dask.sizeof import sizeof
+from dask.spill import dump_to_file, load_from_file
+from dask.utils import Dispatch, ensure_dict, format_bytes, parse_bytes
 
 overhead = sys.getsizeof(1.23) * 4 + sys.getsizeof(()) * 4
 
 
+class Tier:
+    """Base class of the tiers of a ``ResultCache``
+
+    A tier holds up to ``available_bytes`` of results.  Every result has a
+    score, its cost per byte, which grows each time the result is used, with
+    recent uses counting more than old ones.  When the tier is full the
+    results with the lowest score are evicted.
+
+    Subclasses implement ``_store``, ``_load`` and ``_remove``.
+
+    Parameters
+    ----------
+    available_bytes : int or str, optional
+        Number of bytes to hold, like ``"2 GB"``.  Defaults to no limit.
+    halflife : int
+        Number of uses after which a use counts half as much as a new one
+    """
+
+    name = "tier"
+
+    def __init__(self, available_bytes=None, halflife=1000):
+        if isinstance(available_bytes, str):
+            available_bytes = parse_bytes(available_bytes)
+        self.available_bytes = available_bytes
+        self.halflife = halflife
+        self._decay = 2 ** (1 / halflife)
+        self._tick = 1.0
+        self.cost = {}
+        self.nbytes = {}
+        self.score = {}
+        self.total_bytes = 0
+        self._heap = []
+        self.evictions = 0
+        # Number of results stored per key name, see ``Cache``
+        self.names = defaultdict(int)
+
+    def __contains__(self, token):
+        return token in self.cost
+
+    def __len__(self):
+        return len(self.cost)
+
+    def __iter__(self):
+        return iter(self.cost)
+
+    def get(self, token):
+        """Return the result stored under ``token`` and its cost
+
+        Raises ``KeyError`` if there is none.
+        """
+        if token not in self.cost:
+            raise KeyError(token)
+        try:
+            value = self._load(token)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            # Removed or corrupted behind our back
+            self._discard(token)
+            raise KeyError(token)
+        self._touch(token)
+        return value, self.cost[token]
+
+    def put(self, token, value, cost, nbytes=None):
+        """Store ``value`` under ``token``
+
+        Parameters
+        ----------
+        token : str
+        value : object
+        cost : float
+            Seconds it took to compute ``value``
+        nbytes : int, optional
+            Size of ``value``.  Defaults to what the tier measures.
+
+        Returns True if the value was stored.
+        """
+        if token in self.cost:
+            return True
+        nbytes = self._store(token, value, cost, nbytes)
+        if nbytes is None:
+            return False
+        self._add(token, cost, nbytes)
+        self._evict()
+        return token in self.cost
+
+    def _add(self, token, cost, nbytes):
+        self.cost[token] = cost
+        self.nbytes[token] = nbytes
+        self.score[token] = 0
+        self.total_bytes += nbytes
+        self.names[_token_name(token)] += 1
+        self._touch(token)
+
+    def _touch(self, token):
+        self.score[token] += self.cost[token] / max(self.nbytes[token], 1) * self._tick
+        heapq.heappush(self._heap, (self.score[token], token))
+        self._tick *= self._decay
+        if self._tick > 1e100:
+            self._rescale()
+
+    def _rescale(self):
+        for token in self.score:
+            self.score[token] /= self._tick
+        self._tick = 1.0
+        self._heap = [(score, token) for token, score in self.score.items()]
+        heapq.heapify(self._heap)
+
+    def _evict(self):
+        limit = self.available_bytes
+        if limit is None:
+            return
+        heap = self._heap
+        while self.total_bytes > limit and heap:
+            score, token = heapq.heappop(heap)
+            if self.score.get(token) != score:
+                continue  # stale entry
+            self._discard(token)
+            self.evictions += 1
+
+    def _discard(self, token):
+        if token not in self.cost:
+            return
+        self._remove(token)
+        del self.cost[token]
+        del self.score[token]
+        self.total_bytes -= self.nbytes.pop(token)
+        name = _token_name(token)
+        self.names[name] -= 1
+        if not self.names[name]:
+            del self.names[name]
+
+    def clear(self):
+        for token in list(self.cost):
+            self._discard(token)
+        self._heap = []
+
+    def _store(self, token, value, cost, nbytes):
+        """Store a value, returning its size or None if it was not stored"""
+        raise NotImplementedError
+
+    def _load(self, token):
+        raise NotImplementedError
+
+    def _remove(self, token):
+        raise NotImplementedError
+
+    def __repr__(self):
+        limit = self.available_bytes
+        return "<{}: {} results, {} of {}>".format(
+            type(self).__name__,
+            len(self),
+            format_bytes(self.total_bytes),
+            "unlimited" if limit is None else format_bytes(limit),
+        )
+
+
+class MemoryTier(Tier):
+    """Hold results in memory
+
+    Sizes are measured with ``dask.sizeof``.
+
+    Examples
+    --------
+    >>> tier = MemoryTier(2000)
+    >>> tier.put('cheap', b'0' * 600, cost=0.1)
+    True
+    >>> tier.put('expensive', b'1' * 600, cost=10)
+    True
+    >>> tier.put('new', b'2' * 600, cost=1)
+    True
+    >>> sorted(tier), tier.evictions
+    (['expensive', 'new'], 1)
+    """
+
+    name = "memory"
+
+    def __init__(self, available_bytes=None, halflife=1000):
+        super().__init__(available_bytes, halflife=halflife)
+        self.data = {}
+
+    def _store(self, token, value, cost, nbytes):
+        if nbytes is None:
+            nbytes = sizeof(value) + overhead
+        if self.available_bytes is not None and nbytes > self.available_bytes:
+            return None
+        self.data[token] = value
+        return nbytes
+
+    def _load(self, token):
+        return self.data[token]
+
+    def _remove(self, token):
+        del self.data[token]
+
+
+class DiskTier(Tier):
+    """Hold results in files in a local directory
+
+    Results are written with pickle protocol 5, see ``dask.spill``, next to a
+    small file recording their cost.  The directory is read when the tier is
+    created, so results written by earlier processes can be used again.
+
+    Results that can not be pickled are skipped.
+
+    Parameters
+    ----------
+    directory : str
+        Where to store results.  Created if it does not exist.
+    available_bytes : int or str, optional
+        Number of bytes of files to keep.  Defaults to no limit.
+    min_duration : float
+        Only store results that took at least this many seconds to compute
+    halflife : int
+        See ``Tier``
+    """
+
+    name = "disk"
+
+    def __init__(self, directory, available_bytes=None, min_duration=0, halflife=1000):
+        super().__init__(available_bytes, halflife=halflife)
+        self.directory = os.fspath(directory)
+        self.min_duration = min_duration
+        self.frames = {}
+        os.makedirs(self.directory, exist_ok=True)
+        for fn in os.listdir(self.directory):
+            token, ext = os.path.splitext(fn)
+            if ext != ".meta":
+                continue
+            try:
+                with open(os.path.join(self.directory, fn), "rb") as f:
+                    frames, cost = pickle.load(f)
+            except Exception:
+                continue
+            self.frames[token] = frames
+            self._add(token, cost, sum(frames))
+        self._evict()
+
+    def _path(self, token, ext):
+        return os.path.join(self.directory, token + ext)
+
+    def put(self, token, value, cost, nbytes=None):
+        if cost < self.min_duration:
+            return False
+        return super().put(token, value, cost, nbytes)
+
+    def _store(self, token, value, cost, nbytes):
+        # Write to temporary files and move them into place, so that other
+        # processes never see partially written results.
+        path = self._path(token, ".data")
+        tmp = self._path(uuid.uuid4().hex, ".tmp")
+        try:
+            frames = dump_to_file(value, tmp)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return None
+        with open(tmp, "wb") as f:
+            pickle.dump((frames, cost), f)
+        os.replace(tmp, self._path(token, ".meta"))
+        self.frames[token] = frames
+        return sum(frames)
+
+    def _load(self, token):
+        return load_from_file(self._path(token, ".data"), self.frames[token])
+
+    def _remove(self, token):
+        del self.frames[token]
+        for ext in [".meta", ".data"]:
+            try:
+                os.remove(self._path(token, ext))
+            except FileNotFoundError:
+                pass
+
+
+class ResultCache:
+    """Results stored in a sequence of tiers
+
+    Results are written to every tier and looked up in order.  A result found
+    in a later tier is copied to the earlier ones.
+
+    Parameters
+    ----------
+    tiers : list of Tier
+
+    Attributes
+    ----------
+    hits, misses : int
+        Number of successful and failed lookups
+    evictions : int
+        Number of results evicted, summed over the tiers
+
+    Examples
+    --------
+    >>> cache = ResultCache([MemoryTier(1e9)])
+    >>> cache.put('token', 123, cost=1.0)
+    >>> cache['token']
+    123
+    >>> 'other' in cache
+    False
+    >>> cache.stats['hits']
+    1
+    """
+
+    def __init__(self, tiers):
+        self.tiers = list(tiers)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @property
+    def evictions(self):
+        return sum(tier.evictions for tier in self.tiers)
+
+    @property
+    def stats(self):
+        """Hit, miss and eviction counters, for diagnostics"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "tiers": {
+                tier.name: {
+                    "results": len(tier),
+                    "nbytes": tier.total_bytes,
+                    "evictions": tier.evictions,
+                }
+                for tier in self.tiers
+            },
+        }
+
+    def __contains__(self, token):
+        return any(token in tier for tier in self.tiers)
+
+    def lookup(self, token):
+        """Return the result stored under ``token`` and its cost
+
+        Raises ``KeyError`` if there is none.
+        """
+        with self.lock:
+            for i, tier in enumerate(self.tiers):
+                try:
+                    value, cost = tier.get(token)
+                except KeyError:
+                    continue
+                for upper in self.tiers[:i]:
+                    upper.put(token, value, cost)
+                self.hits += 1
+                return value, cost
+            self.misses += 1
+            raise KeyError(token)
+
+    def __getitem__(self, token):
+        return self.lookup(token)[0]
+
+    def put(self, token, value, cost, nbytes=None):
+        """Store ``value``, which took ``cost`` seconds to compute"""
+        with self.lock:
+            for tier in self.tiers:
+                tier.put(token, value, cost, nbytes=nbytes)
+
+    def clear(self):
+        with self.lock:
+            for tier in self.tiers:
+                tier.clear()
+
+    def __repr__(self):
+        return "<ResultCache: hits={}, misses={}, evictions={}, tiers={}>".format(
+            self.hits, self.misses, self.evictions, self.tiers
+        )
+
+
+class CacheyTier(Tier):
+    """Hold results in a ``cachey.Cache``
+
+    This lets ``Cache`` keep using a ``cachey.Cache`` created for earlier
+    versions of Dask.  Eviction is left to ``cachey``, which does not report
+    the cost of its results, so results found here count as free to compute.
+
+    Deprecated, use ``MemoryTier`` instead.
+    """
+
+    name = "cachey"
+
+    def __init__(self, cache):
+        super().__init__(cache.available_bytes)
+        self.cachey = cache
+
+    def __contains__(self, token):
+        return token in self.cachey.data
+
+    def __len__(self):
+        return len(self.cachey.data)
+
+    def __iter__(self):
+        return iter(self.cachey.data)
+
+    def get(self, token):
+        if token not in self.cachey.data:
+            raise KeyError(token)
+        return self.cachey.get(token), 0
+
+    def put(self, token, value, cost, nbytes=None):
+        self.cachey.put(token, value, cost=cost, nbytes=nbytes)
+        self.total_bytes = self.cachey.total_bytes
+        if token not in self.cachey.data:
+            return False
+        # cachey evicts without telling us, so names are only pruned
+        # once most of them are stale
+        if len(self.names) > 2 * len(self.cachey.data):
+            self.names.clear()
+            for t in self.cachey.data:
+                self.names[_token_name(t)] += 1
+        else:
+            self.names[_token_name(token)] += 1
+        return True
+
+    def clear(self):
+        self.cachey.clear()
+        self.names.clear()
+        self.total_bytes = 0
+
+
+def _key_name(key):
+    return _md5(str(key).encode()).hexdigest()
+
+
+def _token_name(token):
+    """The key name a ``Cache`` token starts with"""
+    return token.partition("-")[0]
+
+
 class Cache(Callback):
     """Use cache for computation
 
+    Parameters
+    ----------
+    cache : int, ResultCache or list of Tier
+        Number of bytes of results to hold in memory, or the tiers to use
+    directory : str, optional
+        Also store results on disk, in this directory.  Results stored there
+        are reused by later processes that compute the same tasks.
+    disk_bytes : int or str, optional
+        Number of bytes to keep in ``directory``.  Defaults to no limit.
+    **kwargs
+        Passed to ``MemoryTier``
+
     Examples
     --------
 
@@ -26,41 +511,519 @@ class Cache(Callback):
 
     >>> cache.register()    # doctest: +SKIP
     >>> cache.unregister()  # doctest: +SKIP
+
+    Hits, misses and evictions are counted:
+
+    >>> cache.cache.stats  # doctest: +SKIP
+    {'hits': 10, 'misses': 2, 'evictions': 0, 'tiers': {...}}
+
+    Results are identified by the code of the functions that tasks call, but
+    not by the code those functions call in turn.  Clear a ``directory``
+    after changing such code, or use one directory per version of it.
     """
 
-    def __init__(self, cache, *args, **kwargs):
-        try:
-            import cachey
-        except ImportError as ex:
-            raise ImportError(
-                'Cache requires cachey, "{ex}" problem ' "importing".format(ex=str(ex))
-            ) from ex
-        self._nbytes = cachey.nbytes
+    def __init__(self, cache, directory=None, disk_bytes=None, **kwargs):
         if isinstance(cache, Number):
-            cache = cachey.Cache(cache, *args, **kwargs)
-        else:
-            assert not args and not kwargs
+            if cache < 0:
+                raise ValueError(f"Number of bytes must be positive, got {cache}")
+            tiers = [MemoryTier(cache, **kwargs)]
+            if directory is not None:
+                tiers.append(DiskTier(directory, available_bytes=disk_bytes))
+            cache = ResultCache(tiers)
+        elif directory is not None or disk_bytes is not None or kwargs:
+            raise TypeError(
+                "directory, disk_bytes and tier options can only be given "
+                "together with a number of bytes"
+            )
+        elif type(cache).__module__.split(".")[0] == "cachey":
+            warnings.warn(
+                "Passing a cachey.Cache to Cache is deprecated and will be "
+                "removed in a future release.  Pass a number of bytes or a "
+                "list of tiers instead.",
+                FutureWarning,
+                stacklevel=2,
+            )
+            cache = ResultCache([CacheyTier(cache)])
+        elif not isinstance(cache, ResultCache):
+            try:
+                tiers = list(cache)
+            except TypeError:
+                tiers = [cache]
+            if not tiers or not all(isinstance(t, Tier) for t in tiers):
+                raise TypeError(
+                    "Cache expects a number of bytes, a ResultCache or a list "
+                    f"of tiers, got {cache!r}"
+                )
+            cache = ResultCache(tiers)
         self.cache = cache
         self.starttimes = dict()
+        self.tokens = dict()
+        self.durations = dict()
 
     def _start(self, dsk):
         self.durations = dict()
-        overlap = set(dsk) & set(self.cache.data)
-        for key in overlap:
-            dsk[key] = self.cache.data[key]
+        self.tokens = dict()
+        names = [tier.names for tier in self.cache.tiers if tier.names]
+        if not names:
+            return
+
+        # Only tasks with results stored under their key can hit.  Tokenize
+        # them, and the tasks upstream of them.
+        candidates = [
+            key
+            for key, task in dsk.items()
+            if has_tasks(dsk, task) and any(_key_name(key) in n for n in names)
+        ]
+        task_tokens(dsk, candidates, self.tokens)
+        hits = {}
+        for key in candidates:
+            token = self.tokens[key]
+            if token is not None and _key_name(key) + "-" + token in self.cache:
+                hits[key] = _key_name(key) + "-" + token
+        with self.cache.lock:
+            self.cache.misses += len(candidates) - len(hits)
+        if not hits:
+            return
+
+        # Walk down from the outputs, replacing tasks with stored results.
+        # Only results that some computed task or output needs are loaded,
+        # everything upstream of them is left for the scheduler to cull.
+        dependencies = {k: get_dependencies(dsk, k) for k in dsk}
+        stack = [k for k, v in reverse_dict(dependencies).items() if not v]
+        seen = set(stack)
+        while stack:
+            key = stack.pop()
+            if key in hits:
+                try:
+                    value, cost = self.cache.lookup(hits[key])
+                except KeyError:  # evicted since
+                    pass
+                else:
+                    dsk[key] = quote(value)
+                    self.durations[key] = cost
+                    continue
+            for dep in dependencies[key]:
+                if dep not in seen:
+                    seen.add(dep)
+                    stack.append(dep)
+
+    def _token(self, key, dsk, deps):
+        """Token of a finished task, see ``task_tokens``"""
+        tokens = self.tokens
+        if key in tokens:
+            return tokens[key]
+        deps = sorted(deps, key=str)
+        for dep in deps:
+            if dep in tokens:
+                continue
+            if has_tasks(dsk, dsk[dep]):
+                task_tokens(dsk, [dep], tokens)
+            else:
+                # Data, which the scheduler does not run
+                tokens[dep] = _task_token(dep, dsk[dep], [])
+        dep_tokens = [tokens[d] for d in deps]
+        if None in dep_tokens:
+            token = None
+        else:
+            token = _task_token(key, dsk[key], dep_tokens)
+        tokens[key] = token
+        return token
 
     def _pretask(self, key, dsk, state):
         self.starttimes[key] = default_timer()
 
     def _posttask(self, key, value, dsk, state, id):
-        duration = default_timer() - self.starttimes[key]
+        duration = default_timer() - self.starttimes.pop(key)
         deps = state["dependencies"][key]
         if deps:
             duration += max(self.durations.get(k, 0) for k in deps)
         self.durations[key] = duration
-        nb = self._nbytes(value) + overhead + sys.getsizeof(key) * 4
-        self.cache.put(key, value, cost=duration / nb / 1e9, nbytes=nb)
+        token = self._token(key, dsk, deps)
+        if token is not None:
+            nb = sizeof(value) + overhead + sys.getsizeof(key) * 4
+            self.cache.put(
+                _key_name(key) + "-" + token, value, cost=duration, nbytes=nb
+            )
 
     def _finish(self, dsk, state, errored):
         self.starttimes.clear()
         self.durations.clear()
+        self.tokens.clear()
+
+
+################
+# Result store #
+################
+
+
+@lru_cache(maxsize=10_000)
+def _code_token(code):
+    """Hash the bytecode, names and constants of a code object
+
+    File names and line numbers are left out, so that moving code around does
+    not change the token.
+    """
+    consts = [
+        _code_token(c) if isinstance(c, types.CodeType) else repr(c)
+        for c in code.co_consts
+    ]
+    return tokenize(code.co_code, code.co_names, consts)
+
+
+def _normalize_callables(task, seen=frozenset()):
+    """Replace the functions in a task by the code they run
+
+    ``tokenize`` identifies module level functions by name only, so a result
+    stored by an old version of a function would be reused after the
+    function was edited.  This replaces functions by their name, their code
+    and the values they close over, recursing into ``functools.partial`` and
+    ``SubgraphCallable`` objects.
+    """
+    typ = type(task)
+    if typ is tuple or typ is list:
+        return typ(_normalize_callables(t, seen) for t in task)
+    if typ is dict:
+        return {k: _normalize_callables(v, seen) for k, v in task.items()}
+    if typ is partial:
+        return (
+            "partial",
+            _normalize_callables(task.func, seen),
+            _normalize_callables(task.args, seen),
+            _normalize_callables(task.keywords, seen),
+        )
+    if typ is SubgraphCallable:
+        return (
+            "subgraph",
+            _normalize_callables(task.dsk, seen),
+            task.outkey,
+            task.inkeys,
+        )
+    if typ is types.MethodType:
+        return ("method", _normalize_callables(task.__func__, seen), task.__self__)
+    if typ is types.FunctionType:
+        name = ("function", task.__module__, task.__qualname__)
+        if id(task) in seen:
+            # Recursive closures
+            return name
+        seen = seen | {id(task)}
+        cells = []
+        for cell in task.__closure__ or ():
+            try:
+                cells.append(_normalize_callables(cell.cell_contents, seen))
+            except ValueError:  # empty cell
+                cells.append(None)
+        return name + (
+            _code_token(task.__code__),
+            _normalize_callables(task.__defaults__, seen),
+            _normalize_callables(task.__kwdefaults__, seen),
+            cells,
+        )
+    return task
+
+
+_simple_types = {
+    int: "i",
+    float: "f",
+    str: "s",
+    bytes: "b",
+    bool: "?",
+    type(None): "n",
+    complex: "c",
+}
+_function_tokens = {}
+
+
+def _function_token(func):
+    """Token of a function without closure, remembered per function"""
+    try:
+        return _function_tokens[func]
+    except KeyError:
+        pass
+    if getattr(func, "__closure__", None):
+        # The values closed over may change
+        return None
+    token = tokenize(_normalize_callables(func))
+    if len(_function_tokens) >= 500:
+        _function_tokens.clear()
+    _function_tokens[func] = token
+    return token
+
+
+def _fingerprint(x, parts):
+    """Describe ``x`` as strings appended to ``parts``, if it is simple
+
+    Simple values are numbers, strings, bytes, None, functions without closure
+    and tuples and lists of them, which make up most tasks.  Returns False for
+    anything else.
+    """
+    typ = type(x)
+    code = _simple_types.get(typ)
+    if code is not None:
+        parts.append(code + repr(x))
+    elif typ is tuple or typ is list:
+        parts.append("(" if typ is tuple else "[")
+        for item in x:
+            if not _fingerprint(item, parts):
+                return False
+        parts.append(")")
+    elif typ is types.FunctionType or typ is types.BuiltinFunctionType:
+        token = _function_token(x)
+        if token is None:
+            return False
+        parts.append("F" + token)
+    else:
+        return False
+    return True
+
+
+def _task_token(key, task, dep_tokens):
+    """Token of a task, given the tokens of its sorted dependencies
+
+    Simple tasks are hashed directly, which is much faster than ``tokenize``.
+    """
+    parts = []
+    if _fingerprint(key, parts) and _fingerprint(task, parts):
+        parts.extend(dep_tokens)
+        return _md5("\x00".join(parts).encode()).hexdigest()
+    return tokenize(key, _normalize_callables(task), dep_tokens)
+
+
+def task_tokens(dsk, keys, tokens=None):
+    """Tokens of ``keys`` and of every task they depend on
+
+    The token of a task hashes its key, its definition including the code of
+    the functions it calls, and the tokens of its dependencies.  Tasks that
+    can not be tokenized deterministically, see ``tokenize.ensure-deterministic``,
+    and the tasks that depend on them get a token of None.
+
+    Parameters
+    ----------
+    dsk : dict
+        Materialized task graph
+    keys : iterable
+        Keys to tokenize
+    tokens : dict, optional
+        Tokens computed before, updated in place
+
+    Examples
+    --------
+    >>> from operator import add
+    >>> tokens = task_tokens({'x': 1, 'y': (add, 'x', 10)}, ['y'])
+    >>> sorted(tokens)
+    ['x', 'y']
+    >>> tokens['y'] == task_tokens({'x': 2, 'y': (add, 'x', 10)}, ['y'])['y']
+    False
+    """
+    if tokens is None:
+        tokens = {}
+    stack = [k for k in keys if k not in tokens]
+    with config.set({"tokenize.ensure-deterministic": True}):
+        while stack:
+            key = stack[-1]
+            if key in tokens:
+                stack.pop()
+                continue
+            deps = sorted(get_dependencies(dsk, key), key=str)
+            missing = [d for d in deps if d not in tokens]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            dep_tokens = [tokens[d] for d in deps]
+            if None in dep_tokens:
+                tokens[key] = None
+                continue
+            try:
+                tokens[key] = _task_token(key, dsk[key], dep_tokens)
+            except RuntimeError:
+                tokens[key] = None
+    return tokens
+
+
+write_result = Dispatch("write_result")
+
+
+@write_result.register(object)
+def write_pickle(value, path):
+    with open(path + ".pkl", "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return ".pkl"
+
+
+@write_result.register_lazy("numpy")
+def register_numpy():
+    import numpy as np
+
+    @write_result.register(np.ndarray)
+    def write_numpy(x, path):
+        # Subclasses and object arrays need pickle to round-trip
+        if type(x) is not np.ndarray or x.dtype.hasobject:
+            return write_pickle(x, path)
+        with open(path + ".npy", "wb") as f:
+            np.save(f, x, allow_pickle=False)
+        return ".npy"
+
+
+@write_result.register_lazy("pandas")
+def register_pandas():
+    import pandas as pd
+
+    @write_result.register(pd.DataFrame)
+    def write_pandas(df, path):
+        try:
+            df.to_parquet(path + ".parquet")
+        except Exception:
+            # No parquet engine, or data that parquet can not represent, like
+            # non-string column names or mixed object columns
+            if os.path.exists(path + ".parquet"):
+                os.remove(path + ".parquet")
+            return write_pickle(df, path)
+        return ".parquet"
+
+
+def load_result(path):
+    """Load a result written by ``write_result``"""
+    ext = os.path.splitext(path)[1]
+    if ext == ".npy":
+        import numpy as np
+
+        return np.load(path, allow_pickle=False)
+    if ext == ".parquet":
+        import pandas as pd
+
+        return pd.read_parquet(path)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class ResultStore:
+    """Results of tasks persisted in a directory
+
+    Results are stored per key, under the token of the task that computed
+    them, see ``task_tokens``.  NumPy arrays are written as ``.npy`` files,
+    pandas DataFrames as Parquet when a Parquet engine is installed, and
+    everything else with pickle.
+
+    This is what ``dask.compute(..., cache_dir=...)`` and ``dask.persist``
+    use: ``splice`` replaces the tasks of a graph whose results are stored
+    with tasks that load them, and drops everything upstream of them, and
+    ``save`` stores the results of a computation.
+
+    Parameters
+    ----------
+    directory : str
+        Where to store results.  Created if it does not exist.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> from operator import add
+    >>> store = ResultStore(tempfile.mkdtemp())
+    >>> dsk = {'x': 1, 'y': (add, 'x', 10)}
+    >>> store.splice(dsk, ['y'])
+    {'x': 1, 'y': (<built-in function add>, 'x', 10)}
+    >>> store.save(['y'], [11])
+    >>> store.splice(dsk, ['y'])  # doctest: +ELLIPSIS
+    {'y': (<function load_result at ...>, '...pkl')}
+    """
+
+    def __init__(self, directory):
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.tokens = {}
+        self.graphs = []
+        self._graph = None
+
+    def _listing(self):
+        """Map the name of each stored key to its token and file name"""
+        stored = {}
+        for fn in os.listdir(self.directory):
+            base, ext = os.path.splitext(fn)
+            name, _, token = base.partition("-")
+            if token and ext != ".tmp":
+                stored[name] = (token, fn)
+        return stored
+
+    def _tokens(self, keys):
+        if self._graph is None:
+            graphs = [ensure_dict(g) for g in self.graphs]
+            self._graph = graphs[0] if len(graphs) == 1 else merge(*graphs)
+        return task_tokens(self._graph, keys, self.tokens)
+
+    def splice(self, dsk, keys):
+        """Replace tasks whose results are stored, and cull the graph
+
+        Parameters
+        ----------
+        dsk : Mapping or HighLevelGraph
+        keys : list
+            The output keys, possibly nested
+
+        Returns a graph of the same kind, computing the same keys.  The graph
+        is returned unchanged, and is not materialized, when the directory
+        has no results for any of its keys.
+        """
+        from dask.highlevelgraph import HighLevelGraph
+
+        stored = self._listing()
+        all_keys = (
+            dsk.get_all_external_keys() if isinstance(dsk, HighLevelGraph) else dsk
+        )
+        candidates = [k for k in all_keys if _key_name(k) in stored] if stored else []
+        self.graphs.append(dsk)
+        self._graph = None
+        if not candidates:
+            return dsk
+
+        self._tokens(candidates)
+        hits = {}
+        for key in candidates:
+            token, fn = stored[_key_name(key)]
+            if self.tokens[key] == token:
+                hits[key] = (load_result, os.path.join(self.directory, fn))
+        if not hits:
+            return dsk
+
+        graph = dict(ensure_dict(dsk))
+        graph.update(hits)
+        graph, _ = cull(graph, list(flatten(keys)))
+        if isinstance(dsk, HighLevelGraph):
+            name = "load-stored-" + tokenize(sorted(map(str, hits.values())))
+            return HighLevelGraph.from_collections(name, graph, dependencies=())
+        return graph
+
+    def save(self, keys, results):
+        """Store ``results``, the values of ``keys`` of the spliced graphs
+
+        Both can be nested lists, like the output of ``__dask_keys__``.
+        Results that are already stored, and the results of tasks that do
+        not tokenize deterministically, are skipped.
+        """
+        pairs = dict(_zip_nested(keys, results))
+        stored = self._listing()
+        tokens = self._tokens(list(pairs))
+        for key, value in pairs.items():
+            token = tokens[key]
+            name = _key_name(key)
+            old = stored.get(name)
+            if token is None or (old is not None and old[0] == token):
+                continue
+            tmp = os.path.join(self.directory, uuid.uuid4().hex + ".tmp")
+            ext = write_result(value, tmp)
+            os.replace(tmp + ext, os.path.join(self.directory, f"{name}-{token}{ext}"))
+            if old is not None:
+                try:
+                    os.remove(os.path.join(self.directory, old[1]))
+                except FileNotFoundError:
+                    pass
+
+    def __repr__(self):
+        return f"<ResultStore: {self.directory}>"
+
+
+def _zip_nested(keys, results):
+    if isinstance(keys, list):
+        for k, r in zip(keys, results):
+            yield from _zip_nested(k, r)
+    else:
+        yield keys, results
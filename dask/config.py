@@ -3,6 +3,7 @@ from __future__ import annotations
 import ast
 import base64
 import builtins  # Explicitly use builtins.set as 'set' will be shadowed by a function
+import itertools
 import json
 import os
 import site
@@ -56,6 +57,22 @@ config_lock = threading.Lock()
 defaults: list[Mapping] = []
 
 
+# ``get`` caches lookups in the global config.  Entries are tagged with the
+# generation of the config they were read from, which every function in this
+# module that changes the global config moves on.
+_generations = itertools.count()
+_generation = next(_generations)
+_get_cache: dict[str, tuple[int, Any]] = {}
+_missing = object()
+
+
+def _changed(config: dict) -> None:
+    """Invalidate cached lookups after ``config`` was modified"""
+    global _generation
+    if config is global_config:
+        _generation = next(_generations)
+
+
 def canonical_name(k: str, config: dict) -> str:
     """Return the canonical name for a key.
 
@@ -119,6 +136,7 @@ def update(old: dict, new: Mapping, priority: Literal["old", "new"] = "new") ->
             if priority == "new" or k not in old:
                 old[k] = v
 
+    _changed(old)
     return old
 
 
@@ -362,6 +380,7 @@ class set:
                     key = key.replace("__", ".")
                     key = check_deprecations(key)
                     self._assign(key.split("."), value, config)
+            _changed(config)
 
     def __enter__(self):
         return self.config
@@ -381,6 +400,7 @@ class set:
                         break
                 else:
                     d.pop(path[-1], None)
+        _changed(self.config)
 
     def _assign(
         self,
@@ -482,6 +502,7 @@ def refresh(
     dask.config.update_defaults
     """
     config.clear()
+    _changed(config)
 
     for d in defaults:
         update(config, d, priority="old")
@@ -521,12 +542,26 @@ def get(
     >>> config.get('foo.y', override_with=3)  # doctest: +SKIP
     3
 
+    Lookups in the global config are cached until it is changed with
+    ``set``, ``refresh``, ``update`` or ``update_defaults``.  Modifying
+    ``dask.config.config`` in place by other means is not supported.
+
     See Also
     --------
     dask.config.set
     """
     if override_with is not None:
         return override_with
+    cached = config is global_config
+    if cached:
+        generation = _generation
+        entry = _get_cache.get(key)
+        if entry is not None and entry[0] == generation:
+            result = entry[1]
+            if result is not _missing:
+                return result
+            if default is not no_default:
+                return default
     keys = key.split(".")
     result = config
     for k in keys:
@@ -534,10 +569,14 @@ def get(
         try:
             result = result[k]
         except (TypeError, IndexError, KeyError):
+            if cached:
+                _get_cache[key] = (generation, _missing)
             if default is not no_default:
                 return default
             else:
                 raise
+    if cached:
+        _get_cache[key] = (generation, result)
     return result
 
 
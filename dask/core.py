@@ -351,7 +351,7 @@ def subs(task, key, val):
             arg = subs(arg, key, val)
         elif type_arg is list:
             arg = [subs(x, key, val) for x in arg]
-        else:
+        elif type_arg is not dict:  # dicts are never keys; skip raising below
             try:
                 if arg in hash_key:  # Hash and equality match
                     arg = val
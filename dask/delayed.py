@@ -2,6 +2,7 @@ import operator
 import types
 import uuid
 import warnings
+import weakref
 from collections.abc import Iterator
 from dataclasses import fields, is_dataclass, replace
 
@@ -52,6 +53,31 @@ def finalize(collection):
     return Delayed(name, graph)
 
 
+_opaque_types = weakref.WeakKeyDictionary()
+
+
+def _is_opaque_type(typ):
+    """Whether ``unpack_collections`` returns all instances of ``typ`` as is
+
+    Such instances are neither dask collections nor containers that could
+    hold one, so there is no need to inspect them one by one. Classes with a
+    ``__getattr__`` can grow ``__dask_graph__`` per instance and are excluded.
+    The answer is remembered per type, without keeping the type alive.
+    """
+    try:
+        return _opaque_types[typ]
+    except KeyError:
+        pass
+    opaque = not (
+        issubclass(typ, (Delayed, Iterator, list, tuple, set, dict, slice))
+        or hasattr(typ, "__dask_graph__")
+        or hasattr(typ, "__getattr__")
+        or is_dataclass(typ)
+    )
+    _opaque_types[typ] = opaque
+    return opaque
+
+
 def unpack_collections(expr):
     """Normalize a python object and merge all sub-graphs.
 
@@ -87,6 +113,9 @@ def unpack_collections(expr):
     >>> collections
     (Delayed('a'), Delayed('b'))
     """
+    if _is_opaque_type(type(expr)):
+        return expr, ()
+
     if isinstance(expr, Delayed):
         return expr._key, (expr,)
 
@@ -100,6 +129,9 @@ def unpack_collections(expr):
     typ = type(expr)
 
     if typ in (list, tuple, set):
+        if all(_is_opaque_type(type(e)) for e in expr):
+            args = list(expr)
+            return (args if typ is list else (typ, args)), ()
         args, collections = unzip((unpack_collections(e) for e in expr), 2)
         args = list(args)
         collections = tuple(unique(concat(collections), key=id))
@@ -109,6 +141,11 @@ def unpack_collections(expr):
         return args, collections
 
     if typ is dict:
+        if all(
+            _is_opaque_type(type(k)) and _is_opaque_type(type(v))
+            for k, v in expr.items()
+        ):
+            return (dict, [[k, v] for k, v in expr.items()]), ()
         args, collections = unpack_collections([[k, v] for k, v in expr.items()])
         return (dict, args), collections
 
@@ -676,6 +713,95 @@ def call_function(func, func_token, args, kwargs, pure=None, nout=None):
     return Delayed(name, graph, length=nout)
 
 
+def map_function(func, func_token, iterables, kwargs, pure=None, nout=None):
+    """Call ``func`` lazily on each set of arguments in ``zip(*iterables)``
+
+    All calls go into a single graph layer, which is much cheaper to build
+    than a separate ``HighLevelGraph`` per call.
+    """
+    if "dask_key_name" in kwargs:
+        raise TypeError("dask_key_name is not supported when mapping a function")
+
+    calls = list(zip(*iterables))
+    if not calls:
+        return []
+    name = "{}-{}".format(
+        funcname(func), tokenize(func_token, calls, pure=pure, **kwargs)
+    )
+
+    collections = {}
+    if kwargs:
+        dask_kwargs, kwargs_collections = unpack_collections(kwargs)
+        collections.update((id(c), c) for c in kwargs_collections)
+    layer = {}
+    for i, args in enumerate(calls):
+        args2 = []
+        for arg in args:
+            arg2, arg_collections = unpack_collections(arg)
+            args2.append(arg2)
+            for c in arg_collections:
+                collections[id(c)] = c
+        if kwargs:
+            layer[(name, i)] = (apply, func, args2, dask_kwargs)
+        else:
+            layer[(name, i)] = (func, *args2)
+
+    graph = HighLevelGraph.from_collections(
+        name, layer, dependencies=list(collections.values())
+    )
+    return [Delayed(key, graph, length=nout, layer=name) for key in layer]
+
+
+def map_delayed(func, *iterables, pure=None, nout=None, **kwargs):
+    """Lazily call ``func`` on many sets of arguments
+
+    Like the builtin ``map``, this calls ``func`` once for each element of
+    ``zip(*iterables)``, with the same keyword arguments each time. The
+    results are returned as a list of ``Delayed`` objects that share a single
+    graph layer, which is much faster to build than calling a delayed
+    function in a loop. Also available as ``dask.delayed.map``.
+
+    Parameters
+    ----------
+    func : callable or Delayed
+        The function to call. A function wrapped with ``delayed`` passes on
+        its ``pure`` and ``nout`` settings.
+    *iterables : iterables
+        The positional arguments of each call. Their elements may contain
+        ``Delayed`` objects and other dask collections.
+    pure : bool, optional
+        Whether the calls are pure, see ``delayed``.
+    nout : int, optional
+        The number of outputs of each call, see ``delayed``.
+    **kwargs
+        Keyword arguments passed to every call.
+
+    Examples
+    --------
+    >>> from dask import delayed
+    >>> def add(a, b, c=0):
+    ...     return a + b + c
+    >>> results = delayed.map(add, [1, 2, 3], [10, 20, 30], c=100, pure=True)
+    >>> [r.compute() for r in results]
+    [111, 122, 133]
+    """
+    if isinstance(func, DelayedLeaf):
+        pure = func._pure if pure is None else pure
+        nout = func._nout if nout is None else nout
+        func, func_token = func._obj, func._key
+    elif isinstance(func, Delayed):
+        raise TypeError(
+            "Only functions and functions wrapped with dask.delayed can be mapped, "
+            f"got {func!r}"
+        )
+    else:
+        func_token = func
+    return map_function(func, func_token, iterables, kwargs, pure=pure, nout=nout)
+
+
+delayed.map = map_delayed
+
+
 class DelayedLeaf(Delayed):
     __slots__ = ("_obj", "_pure", "_nout")
 
@@ -94,17 +94,15 @@ def test_no_tasks(capsys):
 
 
 def test_with_cache(capsys):
-    cachey = pytest.importorskip("cachey")
     from dask.cache import Cache
 
-    c = cachey.Cache(10000)
-    cc = Cache(c)
+    cc = Cache(10000)
 
     with cc:
         with ProgressBar():
             assert get_threaded({"x": (mul, 1, 2)}, "x") == 2
     check_bar_completed(capsys)
-    assert c.data["x"] == 2
+    assert 2 in cc.cache.tiers[0].data.values()
 
     with cc:
         with ProgressBar():
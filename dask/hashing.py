@@ -1,8 +1,24 @@
+"""
+Fast, non-cryptographic hashing of buffers
+
+``hash_buffer`` hashes a single bytes-like object with the fastest available
+hash function.  ``new_hasher`` returns a streaming hasher, into which many
+buffers can be fed with ``update`` before taking a ``digest``, like the objects
+of ``hashlib``.
+"""
 import binascii
 import hashlib
+from functools import partial
+
+from dask import config
 
 hashers = []  # In decreasing performance order
 
+# Streaming hashers by name, in decreasing performance order.  These are
+# functions returning objects with ``update``, ``digest`` and ``hexdigest``
+# methods, like ``hashlib.sha1``.
+streaming_hashers = {}
+
 
 # Timings on a largish array:
 # - CityHash is 2x faster than MurmurHash
@@ -42,6 +58,7 @@ else:
         return xxhash.xxh64(buf).digest()
 
     hashers.append(_hash_xxhash)
+    streaming_hashers["xxhash"] = getattr(xxhash, "xxh3_128", xxhash.xxh64)
 
 try:
     import mmh3  # `python -m pip install mmh3`
@@ -72,8 +89,20 @@ def hash_buffer(buf, hasher=None):
     """
     Hash a bytes-like (buffer-compatible) object.  This function returns
     a good quality hash but is not cryptographically secure.  The fastest
-    available algorithm is selected.  A fixed-length bytes object is returned.
+    available algorithm is selected, unless ``hasher`` or the
+    ``tokenize.hasher`` configuration value names one of the
+    ``streaming_hashers``.  A fixed-length bytes object is returned.
     """
+    if hasher is None:
+        factory = _configured_factory()
+    elif isinstance(hasher, str):
+        factory = _streaming_factory(hasher)
+    else:
+        factory = None
+    if factory is not None:
+        h = factory()
+        h.update(buf)
+        return h.digest()
     if hasher is not None:
         try:
             return hasher(buf)
@@ -96,3 +125,69 @@ def hash_buffer_hex(buf, hasher=None):
     h = hash_buffer(buf, hasher)
     s = binascii.b2a_hex(h)
     return s.decode()
+
+
+try:
+    import blake3  # `python -m pip install blake3`
+except ImportError:
+    pass
+else:
+    streaming_hashers["blake3"] = blake3.blake3
+
+# SHA1 is usually accelerated in hardware, making it faster than BLAKE2
+streaming_hashers["sha1"] = hashlib.sha1
+streaming_hashers["blake2b"] = partial(hashlib.blake2b, digest_size=16)
+
+
+def new_hasher(name=None):
+    """A new streaming hasher
+
+    Feed buffers with ``update`` and get the hash of all of them with
+    ``digest`` or ``hexdigest``.
+
+    Parameters
+    ----------
+    name : str, optional
+        One of ``streaming_hashers``, like ``"xxhash"``, ``"blake3"``,
+        ``"blake2b"`` or ``"sha1"``.  Defaults to the ``tokenize.hasher``
+        configuration value, or else the fastest one available.
+
+    Examples
+    --------
+    >>> h = new_hasher("sha1")
+    >>> h.update(b"Hello, ")
+    >>> h.update(b"world")
+    >>> h.hexdigest()
+    'e02aa1b106d5c7c6a98def2b13005d5b84fd8dc8'
+    """
+    factory = _configured_factory() if name is None else _streaming_factory(name)
+    if factory is None:
+        return next(iter(streaming_hashers.values()))()
+    return factory()
+
+
+def _streaming_factory(name):
+    try:
+        return streaming_hashers[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown hasher {name!r}, expected one of {list(streaming_hashers)}"
+        ) from None
+
+
+# The streaming hasher named by ``tokenize.hasher``, with the generation of the
+# config it was looked up in.  ``hash_buffer`` runs for every small buffer that
+# is tokenized, so it doesn't look up the config each time.
+_configured = (None, None)
+
+
+def _configured_factory():
+    """Streaming hasher of ``tokenize.hasher``, or None if not set"""
+    global _configured
+    generation, factory = _configured
+    if generation != config._generation:
+        generation = config._generation
+        name = config.get("tokenize.hasher", None)
+        factory = None if name is None else _streaming_factory(name)
+        _configured = (generation, factory)
+    return factory
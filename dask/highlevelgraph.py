@@ -11,7 +11,14 @@ import tlz as toolz
 from dask import config
 from dask.base import clone_key, flatten, is_dask_collection
 from dask.core import keys_in_tasks, reverse_dict
-from dask.utils import ensure_dict, ensure_set, import_required, key_split, stringify
+from dask.utils import (
+    _gc_paused,
+    ensure_dict,
+    ensure_set,
+    import_required,
+    key_split,
+    stringify,
+)
 from dask.widgets import get_template
 
 
@@ -810,7 +817,9 @@ class HighLevelGraph(Mapping):
         missing_keys = all_keys - self.key_dependencies.keys()
         if missing_keys:
             for layer in self.layers.values():
-                for k in missing_keys & layer.keys():
+                # Note: use .intersection rather than & to iterate over the
+                # layer once rather than testing membership key by key
+                for k in missing_keys.intersection(layer):
                     self.key_dependencies[k] = layer.get_dependencies(k, all_keys)
         return self.key_dependencies
 
@@ -935,36 +944,35 @@ class HighLevelGraph(Mapping):
 
         keys_set = set(flatten(keys))
 
-        all_ext_keys = self.get_all_external_keys()
-        ret_layers: dict = {}
-        ret_key_deps: dict = {}
-        for layer_name in reversed(self._toposort_layers()):
-            layer = self.layers[layer_name]
-            # Let's cull the layer to produce its part of `keys`.
-            # Note: use .intersection rather than & because the RHS is
-            # a collections.abc.Set rather than a real set, and using &
-            # would take time proportional to the size of the LHS, which
-            # if there is no culling can be much bigger than the RHS.
-            output_keys = keys_set.intersection(layer.get_output_keys())
-            if output_keys:
-                culled_layer, culled_deps = layer.cull(output_keys, all_ext_keys)
-                # Update `keys` with all layer's external key dependencies, which
-                # are all the layer's dependencies (`culled_deps`) excluding
-                # the layer's output keys.
-                external_deps = set()
-                for d in culled_deps.values():
-                    external_deps |= d
-                external_deps -= culled_layer.get_output_keys()
-                keys_set |= external_deps
-
-                # Save the culled layer and its key dependencies
-                ret_layers[layer_name] = culled_layer
-                if isinstance(layer, Blockwise) or (
-                    layer.is_materialized() and (len(layer) == len(culled_deps))
-                ):
-                    # Don't use culled_deps to update ret_key_deps
-                    # unless they are "direct" key dependencies
-                    ret_key_deps.update(culled_deps)
+        with _gc_paused():
+            all_ext_keys = self.get_all_external_keys()
+            ret_layers: dict = {}
+            ret_key_deps: dict = {}
+            for layer_name in reversed(self._toposort_layers()):
+                layer = self.layers[layer_name]
+                # Let's cull the layer to produce its part of `keys`.
+                # Note: use .intersection rather than & because the RHS is
+                # a collections.abc.Set rather than a real set, and using &
+                # would take time proportional to the size of the LHS, which
+                # if there is no culling can be much bigger than the RHS.
+                output_keys = keys_set.intersection(layer.get_output_keys())
+                if output_keys:
+                    culled_layer, culled_deps = layer.cull(output_keys, all_ext_keys)
+                    # Update `keys` with all layer's external key dependencies, which
+                    # are all the layer's dependencies (`culled_deps`) excluding
+                    # the layer's output keys.
+                    external_deps = set().union(*culled_deps.values())
+                    external_deps -= culled_layer.get_output_keys()
+                    keys_set |= external_deps
+
+                    # Save the culled layer and its key dependencies
+                    ret_layers[layer_name] = culled_layer
+                    if isinstance(layer, Blockwise) or (
+                        layer.is_materialized() and (len(layer) == len(culled_deps))
+                    ):
+                        # Don't use culled_deps to update ret_key_deps
+                        # unless they are "direct" key dependencies
+                        ret_key_deps.update(culled_deps)
 
         # Converting dict_keys to a real set lets Python optimise the set
         # intersection to iterate over the smaller of the two sets.
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import bisect
 import functools
 import math
 import operator
@@ -13,7 +14,7 @@ from tlz.curried import map
 
 from dask.base import tokenize
 from dask.blockwise import Blockwise, BlockwiseDep, BlockwiseDepDict, blockwise_token
-from dask.core import flatten, keys_in_tasks
+from dask.core import flatten, keys_in_tasks, literal
 from dask.highlevelgraph import Layer
 from dask.utils import (
     apply,
@@ -103,6 +104,13 @@ class ArraySliceDep(ArrayBlockwiseDep):
         return tuple(slice(*s, None) for s in loc)
 
 
+class ArrayOffsetDep(ArraySliceDep):
+    """Produce the offset of a chunk into the full-sized array given a chunk index"""
+
+    def __getitem__(self, idx: tuple):
+        return tuple(start[i] for i, start in zip(idx, self.starts))
+
+
 class ArrayOverlapLayer(Layer):
     """Simple HighLevelGraph array overlap layer.
 
@@ -116,6 +124,9 @@ class ArrayOverlapLayer(Layer):
     axes: Mapping
         Axes dictionary indicating overlap in each dimension,
         e.g. ``{'0': 1, '1': 1}``
+    output_blocks: set, optional
+        Block indices of the output blocks to produce. All blocks are
+        produced by default; culling sets this.
     """
 
     def __init__(
@@ -125,6 +136,7 @@ class ArrayOverlapLayer(Layer):
         chunks,
         numblocks,
         token,
+        output_blocks=None,
     ):
         super().__init__()
         self.name = name
@@ -132,6 +144,7 @@ class ArrayOverlapLayer(Layer):
         self.chunks = chunks
         self.numblocks = numblocks
         self.token = token
+        self.output_blocks = output_blocks
         self._cached_keys = None
 
     def __repr__(self):
@@ -154,13 +167,111 @@ class ArrayOverlapLayer(Layer):
         return iter(self._dict)
 
     def __len__(self):
-        return len(self._dict)
+        if self.output_blocks is not None:
+            return len(self._dict)
+        # Every block gets an overlap task, and every block also gets a
+        # getitem task for its own interior and for each of the edges it
+        # shares with its neighbors along the overlapping axes
+        nslices = 1
+        for i, n in enumerate(self.numblocks):
+            nslices *= 3 * n - 2 if self._expands(i) else n
+        return nslices + math.prod(self.numblocks)
 
     def is_materialized(self):
         return hasattr(self, "_cached_dict")
 
+    @property
+    def _overlap_name(self):
+        return "overlap-" + self.token
+
+    @property
+    def _getitem_name(self):
+        return "getitem-" + self.token
+
+    def _expands(self, axis):
+        # Mirrors the test in `_expand_keys_around_center`
+        return any((self.axes.get(axis, 0),))
+
+    def _blocks(self):
+        if self.output_blocks is not None:
+            return self.output_blocks
+        return product(*map(range, self.numblocks))
+
     def get_output_keys(self):
-        return self.keys()  # FIXME! this implementation materializes the graph
+        if hasattr(self, "_cached_output_keys"):
+            return self._cached_output_keys
+        name = self._overlap_name
+        self._cached_output_keys = {(name, *b) for b in self._blocks()}
+        return self._cached_output_keys
+
+    def _keys_to_blocks(self, keys):
+        """Simple utility to convert keys to block indices."""
+        name = self._overlap_name
+        blocks = set()
+        for key in keys:
+            if type(key) is tuple and key and key[0] == name:
+                blocks.add(key[1:])
+        return blocks
+
+    def _interior_keys(self, block):
+        """Keys of the getitem tasks that the overlap of ``block`` needs"""
+        return flatten(
+            _expand_keys_around_center(
+                (None,) + block,
+                dims=self.numblocks,
+                name=self._getitem_name,
+                axes=self.axes,
+            )
+        )
+
+    def _cull_dependencies(self, keys, output_blocks=None):
+        """Determine the necessary dependencies to produce `keys`.
+
+        Each output block depends on its own input block and on the
+        input blocks adjacent to it along the overlapping axes. This
+        method does not require graph materialization.
+        """
+        deps = {}
+        output_blocks = output_blocks or self._keys_to_blocks(keys)
+        for block in output_blocks:
+            deps[(self._overlap_name,) + block] = {
+                (self.name,) + tuple(int(round(i)) for i in k[1:])
+                for k in self._interior_keys(block)
+            }
+        return deps
+
+    def _cull(self, output_blocks):
+        return ArrayOverlapLayer(
+            self.name,
+            self.axes,
+            self.chunks,
+            self.numblocks,
+            self.token,
+            output_blocks=output_blocks,
+        )
+
+    def cull(self, keys, all_keys):
+        """Cull an ArrayOverlapLayer HighLevelGraph layer.
+
+        The underlying graph will only include the necessary tasks to
+        produce the blocks included in `output_blocks`, so culling only
+        requires us to set this parameter.
+        """
+        output_blocks = self._keys_to_blocks(keys)
+        culled_deps = self._cull_dependencies(keys, output_blocks=output_blocks)
+        if len(output_blocks) != len(self.get_output_keys()):
+            return self._cull(output_blocks), culled_deps
+        else:
+            return self, culled_deps
+
+    def get_dependencies(self, key, all_hlg_keys):
+        """Get dependencies of `key` without materializing the layer"""
+        if type(key) is tuple and key:
+            if key[0] == self._overlap_name:
+                return set(self._interior_keys(key[1:]))
+            if key[0] == self._getitem_name:
+                return {(self.name,) + tuple(int(round(i)) for i in key[1:])}
+        return super().get_dependencies(key, all_hlg_keys)
 
     def _dask_keys(self):
         if self._cached_keys is not None:
@@ -186,10 +297,13 @@ class ArrayOverlapLayer(Layer):
         axes = self.axes
         chunks = self.chunks
         name = self.name
-        dask_keys = self._dask_keys()
+        if self.output_blocks is None:
+            dask_keys = self._dask_keys()
+        else:
+            dask_keys = [(name,) + block for block in self.output_blocks]
 
-        getitem_name = "getitem-" + self.token
-        overlap_name = "overlap-" + self.token
+        getitem_name = self._getitem_name
+        overlap_name = self._overlap_name
 
         if deserializing:
             # Use CallableLazyImport objects to avoid importing dataframe
@@ -337,6 +451,350 @@ def fractional_slice(task, axes):
         return (operator.getitem, rounded, index)
 
 
+class RechunkLayer(Layer):
+    """HighLevelGraph layer for rechunking an array
+
+    The intersection of the old and new chunks is only stored per
+    dimension, as lists of ``(old block index, slice)`` pieces for every
+    new chunk along that dimension.  The tasks producing a new block are
+    built from the cartesian product of its pieces when the layer is
+    materialized, so creating, measuring and culling a rechunk never
+    enumerates all of the intersections between old and new blocks.
+
+    Parameters
+    ----------
+    name : str
+        Name of the rechunked output array.
+    input_name : str
+        Name of the array being rechunked.
+    old_chunks : tuple of tuples
+        Chunks of the array being rechunked.
+    new_chunks : tuple of tuples
+        Chunks of the output array.
+    token : str
+        Token used to name the intermediate tasks.
+    method : {"tasks", "disk"}
+        With ``"tasks"`` every new block concatenates slices of the old
+        blocks it overlaps.  With ``"disk"`` every old block writes its
+        pieces to a temporary on-disk store and, after a barrier, every new
+        block reads its pieces back, like the disk-based shuffles of
+        dask.bag and dask.dataframe.  This keeps the number of tasks linear
+        in the number of blocks and only holds one block per task in
+        memory, which suits all-to-all rechunks.
+    output_blocks : set, optional
+        Block indices of the output blocks to produce. All blocks are
+        produced by default; culling sets this.
+    """
+
+    def __init__(
+        self,
+        name,
+        input_name,
+        old_chunks,
+        new_chunks,
+        token,
+        method="tasks",
+        output_blocks=None,
+    ):
+        from dask.array.rechunk import _old_to_new
+
+        super().__init__()
+        self.name = name
+        self.input_name = input_name
+        self.old_chunks = old_chunks
+        self.new_chunks = new_chunks
+        self.token = token
+        self.method = method
+        self.output_blocks = output_blocks
+        self.split_name = "rechunk-split-" + token
+        self.stage_name = "rechunk-stage-" + token
+        self.barrier_name = "rechunk-barrier-" + token
+        self.partd_name = "rechunk-partd-" + token
+
+        self.pieces = _old_to_new(old_chunks, new_chunks)
+        self.npieces = [tuple(map(len, pieces)) for pieces in self.pieces]
+        self.cumpieces = [cached_cumsum(n, initial_zero=True) for n in self.npieces]
+        # Number of pieces in all of the blocks along the later dimensions
+        totals = [c[-1] for c in self.cumpieces]
+        self._after = [math.prod(totals[d + 1 :]) for d in range(len(totals))]
+
+    def __repr__(self):
+        return f"RechunkLayer<name='{self.name}', method='{self.method}'>"
+
+    @property
+    def _dict(self):
+        """Materialize full dict representation"""
+        if hasattr(self, "_cached_dict"):
+            return self._cached_dict
+        else:
+            dsk = self._construct_graph()
+            self._cached_dict = dsk
+        return self._cached_dict
+
+    def __getitem__(self, key):
+        return self._dict[key]
+
+    def __iter__(self):
+        return iter(self._dict)
+
+    def __len__(self):
+        if self.output_blocks is not None or self.is_materialized():
+            return len(self._dict)
+        nblocks = math.prod(map(len, self.new_chunks))
+        if self.method == "disk":
+            return nblocks + len(self._stage_keys()) + 2
+        # One task per piece, except for the pieces that are whole old blocks
+        nwhole = 1
+        for chunks, pieces in zip(self.old_chunks, self.pieces):
+            nwhole *= sum(
+                self._is_whole(chunks, i, slc) for p in pieces for i, slc in p
+            )
+        return nblocks + math.prod(c[-1] for c in self.cumpieces) - nwhole
+
+    def is_materialized(self):
+        return hasattr(self, "_cached_dict")
+
+    @staticmethod
+    def _is_whole(chunks, i, slc):
+        return slc.start == 0 and slc.stop == chunks[i]
+
+    def _blocks(self):
+        if self.output_blocks is not None:
+            return self.output_blocks
+        return product(*(range(len(c)) for c in self.new_chunks))
+
+    def get_output_keys(self):
+        if hasattr(self, "_cached_output_keys"):
+            return self._cached_output_keys
+        name = self.name
+        self._cached_output_keys = {(name, *b) for b in self._blocks()}
+        return self._cached_output_keys
+
+    def _keys_to_blocks(self, keys):
+        """Simple utility to convert keys to block indices."""
+        name = self.name
+        blocks = set()
+        for key in keys:
+            if type(key) is tuple and key and key[0] == name:
+                blocks.add(key[1:])
+        return blocks
+
+    def _offset(self, block):
+        """Number of pieces in all of the blocks before ``block``
+
+        Pieces are numbered consecutively over the output blocks in C
+        order, which names the split tasks without enumerating them.
+        """
+        offset = 0
+        before = 1
+        for d, i in enumerate(block):
+            offset += self.cumpieces[d][i] * before * self._after[d]
+            before *= self.npieces[d][i]
+        return offset
+
+    def _split_piece(self, n):
+        """Output block and piece of the ``n``-th split task"""
+        block = []
+        before = 1
+        for d, after in enumerate(self._after):
+            i = bisect.bisect_right(self.cumpieces[d], n // (before * after)) - 1
+            n -= self.cumpieces[d][i] * before * after
+            before *= self.npieces[d][i]
+            block.append(i)
+        pieces = [self.pieces[d][i] for d, i in enumerate(block)]
+        shape = [len(p) for p in pieces]
+        piece = []
+        for p, m in zip(reversed(pieces), reversed(shape)):
+            n, j = divmod(n, m)
+            piece.append(p[j])
+        return tuple(block), tuple(reversed(piece))
+
+    def _block_pieces(self, block):
+        """Pieces of the old blocks making up ``block``, in C order"""
+        return product(*(self.pieces[d][i] for d, i in enumerate(block)))
+
+    def _input_blocks(self, block):
+        return product(
+            *({i for i, _ in self.pieces[d][j]} for d, j in enumerate(block))
+        )
+
+    def _cull_dependencies(self, keys, output_blocks=None):
+        """Determine the necessary dependencies to produce `keys`.
+
+        Each output block depends on the input blocks it overlaps, which
+        are found per dimension without materializing the layer.
+        """
+        output_blocks = output_blocks or self._keys_to_blocks(keys)
+        return {
+            (self.name,)
+            + block: {(self.input_name,) + index for index in self._input_blocks(block)}
+            for block in output_blocks
+        }
+
+    def _cull(self, output_blocks):
+        return RechunkLayer(
+            self.name,
+            self.input_name,
+            self.old_chunks,
+            self.new_chunks,
+            self.token,
+            method=self.method,
+            output_blocks=output_blocks,
+        )
+
+    def cull(self, keys, all_keys):
+        """Cull a RechunkLayer HighLevelGraph layer.
+
+        The underlying graph will only include the necessary tasks to
+        produce the blocks included in `output_blocks`, so culling only
+        requires us to set this parameter.
+        """
+        output_blocks = self._keys_to_blocks(keys)
+        culled_deps = self._cull_dependencies(keys, output_blocks=output_blocks)
+        if len(output_blocks) != len(self.get_output_keys()):
+            return self._cull(output_blocks), culled_deps
+        else:
+            return self, culled_deps
+
+    def _stage_keys(self):
+        if self.output_blocks is None:
+            # Old blocks that no piece comes from, such as some empty
+            # blocks, are culled from the input
+            blocks = product(
+                *(sorted({i for p in pieces for i, _ in p}) for pieces in self.pieces)
+            )
+        else:
+            blocks = set()
+            for block in self.output_blocks:
+                blocks.update(self._input_blocks(block))
+        return [(self.stage_name,) + block for block in blocks]
+
+    def get_dependencies(self, key, all_hlg_keys):
+        """Get dependencies of `key` without materializing the layer"""
+        if type(key) is tuple and key:
+            if key[0] == self.name and self.method == "disk":
+                return {(self.partd_name,), self.barrier_name}
+            if key[0] == self.name:
+                offset = self._offset(key[1:])
+                deps = set()
+                for n, piece in enumerate(self._block_pieces(key[1:])):
+                    index = tuple(i for i, _ in piece)
+                    if all(
+                        self._is_whole(c, i, slc)
+                        for c, (i, slc) in zip(self.old_chunks, piece)
+                    ):
+                        deps.add((self.input_name,) + index)
+                    else:
+                        deps.add((self.split_name, offset + n))
+                return deps
+            if key[0] == self.split_name:
+                _, piece = self._split_piece(key[1])
+                return {(self.input_name,) + tuple(i for i, _ in piece)}
+            if key[0] == self.stage_name:
+                return {(self.input_name,) + key[1:], (self.partd_name,)}
+            if key[0] == self.partd_name:
+                return set()
+        if key == self.barrier_name:
+            return set(self._stage_keys())
+        return super().get_dependencies(key, all_hlg_keys)
+
+    def _construct_graph(self):
+        if self.method == "disk":
+            return self._construct_disk_graph()
+
+        from dask.array.chunk import getitem
+        from dask.array.core import concatenate3
+
+        name, input_name, split_name = self.name, self.input_name, self.split_name
+        old_chunks = self.old_chunks
+        dsk = {}
+        for block in self._blocks():
+            offset = self._offset(block)
+            shape = [self.npieces[d][i] for d, i in enumerate(block)]
+            refs = []
+            for n, piece in enumerate(self._block_pieces(block)):
+                index, slices = zip(*piece)
+                ref = (input_name,) + index
+                if all(
+                    self._is_whole(c, i, slc)
+                    for c, i, slc in zip(old_chunks, index, slices)
+                ):
+                    refs.append(ref)
+                else:
+                    split_key = (split_name, offset + n)
+                    dsk[split_key] = (getitem, ref, slices)
+                    refs.append(split_key)
+
+            # New block is formed by concatenation of sliced old blocks
+            if len(refs) == 1:
+                dsk[(name,) + block] = refs[0]
+            else:
+                dsk[(name,) + block] = (concatenate3, reshapelist(shape, refs))
+        return dsk
+
+    def _construct_disk_graph(self):
+        import partd
+
+        from dask import config
+        from dask.array.rechunk import barrier, collect_pieces, stage_pieces
+
+        p = (self.partd_name,)
+        dirname = config.get("temporary_directory", None)
+        if dirname:
+            dsk = {p: (partd.Pickle, (apply, partd.File, (), {"dir": dirname}))}
+        else:
+            dsk = {p: (partd.Pickle, (partd.File,))}
+
+        # The pieces every old chunk along each dimension contributes to
+        # new chunks, as (new chunk, position, number of pieces, slice).
+        # Stage tasks share this as a literal, so that graph traversals
+        # don't walk the pieces of every old block.
+        intersections = [[[] for _ in chunks] for chunks in self.old_chunks]
+        for d, pieces in enumerate(self.pieces):
+            for j, p_j in enumerate(pieces):
+                for position, (i, slc) in enumerate(p_j):
+                    intersections[d][i].append((j, position, len(p_j), slc))
+        intersections = (literal(intersections),)
+
+        # Write the pieces of every old block to disk
+        stage_keys = self._stage_keys()
+        for key in stage_keys:
+            dsk[key] = (
+                stage_pieces,
+                (self.input_name,) + key[1:],
+                key[1:],
+                intersections,
+                p,
+            )
+
+        # Barrier
+        dsk[self.barrier_name] = (barrier, stage_keys)
+
+        # Collect pieces into new blocks
+        for block in self._blocks():
+            shape = [self.npieces[d][i] for d, i in enumerate(block)]
+            dsk[(self.name,) + block] = (
+                collect_pieces,
+                p,
+                block,
+                shape,
+                self.barrier_name,
+            )
+        return dsk
+
+    def __reduce__(self):
+        attrs = [
+            "name",
+            "input_name",
+            "old_chunks",
+            "new_chunks",
+            "token",
+            "method",
+            "output_blocks",
+        ]
+        return (RechunkLayer, tuple(getattr(self, attr) for attr in attrs))
+
+
 #
 ##
 ###  DataFrame Layers & Utilities
@@ -509,6 +967,19 @@ class SimpleShuffleLayer(Layer):
         else:
             return self, culled_deps
 
+    def get_dependencies(self, key, all_hlg_keys):
+        """Get dependencies of `key` without materializing the layer"""
+        if type(key) is tuple:
+            if key[0] == self.name:
+                return {
+                    (self.split_name, key[1], i) for i in range(self.npartitions_input)
+                }
+            if key[0] == self.split_name:
+                return {("group-" + self.name, key[2])}
+            if key[0] == "group-" + self.name:
+                return {(self.name_input, key[1])}
+        return super().get_dependencies(key, all_hlg_keys)
+
     def __reduce__(self):
         attrs = [
             "name",
@@ -761,6 +1232,33 @@ class ShuffleLayer(SimpleShuffleLayer):
             parts_out=parts_out,
         )
 
+    def get_dependencies(self, key, all_hlg_keys):
+        """Get dependencies of `key` without materializing the layer"""
+        if type(key) is tuple:
+            if key[0] == self.name:
+                out = self.inputs[key[1]]
+                return {
+                    (self.split_name, out[self.stage], insert(out, self.stage, i))
+                    for i in range(self.nsplits)
+                }
+            if key[0] == self.split_name:
+                return {("group-" + self.name, key[2])}
+            if key[0] == "group-" + self.name:
+                if len(key) > 2:
+                    # Empty input partition, see ``_construct_graph``
+                    return set()
+                try:
+                    inp_part_map = self._inp_part_map
+                except AttributeError:
+                    inp_part_map = self._inp_part_map = {
+                        inp: i for i, inp in enumerate(self.inputs)
+                    }
+                part = inp_part_map[key[1]]
+                if self.stage == 0 and part >= self.npartitions_input:
+                    return {key + ("empty",)}
+                return {(self.name_input, part)}
+        return super().get_dependencies(key, all_hlg_keys)
+
     def _construct_graph(self, deserializing=False):
         """Construct graph for a "rearrange-by-column" stage."""
 
@@ -1049,6 +1547,20 @@ class BroadcastJoinLayer(Layer):
         else:
             return self, culled_deps
 
+    def get_dependencies(self, key, all_hlg_keys):
+        """Get dependencies of `key` without materializing the layer"""
+        if type(key) is tuple:
+            bcast_name, bcast_size, other_name = self._broadcast_plan[:3]
+            if key[0] == self.name:
+                return {("inter-" + self.name, key[1], j) for j in range(bcast_size)}
+            if key[0] == "inter-" + self.name:
+                if self.how != "inner":
+                    return {("split-" + self.name, key[1]), (bcast_name, key[2])}
+                return {(other_name, key[1]), (bcast_name, key[2])}
+            if key[0] == "split-" + self.name:
+                return {(other_name, key[1])}
+        return super().get_dependencies(key, all_hlg_keys)
+
     def _construct_graph(self, deserializing=False):
         """Construct graph for a broadcast join operation."""
 
@@ -1501,18 +2013,46 @@ class DataFrameTreeReduction(Layer):
 
     def cull(self, keys, all_keys):
         """Cull a DataFrameTreeReduction HighLevelGraph layer"""
-        deps = {
-            (self.name, 0): {
-                (self.name_input, i) for i in range(self.npartitions_input)
-            }
-        }
         output_partitions = self._keys_to_output_partitions(keys)
+        inputs = {(self.name_input, i) for i in range(self.npartitions_input)}
+        deps = {(self.name, s): inputs for s in output_partitions}
         if output_partitions != set(self.output_partitions):
             culled_layer = self._cull(output_partitions)
             return culled_layer, deps
         else:
             return self, deps
 
+    def _tree_inputs(self, group, depth, split):
+        """Keys of the inputs to reduction node ``group`` at level ``depth``"""
+        if self.height < 2:
+            # Single-partition case
+            return {self._make_key(self._name_input_use, 0, split=split)}
+        lstart = self.split_every * group
+        lstop = min(lstart + self.split_every, self.widths[depth - 1])
+        if depth == 1:
+            name, level = self._name_input_use, ()
+        else:
+            name, level = self.tree_node_name, (depth - 1,)
+        return {
+            self._make_key(name, p, *level, split=split) for p in range(lstart, lstop)
+        }
+
+    @property
+    def _name_input_use(self):
+        return self.name_input + "-split" if self.split_out else self.name_input
+
+    def get_dependencies(self, key, all_hlg_keys):
+        """Get dependencies of `key` without materializing the layer"""
+        if type(key) is tuple:
+            if key[0] == self.name and len(key) == 2:
+                return self._tree_inputs(0, self.height - 1, key[1])
+            if key[0] == self.tree_node_name:
+                split = key[3] if self.split_out else 0
+                return self._tree_inputs(key[1], key[2], split)
+            if self.split_out and key[0] == self._name_input_use:
+                return {(self.name_input, key[1])}
+        return super().get_dependencies(key, all_hlg_keys)
+
     def __dask_distributed_pack__(self, *args, **kwargs):
         from distributed.protocol.serialize import to_serialize
 
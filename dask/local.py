@@ -58,6 +58,20 @@ Changing state
     Real-time equivalent of dependents
 
 
+Compact state
+-------------
+
+Dictionaries of Python sets cost a great deal of memory and construction time
+for graphs with millions of tasks.  Setting the configuration value
+``local-scheduler.compact-state`` to ``True`` makes the local schedulers use a
+``CompactState`` instead.  It interns every key to an integer id, stores
+dependencies and dependents as CSR-style NumPy arrays and tracks progress
+with integer reference counts.  It presents the same keys as the dictionary
+above, so callbacks continue to work, but ``dependencies``, ``dependents``,
+``waiting``, ``waiting_data``, ``finished`` and ``released`` are read-only
+views that are computed on access.
+
+
 Examples
 --------
 
@@ -109,15 +123,24 @@ See the function ``inline_functions`` for more information.
 from __future__ import annotations
 
 import os
+import sys
+import threading
+from collections import deque
 from collections.abc import Hashable, Mapping, Sequence
+from collections.abc import Set as AbstractSet
 from concurrent.futures import Executor, Future
 from functools import partial
 from queue import Empty, Queue
+from timeit import default_timer
 
 from dask import config
 from dask.callbacks import local_callbacks, unpack_callbacks
 from dask.core import _execute_task, flatten, get_dependencies, has_tasks, reverse_dict
-from dask.order import order
+from dask.optimization import cull
+from dask.order import _order_csr, order
+from dask.sizeof import sizeof
+from dask.spill import SpillCache
+from dask.utils import format_bytes, format_time, parse_bytes
 
 if os.name == "nt":
     # Python 3 windows Queue.get doesn't handle interrupts properly. To
@@ -200,6 +223,372 @@ def start_state_from_dask(dsk, cache=None, sortkey=None):
     return state
 
 
+class CompactState(Mapping):
+    """Scheduler state backed by integer ids and NumPy arrays
+
+    A drop-in replacement for the dictionary returned by
+    ``start_state_from_dask``.  Keys are interned to integer ids, adjacency
+    is stored in CSR form (``dep_ptr``/``dep_idx`` for dependencies and
+    ``dpt_ptr``/``dpt_idx`` for dependents) and the ``waiting`` and
+    ``waiting_data`` sets are replaced by integer reference counts.
+
+    Examples
+    --------
+    >>> inc = lambda x: x + 1
+    >>> add = lambda x, y: x + y
+    >>> dsk = {'x': 1, 'y': 2, 'z': (inc, 'x'), 'w': (add, 'z', 'y')}
+    >>> state = CompactState.from_dask(dsk)  # doctest: +SKIP
+    >>> state['ready']  # doctest: +SKIP
+    ['z']
+    >>> dict(state['waiting'])  # doctest: +SKIP
+    {'w': {'z'}}
+
+    See Also
+    --------
+    start_state_from_dask
+    """
+
+    # Status codes
+    WAITING, READY, RUNNING, FINISHED, DATA = range(5)
+
+    def __init__(self, keys, ids, ntasks, dep_ptr, dep_idx, cache, data_ids):
+        import numpy as np
+
+        self.keys = keys
+        self.ids = ids
+        self.ntasks = ntasks
+        self.dep_ptr = dep_ptr
+        self.dep_idx = dep_idx
+        self.cache = cache
+
+        n = len(keys)
+        # Reverse the adjacency with a stable sort of the edge targets
+        owner = np.repeat(np.arange(n, dtype=dep_idx.dtype), np.diff(dep_ptr))
+        self.dpt_idx = owner[np.argsort(dep_idx, kind="stable")]
+        self.dpt_ptr = np.zeros(n + 1, dtype=dep_ptr.dtype)
+        np.cumsum(np.bincount(dep_idx, minlength=n), out=self.dpt_ptr[1:])
+
+        # ``done`` marks keys whose data is (or was) available
+        self.done = np.zeros(n, dtype=bool)
+        self.done[[ids[k] for k in cache]] = True
+        self.status = np.full(n, self.WAITING, dtype=np.int8)
+        self.status[data_ids] = self.DATA
+        self.status[ntasks:] = self.DATA
+        self.released = np.zeros(n, dtype=bool)
+
+        missing = ~self.done[dep_idx]
+        self.nwaiting = np.bincount(owner[missing], minlength=n).astype(np.int32)
+        self.nwaiting_data = np.diff(self.dpt_ptr).astype(np.int32)
+
+        ready = np.flatnonzero((self.nwaiting == 0) & (self.status == self.WAITING))
+        self.status[ready] = self.READY
+        self.nwaiting_total = ntasks - len(data_ids) - len(ready)
+        self.nfinished = 0
+        self.nreleased = 0
+        self.priority = None
+
+        self.ready = [keys[i] for i in ready.tolist()]
+        self.running = set()
+        self._fields = {
+            "dependencies": _AdjacencyView(self, dependents=False),
+            "dependents": _AdjacencyView(self, dependents=True),
+            "waiting": _WaitingView(self, data=False),
+            "waiting_data": _WaitingView(self, data=True),
+            "cache": cache,
+            "ready": self.ready,
+            "running": self.running,
+            "finished": _FlagView(self, "finished"),
+            "released": _FlagView(self, "released"),
+        }
+
+    @classmethod
+    def from_dask(cls, dsk, cache=None):
+        """Build the initial state for ``dsk``
+
+        Mirrors ``start_state_from_dask`` without constructing any per-key
+        sets, except transiently while finding the dependencies of a task.
+        """
+        from array import array
+
+        import numpy as np
+
+        if cache is None:
+            cache = config.get("cache", None)
+        if cache is None:
+            cache = dict()
+        data_ids = []
+        for i, (k, v) in enumerate(dsk.items()):
+            if not has_tasks(dsk, v):
+                cache[k] = v
+                data_ids.append(i)
+
+        dsk2 = dsk.copy()
+        dsk2.update(cache)
+
+        keys = list(dsk)
+        ids = {k: i for i, k in enumerate(keys)}
+        ntasks = len(keys)
+        ptr = array("q", [0])
+        idx = array("q")
+        for k in dsk:
+            for dep in get_dependencies(dsk2, k):
+                i = ids.get(dep)
+                if i is None:
+                    # Data supplied through ``cache`` but absent from ``dsk``
+                    i = ids[dep] = len(keys)
+                    keys.append(dep)
+                idx.append(i)
+            ptr.append(len(idx))
+        ptr.extend([len(idx)] * (len(keys) - ntasks))
+        for k in cache:
+            if k not in ids:
+                ids[k] = len(keys)
+                keys.append(k)
+                ptr.append(len(idx))
+
+        dep_ptr = np.frombuffer(ptr, dtype=np.int64)
+        dep_idx = np.frombuffer(idx, dtype=np.int64)
+        return cls(keys, ids, ntasks, dep_ptr, dep_idx, cache, data_ids)
+
+    def prioritize(self, priorities):
+        """Set task priorities from ``order`` output and sort the ready stack
+
+        Lower values are run first, matching ``dask.order.order``.
+        """
+        import numpy as np
+
+        self.priority = np.array(
+            [priorities.get(k, 0) for k in self.keys], dtype=np.int64
+        )
+        self.ready.sort(key=lambda k: self.priority[self.ids[k]], reverse=True)
+
+    def __getitem__(self, key):
+        return self._fields[key]
+
+    def __setitem__(self, key, value):
+        self._fields[key] = value
+        if key == "ready":
+            self.ready = value
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def dependencies_of(self, i):
+        """Integer ids of the dependencies of the key with id ``i``"""
+        return self.dep_idx[self.dep_ptr[i] : self.dep_ptr[i + 1]]
+
+    def dependents_of(self, i):
+        """Integer ids of the dependents of the key with id ``i``"""
+        return self.dpt_idx[self.dpt_ptr[i] : self.dpt_ptr[i + 1]]
+
+    def finish_task(self, key, results, delete=True, ready=None):
+        """Update state after ``key`` finished, see ``finish_task``"""
+        import numpy as np
+
+        if ready is None:
+            ready = self.ready
+        keys = self.keys
+        memory = self._fields.get("memory")
+        i = self.ids[key]
+        self.done[i] = True
+        self.status[i] = self.FINISHED
+        self.nfinished += 1
+
+        dependents = self.dependents_of(i)
+        if len(dependents):
+            nwaiting = self.nwaiting
+            nwaiting[dependents] -= 1
+            new = dependents[nwaiting[dependents] == 0]
+            if len(new):
+                if len(new) > 1 and self.priority is not None:
+                    new = new[np.argsort(self.priority[new])[::-1]]
+                self.status[new] = self.READY
+                self.nwaiting_total -= len(new)
+                ready.extend([keys[j] for j in new.tolist()])
+
+        dependencies = self.dependencies_of(i)
+        if len(dependencies):
+            nwaiting_data = self.nwaiting_data
+            nwaiting_data[dependencies] -= 1
+            for j in dependencies[nwaiting_data[dependencies] == 0].tolist():
+                dep = keys[j]
+                if dep not in results and not self.released[j]:
+                    self.released[j] = True
+                    self.nreleased += 1
+                    if delete:
+                        del self.cache[dep]
+                    if memory is not None:
+                        memory.release(dep)
+
+        self.running.remove(key)
+
+
+class _AdjacencyView(Mapping):
+    """Read-only ``{key: set_of_keys}`` view of a ``CompactState`` adjacency"""
+
+    def __init__(self, state, dependents):
+        self.state = state
+        self.dependents = dependents
+
+    def __getitem__(self, key):
+        state = self.state
+        i = state.ids[key]
+        if not self.dependents and i >= state.ntasks:
+            raise KeyError(key)
+        ids = state.dependents_of(i) if self.dependents else state.dependencies_of(i)
+        keys = state.keys
+        return {keys[j] for j in ids.tolist()}
+
+    def __iter__(self):
+        keys = self.state.keys
+        return iter(keys if self.dependents else keys[: self.state.ntasks])
+
+    def __len__(self):
+        return len(self.state.keys) if self.dependents else self.state.ntasks
+
+
+class _WaitingView(Mapping):
+    """Read-only view of ``waiting`` or ``waiting_data`` of a ``CompactState``"""
+
+    def __init__(self, state, data):
+        self.state = state
+        self.data = data
+
+    def _ids(self):
+        import numpy as np
+
+        state = self.state
+        if self.data:
+            mask = (state.nwaiting_data > 0) & ~state.released
+        else:
+            mask = state.status == state.WAITING
+        return np.flatnonzero(mask)
+
+    def __getitem__(self, key):
+        state = self.state
+        i = state.ids[key]
+        if self.data:
+            if state.released[i] or not state.nwaiting_data[i]:
+                raise KeyError(key)
+            ids = state.dependents_of(i)
+            ids = ids[state.status[ids] != state.FINISHED]
+        else:
+            if state.status[i] != state.WAITING:
+                raise KeyError(key)
+            ids = state.dependencies_of(i)
+            ids = ids[~state.done[ids]]
+        keys = state.keys
+        return {keys[j] for j in ids.tolist()}
+
+    def __iter__(self):
+        keys = self.state.keys
+        return (keys[i] for i in self._ids().tolist())
+
+    def __len__(self):
+        if self.data:
+            return len(self._ids())
+        return self.state.nwaiting_total
+
+    def __bool__(self):
+        return bool(len(self))
+
+
+class _FlagView(AbstractSet):
+    """Read-only set view of the ``finished`` or ``released`` keys"""
+
+    def __init__(self, state, name):
+        self.state = state
+        self.name = name
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return set(it)
+
+    def _mask(self):
+        state = self.state
+        if self.name == "finished":
+            return state.status == state.FINISHED
+        return state.released
+
+    def __contains__(self, key):
+        state = self.state
+        i = state.ids.get(key)
+        if i is None:
+            return False
+        if self.name == "finished":
+            return state.status[i] == state.FINISHED
+        return bool(state.released[i])
+
+    def __iter__(self):
+        import numpy as np
+
+        keys = self.state.keys
+        return (keys[i] for i in np.flatnonzero(self._mask()).tolist())
+
+    def __len__(self):
+        if self.name == "finished":
+            return self.state.nfinished
+        return self.state.nreleased
+
+
+def _start_callbacks(callbacks, dsk, started_cbs):
+    """Call the ``start`` callbacks, appending them to ``started_cbs``
+
+    Start callbacks may replace tasks with their results, like ``Cache`` does.
+    Returns whether any task of ``dsk`` was added, removed or replaced.
+    """
+    starts = [cb[0] for cb in callbacks if cb[0]]
+    # Replacing the task of a key keeps its position in the dict
+    tasks = list(dsk.values()) if starts else None
+    for cb in callbacks:
+        if cb[0]:
+            cb[0](dsk)
+        started_cbs.append(cb)
+    if not starts:
+        return False
+    return len(dsk) != len(tasks) or any(
+        a is not b for a, b in zip(tasks, dsk.values())
+    )
+
+
+def _cull(dsk, keys):
+    """Drop the tasks of ``dsk`` that are not needed to compute ``keys``
+
+    Used after start callbacks changed the graph, see ``_start_callbacks``.
+    Tasks replaced by their results leave the tasks upstream of them unused.
+    Returns the graph and the dependencies of its tasks, or None if they were
+    not computed.
+    """
+    if not all(k in dsk for k in keys):
+        return dsk, None
+    culled, dependencies = cull(dsk, list(keys))
+    if len(culled) == len(dsk):
+        culled = dsk
+    return culled, dependencies
+
+
+def _start_state(dsk, cache, dependencies=None):
+    """Order ``dsk`` and build the initial scheduler state
+
+    Returns the state and the ``order`` priorities of the keys.
+    """
+    if config.get("local-scheduler.compact-state", False):
+        state = CompactState.from_dask(dsk, cache=cache)
+        # Order straight from the compact adjacency, rather than re-parsing
+        # the tasks or building dictionaries of sets of keys
+        keyorder = _order_csr(dsk, state.keys, state.dep_ptr, state.dep_idx)
+        state.prioritize(keyorder)
+    else:
+        if dependencies is not None:
+            dependencies = {k: set(v) for k, v in dependencies.items()}
+        keyorder = order(dsk, dependencies=dependencies)
+        state = start_state_from_dask(dsk, cache=cache, sortkey=keyorder.get)
+    return state, keyorder
+
+
 """
 Running tasks
 -------------
@@ -238,6 +627,134 @@ def batch_execute_tasks(it):
     return [execute_task(*a) for a in it]
 
 
+def execute_batch(batch_info, dumps, loads, get_id, pack_exception):
+    """Compute a batch of tasks in order
+
+    Used by ``get_async`` with ``chunksize="auto"``.  ``batch_info`` holds a
+    list of ``(key, task, keep)`` and the data of their dependencies, which is
+    serialized once for the whole batch.  The results of tasks are kept in the
+    worker for later tasks of the same batch, and only serialized and sent
+    back if ``keep`` is set.
+
+    Returns a list of ``(key, result, failed)``, with ``result`` None for
+    tasks that were not kept, and the time spent computing the tasks.
+    """
+    tasks, data = loads(batch_info)
+    id = get_id()
+    out = []
+    duration = 0.0
+    for key, task, keep in tasks:
+        try:
+            start = default_timer()
+            result = _execute_task(task, data)
+            duration += default_timer() - start
+            data[key] = result
+            result = dumps((result, id)) if keep else None
+            failed = False
+        except BaseException as e:
+            result = pack_exception(e, dumps)
+            failed = True
+        out.append((key, result, failed))
+        if failed:
+            break
+    return out, duration
+
+
+class BatchSizer:
+    """Choose how many tasks to send to a worker at once
+
+    Measures the time that tasks take to compute and the overhead of sending
+    a batch of tasks to a worker and back, like serialization and
+    communication.  Batches are made large enough for the overhead to be at
+    most ``target`` times the time spent computing, but not so large that
+    some workers are left idle.
+
+    Parameters
+    ----------
+    target : float
+        Acceptable overhead, as a fraction of the compute time of a batch
+    maximum : int
+        Largest batch size
+    alpha : float
+        Weight of the latest measurement in the running averages
+
+    Examples
+    --------
+    >>> sizer = BatchSizer()
+    >>> sizer.chunksize(nready=1000, num_workers=4)  # nothing measured yet
+    1
+    >>> sizer.update(ntasks=1, duration=0.0001, roundtrip=0.0011)
+    >>> sizer.chunksize(nready=1000, num_workers=4)
+    100
+    >>> sizer.chunksize(nready=100, num_workers=4)  # keep all workers busy
+    25
+    """
+
+    def __init__(self, target=0.1, maximum=1000, alpha=0.3):
+        self.target = target
+        self.maximum = maximum
+        self.alpha = alpha
+        self.task_duration = None
+        self.overhead = None
+
+    def update(self, ntasks, duration, roundtrip):
+        """Record a batch of ``ntasks`` tasks
+
+        ``duration`` is the time spent computing them and ``roundtrip`` the
+        time from serializing the batch to receiving its results.
+        """
+        task_duration = duration / ntasks
+        overhead = max(roundtrip - duration, 0)
+        if self.task_duration is None:
+            self.task_duration = task_duration
+            self.overhead = overhead
+        else:
+            a = self.alpha
+            self.task_duration = a * task_duration + (1 - a) * self.task_duration
+            self.overhead = a * overhead + (1 - a) * self.overhead
+
+    def chunksize(self, nready, num_workers):
+        """Number of tasks to put in the next batch"""
+        if self.task_duration is None:
+            return 1
+        if self.task_duration > 0:
+            size = self.overhead / (self.target * self.task_duration)
+            size = min(int(size + 0.5), self.maximum)
+        else:
+            size = self.maximum
+        return max(min(size, -(nready // -num_workers)), 1)
+
+    def __repr__(self):
+        if self.task_duration is None:
+            return "<BatchSizer: no measurements>"
+        return "<BatchSizer: {} per task, {} overhead per batch>".format(
+            format_time(self.task_duration), format_time(self.overhead)
+        )
+
+
+def chain_of(state, key, results):
+    """Tasks that can run right after ``key`` in the same worker
+
+    Follows ``key`` through dependents that depend on nothing else that is
+    not available yet, as long as the previous task is the only one that
+    needs the data and it is not a requested result.  The data of these
+    tasks can stay in the worker.
+    """
+    chain = []
+    dependents = state["dependents"]
+    waiting = state["waiting"]
+    while key not in results:
+        deps = dependents[key]
+        if len(deps) != 1:
+            break
+        [dep] = deps
+        if len(waiting.get(dep, ())) != 1:
+            break
+        chain.append(dep)
+        key = dep
+    return chain
+
+
 def release_data(key, state, delete=True):
     """Remove data from temporary storage
 
@@ -253,22 +770,39 @@ def release_data(key, state, delete=True):
 
     if delete:
         del state["cache"][key]
+    if "memory" in state:
+        state["memory"].release(key)
 
 
 def finish_task(
-    dsk, key, state, results, sortkey, delete=True, release_data=release_data
+    dsk,
+    key,
+    state,
+    results,
+    sortkey,
+    delete=True,
+    release_data=release_data,
+    ready=None,
 ):
     """
     Update execution state after a task finishes
 
     Mutates.  This should run atomically (with a lock).
+
+    Newly runnable tasks are appended to ``ready``, which defaults to
+    ``state["ready"]``.
     """
+    if isinstance(state, CompactState):
+        state.finish_task(key, results, delete=delete, ready=ready)
+        return state
+    if ready is None:
+        ready = state["ready"]
     for dep in sorted(state["dependents"][key], key=sortkey, reverse=True):
         s = state["waiting"][dep]
         s.remove(key)
         if not s:
             del state["waiting"][dep]
-            state["ready"].append(dep)
+            ready.append(dep)
 
     for dep in state["dependencies"][key]:
         if dep in state["waiting_data"]:
@@ -337,8 +871,180 @@ cheap and can significantly impact performance.
 
 We currently select tasks that have recently been made ready.  We hope that
 this first-in-first-out policy reduces memory footprint
+
+Optionally the schedulers can hold to a memory budget, given with the
+``memory_limit=`` keyword or the ``local-scheduler.memory-limit``
+configuration value.  The bytes held in the cache are then measured with
+``dask.sizeof``.  While more than the budget is held we only start tasks that
+will let us release data, preferring those that were most recently made
+ready, and hold back tasks that would only add new data until running tasks
+finish.  If nothing is running we start the next task regardless, so that the
+computation always makes progress.
 """
 
+# How far down the ready stack to look for a task that releases data
+ADMISSION_SCAN_DEPTH = 1000
+
+
+class MemoryBudget:
+    """Track the number of bytes held in the scheduler cache
+
+    Stored as ``state["memory"]`` when a memory limit is set, so callbacks
+    can inspect the current usage and the high-water mark.
+
+    Parameters
+    ----------
+    limit : int
+        Number of bytes above which only tasks that release data are started
+
+    Attributes
+    ----------
+    total : int
+        Bytes currently held
+    high_water : int
+        Largest number of bytes held at any point
+    npaused : int
+        Number of times task submission was held back to stay in budget
+
+    Examples
+    --------
+    >>> budget = MemoryBudget(100)
+    >>> budget.add('x', b'0' * 200)
+    >>> budget.exceeded
+    True
+    >>> budget.release('x')
+    >>> budget.exceeded, budget.high_water
+    (False, 200)
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.nbytes = {}
+        self.total = 0
+        self.high_water = 0
+        self.npaused = 0
+
+    def add(self, key, value):
+        nbytes = sizeof(value)
+        self.total += nbytes - self.nbytes.get(key, 0)
+        self.nbytes[key] = nbytes
+        if self.total > self.high_water:
+            self.high_water = self.total
+
+    def release(self, key):
+        self.total -= self.nbytes.pop(key, 0)
+
+    @property
+    def exceeded(self):
+        return self.total > self.limit
+
+    def __repr__(self):
+        return "<MemoryBudget: {} of {} held, high water {}>".format(
+            format_bytes(self.total),
+            format_bytes(self.limit),
+            format_bytes(self.high_water),
+        )
+
+
+def releases_data(state, key, results):
+    """Whether running ``key`` will let us release any of its dependencies"""
+    if isinstance(state, CompactState):
+        keys = state.keys
+        deps = state.dependencies_of(state.ids[key])
+        last = deps[state.nwaiting_data[deps] == 1].tolist()
+        return any(keys[j] not in results for j in last)
+    waiting_data = state["waiting_data"]
+    for dep in state["dependencies"][key]:
+        if dep not in results and len(waiting_data.get(dep, ())) == 1:
+            return True
+    return False
+
+
+def pop_ready(state, ready, results):
+    """Pop the next task to run from the ready stack ``ready``
+
+    Returns ``None`` if we are over the memory budget, no ready task would
+    release data and other tasks are still running.
+    """
+    memory = state.get("memory")
+    if memory is None or not memory.exceeded:
+        return ready.pop()
+    for i in range(len(ready) - 1, max(len(ready) - ADMISSION_SCAN_DEPTH, 0) - 1, -1):
+        key = ready[i]
+        if releases_data(state, key, results):
+            del ready[i]
+            return key
+    if state["running"]:
+        memory.npaused += 1
+        return None
+    return ready.pop()
+
+
+def steal_ready(state, ready, results):
+    """Steal the next task to run from the left of another worker's deque
+
+    Like ``pop_ready``, over the memory budget only a task that releases data
+    is taken, scanning from the left.  Returns ``None`` if there is none and
+    other tasks are still running.
+    """
+    memory = state.get("memory")
+    if memory is None or not memory.exceeded:
+        return ready.popleft()
+    for i in range(min(len(ready), ADMISSION_SCAN_DEPTH)):
+        key = ready[i]
+        if releases_data(state, key, results):
+            del ready[i]
+            return key
+    if state["running"]:
+        return None
+    return ready.popleft()
+
+
+def next_use(state, keyorder, key):
+    """Priority of the next task that still needs the data of ``key``
+
+    Used to decide which results to spill to disk first.  Returns infinity if
+    no remaining task needs the data.
+    """
+    if isinstance(state, CompactState):
+        i = state.ids.get(key)
+        if i is None or state.priority is None:
+            return float("inf")
+        ids = state.dependents_of(i)
+        ids = ids[state.status[ids] <= state.READY]
+        return int(state.priority[ids].min()) if len(ids) else float("inf")
+    dependents = state["waiting_data"].get(key, ())
+    return min(map(keyorder.__getitem__, dependents), default=float("inf"))
+
+
+def _memory_limit(memory_limit):
+    if memory_limit is None:
+        memory_limit = config.get("local-scheduler.memory-limit", None)
+    if isinstance(memory_limit, str):
+        memory_limit = parse_bytes(memory_limit)
+    return memory_limit
+
+
+def _spill_cache(cache):
+    """A spillable cache if configured and no other cache is given"""
+    if cache is None and config.get("cache", None) is None:
+        return SpillCache.from_config()
+    return None
+
+
+def _prioritize_spilling(state, keyorder):
+    cache = state["cache"]
+    if isinstance(cache, SpillCache) and cache.priority is None:
+        cache.set_priority(partial(next_use, state, keyorder))
+
+
+def _add_memory_budget(state, memory_limit):
+    memory = MemoryBudget(memory_limit)
+    for key, value in state["cache"].items():
+        memory.add(key, value)
+    state["memory"] = memory
+
+
 """
 `get`
 -----
@@ -361,6 +1067,7 @@ def get_async(
     dumps=identity,
     loads=identity,
     chunksize=None,
+    memory_limit=None,
     **kwargs,
 ):
     """Asynchronous get function
@@ -403,15 +1110,30 @@ def get_async(
         worker and parent.  Defaults to identity.
     loads: callable, optional
         Inverse function of `dumps`.  Defaults to identity.
-    chunksize: int, optional
+    chunksize: int or "auto", optional
         Size of chunks to use when dispatching work. Defaults to 1.
         If -1, will be computed to evenly divide ready work across workers.
+        If ``"auto"``, batches are sized by measuring how long tasks take
+        compared to the cost of sending them to workers, see ``BatchSizer``.
+        Each batch serializes the data of its dependencies once, and linear
+        chains of tasks run in the same batch, so that their intermediate
+        results stay in the worker, unless there are ``posttask`` callbacks
+        that need to see them.
+    memory_limit: int or str, optional
+        Number of bytes of results to hold before only starting tasks that
+        release data, like ``"4 GiB"``.  Defaults to the
+        ``local-scheduler.memory-limit`` configuration value.  Usage is
+        reported in ``state["memory"]``, see ``MemoryBudget``.
 
     See Also
     --------
     threaded.get
     """
     chunksize = chunksize or config.get("chunksize", 1)
+    memory_limit = _memory_limit(memory_limit)
+    spill = _spill_cache(cache)
+    if spill is not None:
+        cache = spill
 
     queue = Queue()
 
@@ -430,14 +1152,15 @@ def get_async(
         # to pass to the final block.
         state = {}
         try:
-            for cb in callbacks:
-                if cb[0]:
-                    cb[0](dsk)
-                started_cbs.append(cb)
-
-            keyorder = order(dsk)
-
-            state = start_state_from_dask(dsk, cache=cache, sortkey=keyorder.get)
+            if _start_callbacks(callbacks, dsk, started_cbs):
+                dsk, dependencies = _cull(dsk, results)
+            else:
+                dependencies = None
+            state, keyorder = _start_state(dsk, cache, dependencies)
+            _prioritize_spilling(state, keyorder)
+            dependencies = state["dependencies"]
+            if memory_limit is not None:
+                _add_memory_budget(state, memory_limit)
 
             for _, start_state, _, _, _ in callbacks:
                 if start_state:
@@ -465,16 +1188,16 @@ def get_async(
                 args = []
                 for _ in range(ntasks):
                     # Get the next task to compute (most recently added)
-                    key = state["ready"].pop()
+                    key = pop_ready(state, state["ready"], results)
+                    if key is None:
+                        break
                     # Notify task is running
                     state["running"].add(key)
                     for f in pretask_cbs:
                         f(key, dsk, state)
 
                     # Prep args to send
-                    data = {
-                        dep: state["cache"][dep] for dep in get_dependencies(dsk, key)
-                    }
+                    data = {dep: state["cache"][dep] for dep in dependencies[key]}
                     args.append(
                         (
                             key,
@@ -494,16 +1217,92 @@ def get_async(
                     fut = submit(batch_execute_tasks, each_args)
                     fut.add_done_callback(queue.put)
 
+            # Adaptive batching, see ``BatchSizer`` and ``execute_batch``
+            sizer = BatchSizer()
+            batches = {}
+            chains = not posttask_cbs and not rerun_exceptions_locally
+
+            def fire_batches():
+                """Fire off batches of tasks, sized by ``sizer``"""
+                nready = len(state["ready"])
+                size = sizer.chunksize(nready, num_workers)
+                for _ in range(num_workers - len(batches)):
+                    if not state["ready"]:
+                        break
+                    tasks = []
+                    produced = set()
+                    needed = set()
+                    while len(tasks) < size and state["ready"]:
+                        key = pop_ready(state, state["ready"], results)
+                        if key is None:
+                            break
+                        state["running"].add(key)
+                        chain = chain_of(state, key, results) if chains else []
+                        for k in [key] + chain:
+                            for f in pretask_cbs:
+                                f(k, dsk, state)
+                            needed.update(dependencies[k])
+                            produced.add(k)
+                            tasks.append([k, dsk[k], True])
+                        for task in tasks[-len(chain) - 1 : -1]:
+                            task[2] = False
+                    if not tasks:
+                        break
+                    start = default_timer()
+                    data = {dep: state["cache"][dep] for dep in needed - produced}
+                    batch_info = dumps((tasks, data))
+                    fut = submit(
+                        execute_batch, batch_info, dumps, loads, get_id, pack_exception
+                    )
+                    batches[fut] = start
+                    fut.add_done_callback(queue.put)
+
+            def finish_batch(fut):
+                """Record the results of a batch of tasks, in order"""
+                out, duration = fut.result()
+                sizer.update(len(out), duration, default_timer() - batches.pop(fut))
+                for key, res_info, failed in out:
+                    if failed:
+                        exc, tb = loads(res_info)
+                        if rerun_exceptions_locally:
+                            data = {
+                                dep: state["cache"][dep] for dep in dependencies[key]
+                            }
+                            _execute_task(dsk[key], data)  # Re-execute locally
+                        raise_exception(exc, tb)
+                    if res_info is None:
+                        # Kept in the worker for the next task of its chain
+                        res = worker_id = None
+                    else:
+                        res, worker_id = loads(res_info)
+                        if memory_limit is not None:
+                            state["memory"].add(key, res)
+                    state["cache"][key] = res
+                    if key not in state["running"]:
+                        # Ran as part of a chain, readied by the previous task
+                        ready = state["ready"]
+                        if ready[-1] == key:
+                            ready.pop()
+                        else:
+                            ready.remove(key)
+                        state["running"].add(key)
+                    finish_task(dsk, key, state, results, keyorder.get)
+                    for f in posttask_cbs:
+                        f(key, res, dsk, state, worker_id)
+
             # Main loop, wait on tasks to finish, insert new ones
             while state["waiting"] or state["ready"] or state["running"]:
+                if chunksize == "auto":
+                    fire_batches()
+                    finish_batch(queue_get(queue))
+                    continue
                 fire_tasks(chunksize)
                 for key, res_info, failed in queue_get(queue).result():
                     if failed:
                         exc, tb = loads(res_info)
                         if rerun_exceptions_locally:
                             data = {
-                                dep: state["cache"][dep]
-                                for dep in get_dependencies(dsk, key)
+                                dep: state["cache"][dep] for dep in dependencies[key]
                             }
                             task = dsk[key]
                             _execute_task(task, data)  # Re-execute locally
@@ -511,6 +1310,8 @@ def get_async(
                             raise_exception(exc, tb)
                     res, worker_id = loads(res_info)
                     state["cache"][key] = res
+                    if memory_limit is not None:
+                        state["memory"].add(key, res)
                     finish_task(dsk, key, state, results, keyorder.get)
                     for f in posttask_cbs:
                         f(key, res, dsk, state, worker_id)
@@ -521,8 +1322,282 @@ def get_async(
             for _, _, _, _, finish in started_cbs:
                 if finish:
                     finish(dsk, state, not succeeded)
+            if spill is not None and not succeeded:
+                spill.close()
+
+    try:
+        return nested_get(result, state["cache"])
+    finally:
+        if spill is not None:
+            spill.close()
+
+
+"""
+Work stealing
+-------------
+
+``get_async`` funnels every completed task back through a single queue to the
+calling thread, which then performs all of the bookkeeping.  When tasks are
+very small this driver loop, rather than the workers, limits throughput.
+
+``get_async_stealing`` removes the driver loop.  Each worker owns a deque of
+ready tasks.  When a worker finishes a task it updates the shared state
+itself, pushes any newly runnable dependents onto its own deque and
+immediately continues with the most recently readied task.  Workers whose
+deque is empty steal the oldest task from another worker.  Task selection
+within a worker therefore follows the same last-in-first-out, ``order``
+prioritized policy as ``get_async``.
+
+Workers are long-running functions submitted to the executor, so this only
+makes sense for executors whose workers share memory with the caller, such as
+thread pools.
+"""
+
 
-    return nested_get(result, state["cache"])
+class _ReadyDeques:
+    """Read-only view over the per-worker ready deques
+
+    Stored as ``state["ready"]`` so that callbacks that inspect the number of
+    ready tasks, like ``ProgressBar``, keep working.
+    """
+
+    def __init__(self, deques):
+        self.deques = deques
+
+    def __len__(self):
+        return sum(map(len, self.deques))
+
+    def __iter__(self):
+        for d in self.deques:
+            yield from d
+
+    def __contains__(self, key):
+        return any(key in d for d in self.deques)
+
+    def __bool__(self):
+        return any(self.deques)
+
+
+def get_async_stealing(
+    submit,
+    num_workers,
+    dsk,
+    result,
+    cache=None,
+    get_id=default_get_id,
+    rerun_exceptions_locally=None,
+    raise_exception=reraise,
+    callbacks=None,
+    memory_limit=None,
+    **kwargs,
+):
+    """Work-stealing get function
+
+    A variant of ``get_async`` in which every worker keeps its own deque of
+    ready tasks, performs the scheduling bookkeeping for the tasks it
+    completes and steals work from other workers when it runs dry.  There is
+    no central driver loop.
+
+    Parameters
+    ----------
+    submit : function
+        A ``concurrent.futures.Executor.submit`` function.  ``num_workers``
+        long-running worker functions are submitted, so the executor must be
+        able to run them all concurrently and share memory with the caller.
+    num_workers : int
+        The number of workers
+    dsk : dict
+        A dask dictionary specifying a workflow
+    result : key or list of keys
+        Keys corresponding to desired data
+    cache : dict-like, optional
+        Temporary storage of results
+    get_id : callable, optional
+        Function to return the worker id, takes no arguments.
+    rerun_exceptions_locally : bool, optional
+        Whether to rerun failing tasks in local process to enable debugging
+        (False by default)
+    raise_exception : callable, optional
+        Function that takes an exception and a traceback, and raises an error.
+    callbacks : tuple or list of tuples, optional
+        Callbacks are passed in as tuples of length 5.  Callbacks are called
+        from the worker threads while holding the scheduler lock.  As in
+        ``get_async``, ``posttask`` callbacks run after ``finish_task``.
+    memory_limit: int or str, optional
+        Number of bytes of results to hold before workers only start tasks
+        that release data.  See ``get_async``.
+
+    See Also
+    --------
+    get_async
+    threaded.get_stealing
+    """
+    memory_limit = _memory_limit(memory_limit)
+    spill = _spill_cache(cache)
+    if spill is not None:
+        cache = spill
+
+    if isinstance(result, list):
+        result_flat = set(flatten(result))
+    else:
+        result_flat = {result}
+    results = set(result_flat)
+
+    dsk = dict(dsk)
+    with local_callbacks(callbacks) as callbacks:
+        _, _, pretask_cbs, posttask_cbs, _ = unpack_callbacks(callbacks)
+        started_cbs = []
+        succeeded = False
+        state = {}
+        try:
+            if _start_callbacks(callbacks, dsk, started_cbs):
+                dsk, dependencies = _cull(dsk, results)
+            else:
+                dependencies = None
+            state, keyorder = _start_state(dsk, cache, dependencies)
+            _prioritize_spilling(state, keyorder)
+
+            # ``state["ready"]`` is sorted with the highest priority task last.
+            # Deal it out round-robin so that every deque stays sorted.
+            deques = [deque() for _ in range(num_workers)]
+            for i, key in enumerate(state["ready"]):
+                deques[i % num_workers].append(key)
+            state["ready"] = _ReadyDeques(deques)
+            if memory_limit is not None:
+                _add_memory_budget(state, memory_limit)
+            memory = state.get("memory")
+
+            for _, start_state, _, _, _ in callbacks:
+                if start_state:
+                    start_state(dsk, state)
+
+            if rerun_exceptions_locally is None:
+                rerun_exceptions_locally = config.get("rerun_exceptions_locally", False)
+
+            if state["waiting"] and not state["ready"]:
+                raise ValueError("Found no accessible jobs in dask")
+
+            cond = threading.Condition()
+            errors = []
+            stopped = False
+
+            def is_done():
+                return stopped or not (
+                    state["waiting"] or state["ready"] or state["running"]
+                )
+
+            def next_task(i):
+                """Pop a task from our own deque or steal one.  Hold ``cond``."""
+                own = deques[i]
+                if own:
+                    key = pop_ready(state, own, results)
+                    if key is None:
+                        return None
+                else:
+                    for j in range(1, num_workers):
+                        victim = deques[(i + j) % num_workers]
+                        if victim:
+                            key = steal_ready(state, victim, results)
+                            if key is not None:
+                                break
+                    else:
+                        if memory is not None and any(deques):
+                            memory.npaused += 1
+                        return None
+                state["running"].add(key)
+                for f in pretask_cbs:
+                    f(key, dsk, state)
+                return key
+
+            def worker(i):
+                nonlocal stopped
+                own = deques[i]
+                worker_id = get_id()
+                key = None
+                try:
+                    while True:
+                        with cond:
+                            if key is None:
+                                while True:
+                                    if is_done():
+                                        return
+                                    key = next_task(i)
+                                    if key is not None:
+                                        break
+                                    cond.wait()
+                            data = {
+                                dep: state["cache"][dep]
+                                for dep in state["dependencies"][key]
+                            }
+                        try:
+                            res = _execute_task(dsk[key], data)
+                        except BaseException as e:
+                            with cond:
+                                errors.append((key, e, sys.exc_info()[2]))
+                                stopped = True
+                                cond.notify_all()
+                            return
+                        with cond:
+                            state["cache"][key] = res
+                            if memory is not None:
+                                memory.add(key, res)
+                            nready = len(own)
+                            finish_task(
+                                dsk, key, state, results, keyorder.get, ready=own
+                            )
+                            for f in posttask_cbs:
+                                f(key, res, dsk, state, worker_id)
+                            if is_done():
+                                cond.notify_all()
+                                return
+                            # We run one of the new tasks ourselves, wake
+                            # idle workers to steal any others
+                            nnew = len(own) - nready
+                            if memory is not None:
+                                # Paused workers may be able to continue
+                                cond.notify_all()
+                            elif nnew > 1:
+                                cond.notify(nnew - 1)
+                            key = next_task(i)
+                except BaseException as e:
+                    with cond:
+                        errors.append((None, e, sys.exc_info()[2]))
+                        stopped = True
+                        cond.notify_all()
+
+            futures = [submit(worker, i) for i in range(num_workers)]
+            try:
+                for fut in futures:
+                    fut.result()
+            except BaseException:
+                with cond:
+                    stopped = True
+                    cond.notify_all()
+                raise
+
+            if errors:
+                key, exc, tb = errors[0]
+                if key is not None and rerun_exceptions_locally:
+                    data = {
+                        dep: state["cache"][dep] for dep in state["dependencies"][key]
+                    }
+                    _execute_task(dsk[key], data)  # Re-execute locally
+                raise_exception(exc, tb)
+
+            succeeded = True
+
+        finally:
+            for _, _, _, _, finish in started_cbs:
+                if finish:
+                    finish(dsk, state, not succeeded)
+            if spill is not None and not succeeded:
+                spill.close()
+
+    try:
+        return nested_get(result, state["cache"])
+    finally:
+        if spill is not None:
+            spill.close()
 
 
 """ Synchronous concrete version of get_async
@@ -5,9 +5,12 @@ import multiprocessing
 import multiprocessing.pool
 import os
 import pickle
+import shutil
 import sys
+import tempfile
 import traceback
-from collections.abc import Hashable, Mapping, Sequence
+import uuid
+from collections.abc import Hashable, Mapping, MutableMapping, Sequence
 from concurrent.futures import ProcessPoolExecutor
 from functools import partial
 from warnings import warn
@@ -15,10 +18,13 @@ from warnings import warn
 import cloudpickle
 
 from dask import config
+from dask.core import get_dependencies, has_tasks, quote
 from dask.local import MultiprocessingPoolExecutor, get_async, reraise
 from dask.optimization import cull, fuse
+from dask.sizeof import sizeof
+from dask.spill import dump_to_file, load_from_file
 from dask.system import CPU_COUNT
-from dask.utils import ensure_dict
+from dask.utils import ensure_dict, parse_bytes
 
 
 def _reduce_method_descriptor(m):
@@ -143,6 +149,173 @@ def get_context():
         return multiprocessing.get_context(context_name)
 
 
+# -- Worker-resident results --
+# Results larger than the ``multiprocessing.shared-memory`` threshold are
+# written by the worker that computed them to a file in shared memory, and
+# only a ``SharedRef`` to it is sent to the scheduler process.  Workers that
+# run dependent tasks map the file into memory and rebuild the result around
+# the mapped buffers, without copying them.  The scheduler holds the
+# references in a ``SharedMemoryStore``, which removes the files as soon as
+# the results are released.
+
+
+class SharedRef:
+    """Reference to a task result held in shared memory
+
+    Parameters
+    ----------
+    path : str
+        File holding the result, see ``dask.spill.dump_to_file``
+    frames : list of int
+        Frame lengths of the file
+    """
+
+    __slots__ = ("path", "frames")
+
+    def __init__(self, path, frames):
+        self.path = path
+        self.frames = frames
+
+    def __reduce__(self):
+        return (SharedRef, (self.path, self.frames))
+
+    @property
+    def nbytes(self):
+        return sum(self.frames)
+
+    def load(self):
+        """The result, with large buffers mapped rather than copied"""
+        return load_from_file(self.path, self.frames)
+
+    def __repr__(self):
+        return f"SharedRef({self.path!r}, nbytes={self.nbytes})"
+
+
+@sizeof.register(SharedRef)
+def sizeof_shared_ref(ref):
+    return ref.nbytes
+
+
+def shared_memory_directory():
+    """Default parent directory of the files of ``SharedMemoryStore``
+
+    ``/dev/shm`` where it exists, otherwise the ``temporary-directory``
+    configuration value, where files are backed by the page cache.
+    """
+    if os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return config.get("temporary-directory", None)
+
+
+class SharedMemoryStore(MutableMapping):
+    """Scheduler-side cache for results held in shared memory
+
+    Holds small results like a dictionary and ``SharedRef`` references for
+    results kept in shared memory.  Deleting a reference removes its file.
+
+    Parameters
+    ----------
+    threshold : int or str
+        Results at least this large, as measured by ``dask.sizeof``, are
+        kept in shared memory
+    directory : str, optional
+        Where to create the directory of the files, see
+        ``shared_memory_directory``
+    """
+
+    def __init__(self, threshold, directory=None):
+        if isinstance(threshold, str):
+            threshold = parse_bytes(threshold)
+        self.threshold = threshold
+        if directory is None:
+            directory = shared_memory_directory()
+        self.directory = tempfile.mkdtemp(prefix="dask-shm-", dir=directory)
+        self.data = {}
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        if key in self.data:
+            del self[key]
+        self.data[key] = value
+
+    def __delitem__(self, key):
+        value = self.data.pop(key)
+        if isinstance(value, SharedRef):
+            try:
+                os.remove(value.path)
+            except FileNotFoundError:
+                pass
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def resolve(self, value):
+        """Replace references in a (nested) result with the values"""
+        if isinstance(value, SharedRef):
+            return value.load()
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.resolve(v) for v in value)
+        return value
+
+    def close(self):
+        """Remove all files.  Results that were loaded remain valid."""
+        self.data.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def share(self, dsk):
+        """Rewrite ``dsk`` so that large results stay in shared memory
+
+        Every task is wrapped in ``execute_shared``, which loads referenced
+        inputs and returns a ``SharedRef`` for large results.
+        """
+        out = {}
+        for key, task in dsk.items():
+            if not has_tasks(dsk, task):
+                out[key] = task
+                continue
+            deps = sorted(get_dependencies(dsk, key), key=str)
+            out[key] = (
+                execute_shared,
+                quote(task),
+                quote(deps),
+                deps,
+                self.directory,
+                self.threshold,
+            )
+        return out
+
+
+def execute_shared(task, keys, values, directory, threshold):
+    """Run ``task`` on inputs that may be held in shared memory
+
+    Part of ``SharedMemoryStore.share``.  Returns the result, or a
+    ``SharedRef`` to it if it is at least ``threshold`` bytes and picklable.
+    """
+    from dask.core import _execute_task
+
+    data = {
+        key: value.load() if isinstance(value, SharedRef) else value
+        for key, value in zip(keys, values)
+    }
+    result = _execute_task(task, data)
+    if sizeof(result) < threshold:
+        return result
+    path = os.path.join(directory, uuid.uuid4().hex)
+    try:
+        frames = dump_to_file(result, path)
+    except Exception:
+        # Not picklable with plain pickle, send it back as usual
+        if os.path.exists(path):
+            os.remove(path)
+        return result
+    return SharedRef(path, frames)
+
+
 def get(
     dsk: Mapping,
     keys: Sequence[Hashable] | Hashable,
@@ -153,6 +326,7 @@ def get(
     pool=None,
     initializer=None,
     chunksize=None,
+    shared_memory=None,
     **kwargs,
 ):
     """Multiprocessed get function appropriate for Bags
@@ -176,10 +350,21 @@ def get(
     initializer: function
         Ignored if ``pool`` has been set.
         Function to initialize a worker process before running any tasks in it.
-    chunksize: int, optional
+    chunksize: int or "auto", optional
         Size of chunks to use when dispatching work.
         Defaults to 5 as some batching is helpful.
         If -1, will be computed to evenly divide ready work across workers.
+        If ``"auto"``, batches are sized from measured task durations and
+        communication overhead, and linear chains of tasks run in the same
+        worker without sending their intermediate results back.  See
+        ``dask.local.get_async``.
+    shared_memory: int or str, optional
+        Keep results at least this large, like ``"1 MiB"``, in shared memory.
+        Workers then only send a ``SharedRef`` back to this process, and
+        workers that need the result map it into memory without copying.
+        Defaults to the ``multiprocessing.shared-memory`` configuration
+        value, or to sending all results back.  Callbacks see ``SharedRef``
+        objects in place of such results.
     """
     chunksize = chunksize or config.get("chunksize", 6)
     pool = pool or config.get("pool", None)
@@ -225,6 +410,15 @@ def get(
     loads = func_loads or config.get("func_loads", None) or _loads
     dumps = func_dumps or config.get("func_dumps", None) or _dumps
 
+    if shared_memory is None:
+        shared_memory = config.get("multiprocessing.shared-memory", None)
+    if shared_memory is not None and kwargs.get("cache") is None:
+        store = SharedMemoryStore(shared_memory)
+        dsk3 = store.share(dsk3)
+        kwargs["cache"] = store
+    else:
+        store = None
+
     # Note former versions used a multiprocessing Manager to share
     # a Queue between parent and workers, but this is fragile on Windows
     # (issue #1652).
@@ -243,9 +437,13 @@ def get(
             chunksize=chunksize,
             **kwargs,
         )
+        if store is not None:
+            result = store.resolve(result)
     finally:
         if cleanup:
             pool.shutdown()
+        if store is not None:
+            store.close()
     return result
 
 
@@ -1,7 +1,10 @@
 import math
 import numbers
 import uuid
+from collections import Counter
 from enum import Enum
+from functools import lru_cache
+from itertools import chain
 
 from dask import config, core, utils
 from dask.core import (
@@ -13,6 +16,7 @@ from dask.core import (
     subs,
     toposort,
 )
+from dask.utils import _gc_paused
 
 
 def cull(dsk, keys):
@@ -408,31 +412,35 @@ def default_fused_keys_renamer(keys, max_fused_key_length=120):
     first_key = next(it)
     typ = type(first_key)
 
+    if typ is str or (
+        typ is tuple and len(first_key) > 0 and isinstance(first_key[0], str)
+    ):
+        # Only the names of the keys matter, and those repeat across the
+        # chains fused out of a collection, so the result is cached
+        names = tuple(
+            k[0] if type(k) is tuple and k and type(k[0]) is str else k for k in it
+        )
+        if typ is str:
+            return _fused_key_name(first_key, names, max_fused_key_length)
+        concatenated_name = _fused_key_name(first_key[0], names, max_fused_key_length)
+        return (concatenated_name,) + first_key[1:]
+
+
+@lru_cache(maxsize=10_000)
+def _fused_key_name(first_name, names, max_fused_key_length):
+    """Join the ``key_split`` of ``names`` in front of ``first_name``"""
+    names = {utils.key_split(k) for k in names}
+    names.discard(utils.key_split(first_name))
+    names = sorted(names)
+    names.append(first_name)
+    key_name = "-".join(names)
+
     if max_fused_key_length:  # Take into account size of hash suffix
         max_fused_key_length -= 5
-
-    def _enforce_max_key_limit(key_name):
-        if max_fused_key_length and len(key_name) > max_fused_key_length:
+        if len(key_name) > max_fused_key_length:
             name_hash = f"{hash(key_name):x}"[:4]
             key_name = f"{key_name[:max_fused_key_length]}-{name_hash}"
-        return key_name
-
-    if typ is str:
-        first_name = utils.key_split(first_key)
-        names = {utils.key_split(k) for k in it}
-        names.discard(first_name)
-        names = sorted(names)
-        names.append(first_key)
-        concatenated_name = "-".join(names)
-        return _enforce_max_key_limit(concatenated_name)
-    elif typ is tuple and len(first_key) > 0 and isinstance(first_key[0], str):
-        first_name = utils.key_split(first_key)
-        names = {utils.key_split(k) for k in it}
-        names.discard(first_name)
-        names = sorted(names)
-        names.append(first_key[0])
-        concatenated_name = "-".join(names)
-        return (_enforce_max_key_limit(concatenated_name),) + first_key[1:]
+    return key_name
 
 
 # PEP-484 compliant singleton constant
@@ -564,38 +572,70 @@ def fuse(
         raise TypeError("rename_keys must be a boolean or callable")
     else:
         key_renamer = rename_keys
-    rename_keys = key_renamer is not None
 
     if dependencies is None:
-        deps = {k: get_dependencies(dsk, k, as_list=True) for k in dsk}
-    else:
-        deps = dict(dependencies)
+        dependencies = {k: get_dependencies(dsk, k, as_list=True) for k in dsk}
 
-    rdeps = {}
-    for k, vals in deps.items():
-        for v in vals:
-            if v not in rdeps:
-                rdeps[v] = [k]
-            else:
-                rdeps[v].append(k)
-        deps[k] = set(vals)
+    with _gc_paused():
+        # Count dependents with a C-level pass over all edges, repeats included
+        num_dependents = Counter(chain.from_iterable(dependencies.values()))
+        deps = {k: set(vals) for k, vals in dependencies.items()}
+
+        reducible = {k for k, n in num_dependents.items() if n == 1}
+        if keys:
+            reducible -= keys
+        reducible.difference_update(
+            [
+                k
+                for k, v in dsk.items()
+                if type(v) is not tuple and not isinstance(v, (numbers.Number, str))
+            ]
+        )
 
-    reducible = {k for k, vals in rdeps.items() if len(vals) == 1}
-    if keys:
-        reducible -= keys
+        if not reducible and (
+            not fuse_subgraphs
+            or (
+                1 not in num_dependents.values()
+                and 1 not in Counter(chain.from_iterable(deps.values())).values()
+            )
+        ):
+            # Quick return if there's nothing to do. Only progress if there's tasks
+            # fusible by the main `fuse`, or by `fuse_subgraphs` if enabled.
+            return dsk, deps
+
+        return _fuse(
+            dsk,
+            keys,
+            deps,
+            reducible,
+            ave_width,
+            max_width,
+            max_height,
+            max_depth_new_edges,
+            key_renamer,
+            fuse_subgraphs,
+        )
 
-    for k, v in dsk.items():
-        if type(v) is not tuple and not isinstance(v, (numbers.Number, str)):
-            reducible.discard(k)
 
-    if not reducible and (
-        not fuse_subgraphs or all(len(set(v)) != 1 for v in rdeps.values())
-    ):
-        # Quick return if there's nothing to do. Only progress if there's tasks
-        # fusible by the main `fuse`, or by `fuse_subgraphs` if enabled.
-        return dsk, deps
+def _fuse(
+    dsk,
+    keys,
+    deps,
+    reducible,
+    ave_width,
+    max_width,
+    max_height,
+    max_depth_new_edges,
+    key_renamer,
+    fuse_subgraphs,
+):
+    """Subroutine of fuse that fuses the reducible keys.
 
+    Mutates deps and reducible inplace"""
+    rename_keys = key_renamer is not None
     rv = dsk.copy()
+    # The single dependent of each reducible key
+    rdeps = {v: k for k, vals in deps.items() for v in vals} if reducible else {}
     fused_trees = {}
     # These are the stacks we use to store data as we traverse the graph
     info_stack = []
@@ -616,7 +656,7 @@ def fuse(
         reducible_add(parent)
         while parent in reducible:
             # Go to the top
-            parent = rdeps[parent][0]
+            parent = rdeps[parent]
         children_stack_append(parent)
         children_stack_extend(reducible & deps[parent])
         while True:
@@ -857,7 +897,7 @@ def fuse(
                         else:
                             break
                 # Traverse upwards
-                parent = rdeps[parent][0]
+                parent = rdeps[parent]
 
     if fuse_subgraphs:
         _inplace_fuse_subgraphs(rv, keys, deps, fused_trees, rename_keys)
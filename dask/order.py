@@ -75,10 +75,23 @@ Work towards *small goals* with *big steps*.
     This relies on the regularity of graph constructors like dask.array to be a
     good proxy for ordering.  This is usually a good idea and a sane default.
 """
+import heapq
 from collections import defaultdict, namedtuple
+from collections.abc import Mapping
+from itertools import accumulate, chain
 from math import log
 
-from dask.core import get_dependencies, get_deps, getcycle, reverse_dict
+from dask import config
+from dask.core import (
+    get_dependencies,
+    get_deps,
+    getcycle,
+    has_tasks,
+    no_default,
+    reverse_dict,
+    toposort,
+)
+from dask.utils import _gc_paused, key_split
 
 
 def order(dsk, dependencies=None):
@@ -105,23 +118,212 @@ def order(dsk, dependencies=None):
     >>> dsk = {'a': 1, 'b': 2, 'c': (inc, 'a'), 'd': (add, 'b', 'c')}
     >>> order(dsk)
     {'a': 0, 'c': 1, 'b': 2, 'd': 3}
+
+    The ``order.strategy`` configuration value selects a different ordering,
+    see ``critical_path_order``.
     """
+    strategy = config.get("order.strategy", "memory")
+    if strategy == "critical-path":
+        return critical_path_order(dsk, dependencies=dependencies)
+    if strategy != "memory":
+        raise ValueError(
+            "order.strategy must be 'memory' or 'critical-path', got %r" % strategy
+        )
     if not dsk:
         return {}
 
-    if dependencies is None:
-        dependencies = {k: get_dependencies(dsk, k) for k in dsk}
+    # Ordering allocates a few containers per task, none of which can form
+    # reference cycles.  On large graphs the garbage collector would spend
+    # much of its time walking them, and the graph itself, to no avail.
+    with _gc_paused(len(dsk) >= _VECTORIZE_THRESHOLD):
+        if dependencies is None:
+            dependencies = {k: get_dependencies(dsk, k) for k in dsk}
+        return _order(dsk, dependencies)
+
+
+def critical_path_order(
+    dsk, dependencies=None, durations=None, memory_guard=no_default
+):
+    """Order nodes to shorten the critical path
+
+    ``order`` tries to hold few results in memory at any time.  For graphs
+    whose run time is bound by a long chain of dependencies, like ``tsqr`` or
+    cumulative reductions, this can leave workers idle while the longest
+    chain waits.  This ordering instead runs the ready task with the longest
+    path of remaining work after it first, like a list scheduler.  Ties are
+    broken with ``order``.
+
+    To bound memory, once more results are held than ``memory_guard`` times
+    the most that ``order`` would hold, tasks are taken in the order of
+    ``order`` until that is no longer the case.
+
+    This is used by ``order``, and so by all schedulers, when the
+    ``order.strategy`` configuration value is ``"critical-path"``.
+
+    Parameters
+    ----------
+    dsk : dict
+        The task graph
+    dependencies : dict, optional
+        Dependencies of each key, computed if not given
+    durations : dict or callable, optional
+        Estimated duration of each task.  Mappings may use keys or key names,
+        as returned by ``key_split``, like durations measured by the
+        ``Profiler``.  Defaults to the ``order.durations`` configuration
+        value, or 1 for every task.
+    memory_guard : float or None, optional
+        Defaults to the ``order.memory-guard`` configuration value.  ``None``
+        means no limit.
+
+    Examples
+    --------
+    >>> from dask.utils_test import add, inc
+    >>> dsk = {'a': 1, 'b': (inc, 'a'), 'c': (inc, 'b'), 'd': (inc, 'c'),
+    ...        'x': 1, 'y': (inc, 'x'), 'z': (inc, 'x'), 'w': (add, 'y', 'z')}
+    >>> order(dsk)
+    {'x': 0, 'y': 1, 'z': 2, 'w': 3, 'a': 4, 'b': 5, 'c': 6, 'd': 7}
+    >>> critical_path_order(dsk)
+    {'a': 0, 'x': 1, 'b': 2, 'y': 3, 'z': 4, 'c': 5, 'w': 6, 'd': 7}
+    """
+    if not dsk:
+        return {}
+    if durations is None:
+        durations = config.get("order.durations", None)
+    if memory_guard is no_default:
+        memory_guard = config.get("order.memory-guard", None)
+    if isinstance(durations, Mapping):
+
+        def duration(key):
+            try:
+                return durations[key]
+            except KeyError:
+                return durations.get(key_split(key), 1.0)
+
+    else:
+        duration = _estimate(durations, 1.0)
+
+    with _gc_paused(len(dsk) >= _VECTORIZE_THRESHOLD):
+        if dependencies is None:
+            dependencies = {k: get_dependencies(dsk, k) for k in dsk}
+        o = _order(dsk, dependencies)
+        dependents = reverse_dict(dependencies)
+        keys = sorted(o, key=o.__getitem__)
+
+        # Length of the longest path from each task to the end of the graph
+        rank = {}
+        for key in reversed(keys):
+            rank[key] = duration(key) + max(
+                (rank[dep] for dep in dependents[key]), default=0
+            )
+
+        if memory_guard is None:
+            limit = float("inf")
+        else:
+            limit = memory_guard * max(_held(keys, dependencies, dependents), 1)
+
+        waiting = {key: len(deps) for key, deps in dependencies.items()}
+        waiting_data = {key: len(deps) for key, deps in dependents.items()}
+        ready = [(-rank[key], o[key], key) for key, n in waiting.items() if not n]
+        heapq.heapify(ready)
+        fallback = [(o[key], key) for _, _, key in ready]
+        heapq.heapify(fallback)
+        result = {}
+        held = 0
+        while len(result) < len(o):
+            if held >= limit:
+                while True:
+                    _, key = heapq.heappop(fallback)
+                    if key not in result:
+                        break
+            else:
+                while True:
+                    _, _, key = heapq.heappop(ready)
+                    if key not in result:
+                        break
+            result[key] = len(result)
+            if dependents[key]:
+                held += 1
+            for dep in dependencies[key]:
+                waiting_data[dep] -= 1
+                if not waiting_data[dep]:
+                    held -= 1
+            for dep in dependents[key]:
+                waiting[dep] -= 1
+                if not waiting[dep]:
+                    heapq.heappush(ready, (-rank[dep], o[dep], dep))
+                    heapq.heappush(fallback, (o[dep], dep))
+    return result
 
-    dependents = reverse_dict(dependencies)
-    num_needed, total_dependencies = ndependencies(dependencies, dependents)
-    metrics = graph_metrics(dependencies, dependents, total_dependencies)
 
-    if len(metrics) != len(dsk):
+def _held(keys, dependencies, dependents):
+    """The most results held at once when running ``keys`` one at a time"""
+    waiting_data = {key: len(deps) for key, deps in dependents.items()}
+    held = peak = 0
+    for key in keys:
+        if dependents[key]:
+            held += 1
+            peak = max(peak, held)
+        for dep in dependencies[key]:
+            waiting_data[dep] -= 1
+            if not waiting_data[dep]:
+                held -= 1
+    return peak
+
+
+def _order_csr(dsk, keys, dep_ptr, dep_idx):
+    """``order`` for dependencies given as compressed sparse rows
+
+    ``keys[i]`` depends on ``keys[j]`` for every ``j`` in
+    ``dep_idx[dep_ptr[i]:dep_ptr[i + 1]]``.  The compact state of the local
+    schedulers holds its graph in this form, which saves building
+    dictionaries of sets of keys just to order it.
+
+    >>> _order_csr({}, ['a', 'b', 'c'], [0, 0, 1, 2], [0, 1])
+    {'a': 0, 'b': 1, 'c': 2}
+    """
+    if not keys:
+        return {}
+    ptr = dep_ptr.tolist() if hasattr(dep_ptr, "tolist") else list(dep_ptr)
+    idx = dep_idx.tolist() if hasattr(dep_idx, "tolist") else list(dep_idx)
+    if config.get("order.strategy", "memory") != "memory":
+        dependencies = {
+            key: {keys[j] for j in idx[a:b]} for key, a, b in zip(keys, ptr, ptr[1:])
+        }
+        return order(dsk, dependencies=dependencies)
+    with _gc_paused(len(keys) >= _VECTORIZE_THRESHOLD):
+        sets = [set(idx[a:b]) for a, b in zip(ptr, ptr[1:])]
+        return _order_ids(dsk, keys, sets, ptr, idx)
+
+
+def _order(dsk, dependencies):
+    keys = list(dependencies)
+    dependencies, dep_ptr, dep_idx = _adjacency(dependencies, keys)
+    return _order_ids(dsk, keys, dependencies, dep_ptr, dep_idx)
+
+
+def _order_ids(dsk, keys, dependencies, dep_ptr, dep_idx):
+    # Work on integer ids rather than keys.  Hashing and comparing small
+    # integers is much cheaper than hashing tuples like ``('x', 1, 2)``, and it
+    # lets us compute the graph metrics below on arrays.  We map back to keys
+    # at the very end.
+    n = len(keys)
+    vectorize = n >= _VECTORIZE_THRESHOLD and _has_numpy()
+    dpt_ptr, dpt_idx = _reverse_adjacency(n, dep_ptr, dep_idx, vectorize)
+    dependents = [set(dpt_idx[a:b]) for a, b in zip(dpt_ptr, dpt_ptr[1:])]
+
+    metrics = None
+    if vectorize:
+        metrics = _metrics_vectorized(dep_ptr, dep_idx, dpt_ptr, dpt_idx)
+    if metrics is None:
+        metrics = _metrics_python(dependencies, dependents)
+    if metrics is None:
         cycle = getcycle(dsk, None)
         raise RuntimeError(
             "Cycle detected between the following keys:\n  -> %s"
             % "\n  -> ".join(str(x) for x in cycle)
         )
+    total_dependencies, metrics, partition_keys = metrics
+    num_needed = [len(deps) for deps in dependencies]
 
     # Single root nodes that depend on everything. These cause issues for
     # the current ordering algorithm, since we often hit the root node
@@ -130,7 +332,7 @@ def order(dsk, dependencies=None):
     # So under the special case of a single root node that depends on the entire
     # tree, we skip processing it normally.
     # See https://github.com/dask/dask/issues/6745
-    root_nodes = {k for k, v in dependents.items() if not v}
+    root_nodes = {k for k, v in enumerate(dependents) if not v}
     skip_root_node = len(root_nodes) == 1 and len(dsk) > 1
 
     # Leaf nodes.  We choose one--the initial node--for each weakly connected subgraph.
@@ -148,7 +350,7 @@ def order(dsk, dependencies=None):
             # try to be memory efficient
             num_dependents,
             # tie-breaker
-            StrComparable(key),
+            StrComparable(keys[key]),
         )
         for key, num_dependents, (
             total_dependents,
@@ -158,7 +360,7 @@ def order(dsk, dependencies=None):
             max_heights,
         ) in (
             (key, len(dependents[key]), metrics[key])
-            for key, val in dependencies.items()
+            for key, val in enumerate(dependencies)
             if not val
         )
     }
@@ -177,7 +379,7 @@ def order(dsk, dependencies=None):
             len(dependents[x]) - len(dependencies[x]) + num_needed[x],
             -metrics[x][3],  # min_heights
             # tie-breaker
-            StrComparable(x),
+            StrComparable(keys[x]),
         )
 
     def dependencies_key(x):
@@ -208,27 +410,12 @@ def order(dsk, dependencies=None):
             num_dependents,
             total_dependents,  # already found work, so don't add more
             # tie-breaker
-            StrComparable(x),
+            StrComparable(keys[x]),
         )
 
     def finish_now_key(x):
         """Determine the order of dependents that are ready to run and be released"""
-        return (-len(dependencies[x]), StrComparable(x))
-
-    # Computing this for all keys can sometimes be relatively expensive :(
-    partition_keys = {
-        key: (
-            (min_dependencies - total_dependencies[key] + 1)
-            * (total_dependents - min_heights)
-        )
-        for key, (
-            total_dependents,
-            min_dependencies,
-            _,
-            min_heights,
-            _,
-        ) in metrics.items()
-    }
+        return (-len(dependencies[x]), StrComparable(keys[x]))
 
     result = {}
     i = 0
@@ -739,7 +926,7 @@ def order(dsk, dependencies=None):
                         else:
                             later_nodes[key].append(vals)
 
-        if len(dependencies) == len(result):
+        if n == len(result):
             break  # all done!
 
         if next_nodes:
@@ -800,7 +987,188 @@ def order(dsk, dependencies=None):
             item = init_stack_pop()
         inner_stack.append(item)
 
-    return result
+    return dict(zip(map(keys.__getitem__, result), result.values()))
+
+
+# Graphs smaller than this are cheaper to measure in pure Python
+_VECTORIZE_THRESHOLD = 2000
+
+
+def _has_numpy():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _adjacency(dependencies, keys):
+    """Dependencies by integer id, as sets and as compressed sparse rows
+
+    Returns ``(sets, ptr, idx)`` such that the dependencies of ``keys[i]`` are
+    ``sets[i]``, or ``idx[ptr[i]:ptr[i + 1]]``, as positions in ``keys``.
+
+    >>> _adjacency({'a': set(), 'b': {'a'}, 'c': ['b', 'b']}, ['a', 'b', 'c'])
+    ([set(), {0}, {1}], [0, 0, 1, 2], [0, 1])
+    """
+    ids = {key: i for i, key in enumerate(keys)}.__getitem__
+    sets = [set(map(ids, deps)) for deps in dependencies.values()]
+    ptr = [0, *accumulate(map(len, sets))]
+    idx = list(chain.from_iterable(sets))
+    return sets, ptr, idx
+
+
+def _reverse_adjacency(n, ptr, idx, vectorize=False):
+    """Reverse compressed sparse rows, mapping dependencies to dependents
+
+    >>> _reverse_adjacency(3, [0, 0, 1, 2], [0, 1])
+    ([0, 1, 2, 2], [1, 2])
+    """
+    if vectorize:
+        import numpy as np
+
+        idx = np.asarray(idx, dtype=np.intp)
+        owner = np.repeat(np.arange(n), np.diff(ptr))
+        rptr = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(np.bincount(idx, minlength=n), out=rptr[1:])
+        return rptr.tolist(), owner[np.argsort(idx, kind="stable")].tolist()
+    rev = [[] for _ in range(n)]
+    for i in range(n):
+        for j in idx[ptr[i] : ptr[i + 1]]:
+            rev[j].append(i)
+    return [0, *accumulate(map(len, rev))], list(chain.from_iterable(rev))
+
+
+def _metrics_python(dependencies, dependents):
+    """Total dependencies, graph metrics and partition keys by integer id
+
+    Uses ``ndependencies`` and ``graph_metrics``.  Returns None if the graph
+    has a cycle.
+    """
+    n = len(dependencies)
+    dependencies = dict(enumerate(dependencies))
+    dependents = dict(enumerate(dependents))
+    _, total_dependencies = ndependencies(dependencies, dependents)
+    if len(total_dependencies) != n:
+        return None
+    metrics = graph_metrics(dependencies, dependents, total_dependencies)
+    if len(metrics) != n:
+        return None
+    total_dependencies = [total_dependencies[i] for i in range(n)]
+    metrics = [metrics[i] for i in range(n)]
+    return total_dependencies, metrics, _partition_keys(total_dependencies, metrics)
+
+
+def _partition_keys(total_dependencies, metrics):
+    # Computing this for all keys can sometimes be relatively expensive :(
+    return [
+        (min_dependencies - total + 1) * (total_dependents - min_heights)
+        for total, (total_dependents, min_dependencies, _, min_heights, _) in zip(
+            total_dependencies, metrics
+        )
+    ]
+
+
+def _gather(ptr, idx, nodes):
+    """Concatenated neighbors of ``nodes`` and the offset of each group"""
+    import numpy as np
+
+    starts = ptr[nodes]
+    lengths = ptr[nodes + 1] - starts
+    offsets = np.zeros(len(nodes), dtype=np.intp)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    positions = np.arange(offsets[-1] + lengths[-1]) + np.repeat(
+        starts - offsets, lengths
+    )
+    return idx[positions], offsets
+
+
+def _metrics_vectorized(dep_ptr, dep_idx, dpt_ptr, dpt_idx):
+    """Like ``_metrics_python`` but one topological level at a time with NumPy
+
+    Each level of the graph costs a handful of NumPy calls, so this only pays
+    off for wide graphs.  Returns None if the graph is too deep, if counts
+    don't fit exactly in a float, or if the graph has a cycle.  The caller then
+    falls back to ``_metrics_python``.
+    """
+    import numpy as np
+
+    dep_ptr = np.asarray(dep_ptr, dtype=np.intp)
+    dep_idx = np.asarray(dep_idx, dtype=np.intp)
+    dpt_ptr = np.asarray(dpt_ptr, dtype=np.intp)
+    dpt_idx = np.asarray(dpt_idx, dtype=np.intp)
+    n = len(dep_ptr) - 1
+    max_levels = max(50, n // 100)
+
+    # Kahn's algorithm, a whole frontier at a time
+    remaining = np.diff(dep_ptr)
+    frontier = np.flatnonzero(remaining == 0)
+    levels = []
+    nseen = 0
+    while len(frontier):
+        if len(levels) == max_levels:
+            return None
+        levels.append(frontier)
+        nseen += len(frontier)
+        parents, _ = _gather(dpt_ptr, dpt_idx, frontier)
+        if not len(parents):
+            break
+        parents, counts = np.unique(parents, return_counts=True)
+        remaining[parents] -= counts
+        frontier = parents[remaining[parents] == 0]
+    if nseen != n:
+        return None  # cycle
+
+    # Counts may grow exponentially with the depth of the graph.  Float sums of
+    # non-negative integers are exact as long as the totals are below 2**53.
+    exact = 2.0**53
+
+    total = np.ones(n)
+    for nodes in levels[1:]:
+        children, offsets = _gather(dep_ptr, dep_idx, nodes)
+        total[nodes] += np.add.reduceat(total[children], offsets)
+    if total.max() >= exact:
+        return None
+
+    has_dependents = dpt_ptr[1:] > dpt_ptr[:-1]
+    total_dependents = np.ones(n)
+    min_dependencies = total.copy()
+    max_dependencies = total.copy()
+    min_heights = np.zeros(n, dtype=np.intp)
+    max_heights = np.zeros(n, dtype=np.intp)
+    for nodes in reversed(levels):
+        nodes = nodes[has_dependents[nodes]]
+        if not len(nodes):
+            continue
+        parents, offsets = _gather(dpt_ptr, dpt_idx, nodes)
+        total_dependents[nodes] += np.add.reduceat(total_dependents[parents], offsets)
+        min_dependencies[nodes] = np.minimum.reduceat(
+            min_dependencies[parents], offsets
+        )
+        max_dependencies[nodes] = np.maximum.reduceat(
+            max_dependencies[parents], offsets
+        )
+        min_heights[nodes] = np.minimum.reduceat(min_heights[parents], offsets) + 1
+        max_heights[nodes] = np.maximum.reduceat(max_heights[parents], offsets) + 1
+    if total_dependents.max() >= exact:
+        return None
+
+    total_dependencies = total.astype(np.int64).tolist()
+    metrics = list(
+        zip(
+            total_dependents.astype(np.int64).tolist(),
+            min_dependencies.astype(np.int64).tolist(),
+            max_dependencies.astype(np.int64).tolist(),
+            min_heights.tolist(),
+            max_heights.tolist(),
+        )
+    )
+    partition_keys = (min_dependencies - total + 1) * (total_dependents - min_heights)
+    if np.abs(partition_keys).max() < exact:
+        partition_keys = partition_keys.astype(np.int64).tolist()
+    else:
+        partition_keys = _partition_keys(total_dependencies, metrics)
+    return total_dependencies, metrics, partition_keys
 
 
 def graph_metrics(dependencies, dependents, total_dependencies):
@@ -1074,3 +1442,156 @@ def diagnostics(dsk, o=None, dependencies=None):
         for key, val in o.items()
     }
     return rv, pressure
+
+
+SimulationInfo = namedtuple(
+    "SimulationInfo",
+    ("makespan", "critical_path", "idle_time", "peak_memory", "memory"),
+)
+
+
+def simulate(
+    dsk,
+    o=None,
+    num_workers=1,
+    durations=None,
+    nbytes=None,
+    dependencies=None,
+    keys=None,
+):
+    """Simulate running a graph in order with several workers
+
+    Tasks are replayed as the local schedulers run them.  Whenever a worker is
+    free it takes the task that was most recently made ready, and among tasks
+    made ready at once the one that comes first in ``o``.  A result is held in
+    memory from when its task finishes until all of its dependents finished.
+    Keys that hold data rather than tasks are in memory from the start, and
+    take neither time nor a worker.
+
+    This helps to compare orderings, or chunkings of the same computation,
+    before running them.
+
+    Parameters
+    ----------
+    dsk : dict
+        The task graph
+    o : dict, optional
+        Priorities, as returned by ``order``.  Computed if not given.
+    num_workers : int, optional
+        Number of tasks that run at the same time
+    durations : dict or callable, optional
+        Estimated duration of each task, in seconds.  Defaults to 1 for every
+        task.  Measured durations can be taken from the ``Profiler``, like
+        ``{r.key: r.end_time - r.start_time for r in prof.results}``.
+    nbytes : dict or callable, optional
+        Estimated size of each result, in bytes, like ``sizeof`` of the
+        results of a sample run.  Defaults to 1 for every result, so memory
+        counts the number of results held.
+    dependencies : dict, optional
+        Dependencies of each key, computed if not given
+    keys : iterable, optional
+        Keys whose results are held until the end.  Defaults to the keys that
+        nothing depends on.
+
+    Returns
+    -------
+    SimulationInfo
+        ``makespan``: time until all tasks finished;
+        ``critical_path``: duration of the longest chain of dependencies, a
+        lower bound of the makespan;
+        ``idle_time``: time summed over all workers during which they had no
+        task to run;
+        ``peak_memory``: the most memory held at any time;
+        ``memory``: list of ``(time, memory)`` pairs, after each task finished.
+
+    Examples
+    --------
+    >>> from dask.utils_test import add, inc
+    >>> dsk = {'a': 1, 'b': (inc, 'a'), 'c': (inc, 'a'), 'd': (add, 'b', 'c')}
+    >>> info = simulate(dsk, num_workers=2, durations={'b': 3})
+    >>> info.makespan, info.critical_path, info.idle_time, info.peak_memory
+    (4.0, 4.0, 3.0, 3)
+    """
+    if dependencies is None:
+        dependencies, dependents = get_deps(dsk)
+    else:
+        dependents = reverse_dict(dependencies)
+    if o is None:
+        o = order(dsk, dependencies=dependencies)
+    priority = o.__getitem__
+    duration = _estimate(durations, 1.0)
+    size = _estimate(nbytes, 1)
+    if keys is None:
+        keep = {key for key, deps in dependents.items() if not deps}
+    else:
+        keep = set(keys)
+    data = {key for key in dependents if key not in dsk or not has_tasks(dsk, dsk[key])}
+
+    critical = {}
+    for key in toposort(dependencies, dependencies=dependencies):
+        critical[key] = (0 if key in data else duration(key)) + max(
+            (critical[dep] for dep in dependencies[key]), default=0
+        )
+
+    waiting = {key: len(deps) for key, deps in dependencies.items()}
+    waiting_data = {key: len(deps) for key, deps in dependents.items()}
+    held = peak = 0
+    memory = []
+    for key in data:
+        held += size(key)
+        for dep in dependents[key]:
+            waiting[dep] -= 1
+        if not dependents[key] and key not in keep:
+            held -= size(key)
+    if data:
+        peak = held
+        memory.append((0.0, held))
+    ready = sorted(
+        (key for key, n in waiting.items() if not n and key not in data),
+        key=priority,
+        reverse=True,
+    )
+    running = []
+    now = 0.0
+    busy = 0.0
+    while ready or running:
+        while ready and len(running) < num_workers:
+            key = ready.pop()
+            d = duration(key)
+            busy += d
+            heapq.heappush(running, (now + d, priority(key), key))
+        now, _, key = heapq.heappop(running)
+        held += size(key)
+        peak = max(peak, held)
+        new = []
+        for dep in dependents[key]:
+            waiting[dep] -= 1
+            if not waiting[dep]:
+                new.append(dep)
+        if len(new) > 1:
+            new.sort(key=priority, reverse=True)
+        ready.extend(new)
+        for dep in dependencies[key]:
+            waiting_data[dep] -= 1
+            if not waiting_data[dep] and dep not in keep:
+                held -= size(dep)
+        if not dependents[key] and key not in keep:
+            held -= size(key)
+        memory.append((now, held))
+
+    return SimulationInfo(
+        now,
+        max(critical.values(), default=0),
+        num_workers * now - busy,
+        peak,
+        memory,
+    )
+
+
+def _estimate(values, default):
+    """Function from key to estimate, from a mapping or a function"""
+    if values is None:
+        return lambda key: default
+    if callable(values):
+        return values
+    return lambda key: values.get(key, default)
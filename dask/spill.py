@@ -0,0 +1,289 @@
+"""
+Spill-to-disk storage for task results
+
+The local schedulers keep every intermediate result in ``state["cache"]``
+until no remaining task needs it.  ``SpillCache`` is a mapping that can stand
+in for that dictionary.  It holds results in memory up to a byte limit, as
+measured by ``dask.sizeof``, and writes the rest to local disk.
+
+Which results to spill is decided by a priority function, usually provided by
+the scheduler, that maps a key to the ``dask.order`` priority of the next task
+that needs it.  The results whose next use is furthest away are written to
+disk first.
+
+Results are serialized with pickle protocol 5.  Out-of-band buffers, like the
+memory of NumPy arrays or pandas columns, are written to the file unchanged
+and, where supported, memory-mapped back in when the result is needed again,
+so reloading a large array does not copy it through Python.
+"""
+from __future__ import annotations
+
+import heapq
+import mmap
+import os
+import pickle
+import shutil
+import tempfile
+import uuid
+from collections.abc import MutableMapping
+from timeit import default_timer
+
+from dask import config
+from dask.sizeof import sizeof
+from dask.utils import format_bytes, parse_bytes
+
+__all__ = ("SpillCache", "dump_to_file", "load_from_file")
+
+
+def dump_to_file(value, path):
+    """Serialize ``value`` to the file at ``path``
+
+    Returns the lengths of the frames written: the pickle stream followed by
+    each out-of-band buffer.
+
+    Examples
+    --------
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'x')
+    >>> frames = dump_to_file([1, 2, 3], path)
+    >>> load_from_file(path, frames)
+    [1, 2, 3]
+    """
+    buffers = []
+    header = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+    frames = [len(header)]
+    with open(path, "wb") as f:
+        f.write(header)
+        for buf in buffers:
+            view = buf.raw()
+            f.write(view)
+            frames.append(view.nbytes)
+    return frames
+
+
+def load_from_file(path, frames, use_mmap=None):
+    """Load a value written by ``dump_to_file``
+
+    Parameters
+    ----------
+    path : str
+        Path of the file
+    frames : list of int
+        Frame lengths, as returned by ``dump_to_file``
+    use_mmap : bool, optional
+        Whether to memory-map out-of-band buffers rather than reading them.
+        Defaults to True, except on Windows where mapped files can not be
+        removed.
+    """
+    if use_mmap is None:
+        use_mmap = os.name != "nt"
+    with open(path, "rb") as f:
+        if use_mmap and len(frames) > 1 and sum(frames):
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
+        else:
+            data = bytearray(sum(frames))
+            f.readinto(data)
+            data = memoryview(data)
+    views = []
+    start = 0
+    for n in frames:
+        views.append(data[start : start + n])
+        start += n
+    return pickle.loads(views[0], buffers=views[1:])
+
+
+class SpillCache(MutableMapping):
+    """Mapping that spills values to disk beyond a memory limit
+
+    Parameters
+    ----------
+    limit : int or str
+        Number of bytes of values to hold in memory, like ``"4 GiB"``
+    directory : str, optional
+        Where to create the spill directory.  Defaults to the
+        ``temporary-directory`` configuration value, or the system default.
+    priority : callable, optional
+        Function mapping a key to how soon its value is needed, lower values
+        are needed sooner.  Values needed last are spilled first.  Defaults to
+        spilling the oldest values first.
+
+    Attributes
+    ----------
+    spilled_bytes, unspilled_bytes : int
+        Bytes written to and read back from disk
+    spill_time, unspill_time : float
+        Seconds spent writing and reading
+    nspilled, nunspilled : int
+        Number of values written to and read back from disk
+
+    Examples
+    --------
+    >>> cache = SpillCache("1 kB")
+    >>> cache['x'] = b'0' * 800
+    >>> cache['y'] = b'1' * 800
+    >>> sorted(cache.fast), sorted(cache.slow)
+    (['y'], ['x'])
+    >>> cache['x'] == b'0' * 800
+    True
+    >>> cache.close()
+    """
+
+    def __init__(self, limit, directory=None, priority=None):
+        if isinstance(limit, str):
+            limit = parse_bytes(limit)
+        self.limit = limit
+        self.priority = priority
+        if directory is None:
+            directory = config.get("temporary-directory", None)
+        self._parent_directory = directory
+        self._directory = None
+        self.fast = {}
+        self.slow = {}
+        self.nbytes = {}
+        self.total = 0
+        self._heap = []
+        self._entries = {}
+        self._counter = 0
+        self.unspillable = set()
+        self.spilled_bytes = 0
+        self.unspilled_bytes = 0
+        self.spill_time = 0.0
+        self.unspill_time = 0.0
+        self.nspilled = 0
+        self.nunspilled = 0
+
+    @classmethod
+    def from_config(cls):
+        """A ``SpillCache`` configured by ``local-scheduler.spill``, or None"""
+        limit = config.get("local-scheduler.spill.limit", None)
+        if limit is None:
+            return None
+        return cls(limit, directory=config.get("local-scheduler.spill.directory"))
+
+    @property
+    def directory(self):
+        if self._directory is None:
+            if self._parent_directory:
+                os.makedirs(self._parent_directory, exist_ok=True)
+            self._directory = tempfile.mkdtemp(
+                prefix="dask-spill-", dir=self._parent_directory
+            )
+        return self._directory
+
+    @property
+    def stats(self):
+        """Spill statistics, for diagnostics"""
+        return {
+            "spilled_bytes": self.spilled_bytes,
+            "unspilled_bytes": self.unspilled_bytes,
+            "spill_time": self.spill_time,
+            "unspill_time": self.unspill_time,
+            "nspilled": self.nspilled,
+            "nunspilled": self.nunspilled,
+        }
+
+    def _priority(self, key):
+        if self.priority is None:
+            # Spill the oldest values first
+            return -self._counter
+        return self.priority(key)
+
+    def __setitem__(self, key, value):
+        if key in self:
+            del self[key]
+        nbytes = sizeof(value)
+        self.fast[key] = value
+        self.nbytes[key] = nbytes
+        self.total += nbytes
+        self._push(key)
+        self._evict()
+
+    def _push(self, key):
+        self._counter += 1
+        self._entries[key] = self._counter
+        heapq.heappush(self._heap, (-self._priority(key), self._counter, key))
+
+    def set_priority(self, priority):
+        """Use a new priority function for the values held in memory"""
+        self.priority = priority
+        self._heap = []
+        self._entries = {}
+        for key in self.fast:
+            self._push(key)
+        self._evict()
+
+    def __getitem__(self, key):
+        try:
+            return self.fast[key]
+        except KeyError:
+            pass
+        path, frames = self.slow[key]
+        start = default_timer()
+        value = load_from_file(path, frames)
+        self.unspill_time += default_timer() - start
+        self.unspilled_bytes += sum(frames)
+        self.nunspilled += 1
+        os.remove(path)
+        del self.slow[key]
+        self[key] = value
+        return value
+
+    def __delitem__(self, key):
+        if key in self.fast:
+            del self.fast[key]
+            del self._entries[key]
+            self.total -= self.nbytes.pop(key)
+            self.unspillable.discard(key)
+        else:
+            path, _ = self.slow.pop(key)
+            os.remove(path)
+
+    def __contains__(self, key):
+        return key in self.fast or key in self.slow
+
+    def __iter__(self):
+        yield from self.fast
+        yield from self.slow
+
+    def __len__(self):
+        return len(self.fast) + len(self.slow)
+
+    def _evict(self):
+        """Spill values until the memory limit is respected"""
+        heap = self._heap
+        while self.total > self.limit and heap:
+            _, counter, key = heapq.heappop(heap)
+            if self._entries.get(key) != counter or key in self.unspillable:
+                continue  # stale entry
+            self._spill(key)
+
+    def _spill(self, key):
+        path = os.path.join(self.directory, uuid.uuid4().hex)
+        start = default_timer()
+        try:
+            frames = dump_to_file(self.fast[key], path)
+        except Exception:
+            # Not picklable, keep it in memory
+            if os.path.exists(path):
+                os.remove(path)
+            self.unspillable.add(key)
+            return
+        self.spill_time += default_timer() - start
+        self.spilled_bytes += sum(frames)
+        self.nspilled += 1
+        self.slow[key] = (path, frames)
+        del self.fast[key]
+        del self._entries[key]
+        self.total -= self.nbytes.pop(key)
+
+    def close(self):
+        """Remove all spilled data from disk"""
+        self.slow.clear()
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+    def __repr__(self):
+        return "<SpillCache: {} of {} in memory, {} keys on disk>".format(
+            format_bytes(self.total), format_bytes(self.limit), len(self.slow)
+        )
@@ -107,6 +107,108 @@ def test_tokenize_discontiguous_numpy_array():
     tokenize(np.random.random(8)[::2])
 
 
+@pytest.mark.skipif("not np")
+def test_tokenize_numpy_array_chunked():
+    x = np.arange(10_000)
+    y = x.copy()
+    y[-1] = 0
+    expected = tokenize(x)
+    with dask.config.set({"tokenize.chunk-size": "1 kiB"}):
+        assert tokenize(x) == tokenize(x.copy()) != expected
+        assert tokenize(x) != tokenize(y)
+        assert tokenize(x[::2]) == tokenize(x.copy()[::2])
+        # Small arrays are hashed as before
+        assert tokenize(x[:10]) == tokenize(x[:10].copy())
+    with dask.config.set({"tokenize.chunk-size": None}):
+        assert tokenize(x) == expected
+
+
+@pytest.mark.skipif("not np")
+def test_tokenize_numpy_array_sampled():
+    from dask.base import _SAMPLE_BLOCK_BYTES, _SAMPLE_BLOCKS
+
+    n = 4 * _SAMPLE_BLOCKS * _SAMPLE_BLOCK_BYTES // 8
+    x = np.arange(n, dtype="f8")
+    expected = tokenize(x)
+    with dask.config.set({"tokenize.sample": True}):
+        assert tokenize(x) == tokenize(x.copy()) != expected
+        assert tokenize(x) != tokenize(x[:-1])
+        assert tokenize(x) != tokenize(x.reshape(2, -1))
+        # Differences in sampled blocks change the token, others don't
+        y = x.copy()
+        y[0] = -1
+        assert tokenize(x) != tokenize(y)
+        y = x.copy()
+        y[_SAMPLE_BLOCK_BYTES // 8] = -1
+        assert tokenize(x) == tokenize(y)
+
+        # Small arrays are hashed in full
+        assert tokenize(x[:10]) != tokenize(x[1:11])
+
+        a = np.array(["a", "b"] * 1000, dtype=object)
+        assert tokenize(a) == tokenize(a.copy()) != tokenize(a[::-1])
+
+
+@pytest.mark.skipif("not np")
+def test_tokenize_numpy_array_cache():
+    from dask.base import _array_tokens
+
+    x = np.ones(2**18)
+    tokenize(x)
+    assert id(x) not in _array_tokens
+
+    x.flags.writeable = False
+    token = tokenize(x)
+    assert id(x) in _array_tokens
+    assert tokenize(x) == token == tokenize(x.copy())
+    key = id(x)
+    del x
+    assert key not in _array_tokens
+
+    # Read-only views of writeable data can change through their base
+    base = np.ones(2**18)
+    view = base[:]
+    view.flags.writeable = False
+    token = tokenize(view)
+    assert id(view) not in _array_tokens
+    base[0] = 2
+    assert tokenize(view) != token
+
+    y = np.ones(2**18)
+    with dask.config.set({"tokenize.cache": True}):
+        token = tokenize(y)
+        y[0] = 2  # not noticed
+        assert tokenize(y) == token
+        # Different views of the same data aren't confused
+        assert tokenize(y[1:]) != token
+    assert tokenize(y) != token
+    with dask.config.set({"tokenize.cache": False}):
+        z = np.ones(2**18)
+        z.flags.writeable = False
+        tokenize(z)
+        assert id(z) not in _array_tokens
+
+
+@pytest.mark.skipif("not pd")
+def test_tokenize_pandas_streamed():
+    df = pd.DataFrame({"a": [1, 2, 3], "b": [1.0, 2.0, 3.0], "c": ["x", "y", "z"]})
+    assert tokenize(df) == tokenize(df.copy())
+    assert tokenize(df) != tokenize(df.assign(b=[1.0, 2.0, 4.0]))
+    assert tokenize(df) != tokenize(df[["b", "a", "c"]])
+    assert tokenize(df) != tokenize(df.rename_axis("foo"))
+    assert tokenize(df) != tokenize(df.set_index(pd.Index([3, 2, 1])))
+    assert tokenize(df) != tokenize(df.set_index(pd.Index(["a", "b", "c"])))
+    assert tokenize(df.a) == tokenize(df.a.copy()) != tokenize(df.a + 1)
+    assert tokenize(df.a) != tokenize(df.a.rename_axis("foo"))
+    # The type of the index counts, not only its values
+    assert isinstance(df.index, pd.RangeIndex)
+    assert tokenize(df) != tokenize(df.set_index(pd.Index([0, 1, 2])))
+    with dask.config.set({"tokenize.hasher": "sha1"}):
+        token = tokenize(df)
+    with dask.config.set({"tokenize.hasher": "blake2b"}):
+        assert tokenize(df) != token
+
+
 @pytest.mark.skipif("not np")
 def test_tokenize_numpy_datetime():
     tokenize(np.array(["2000-01-01T12:00:00"], dtype="M8[ns]"))
@@ -417,6 +519,43 @@ def test_tokenize_sequences():
 
 def test_tokenize_dict():
     assert tokenize({"x": 1, 1: "x"}) == tokenize({"x": 1, 1: "x"})
+    assert tokenize({"x": 1, "y": 2}) == tokenize({"y": 2, "x": 1})
+    assert tokenize({"x": 1, "y": 2}) != tokenize({"x": 2, "y": 1})
+
+    class A:
+        def __init__(self, x):
+            self.x = x
+
+        def __repr__(self):
+            return "A"
+
+        def __dask_tokenize__(self):
+            return self.x
+
+    # Keys that look the same
+    a, b = A(1), A(2)
+    assert tokenize({a: 1, b: 2}) == tokenize({b: 2, a: 1})
+
+
+@pytest.mark.skipif("not np")
+def test_tokenize_dict_of_arrays():
+    d = {"x": np.arange(5), "y": np.ones((2, 3)), "z": 1}
+    # Arrays are fed into one streaming hasher
+    assert normalize_token(d)[0] == "dict"
+    assert tokenize(d) == tokenize({"z": 1, "y": np.ones((2, 3)), "x": np.arange(5)})
+    assert tokenize(d) != tokenize({**d, "x": np.arange(1, 6)})
+    assert tokenize(d) != tokenize({**d, "y": np.ones((3, 2))})
+    assert tokenize(d) != tokenize({**d, "z": 2})
+    assert tokenize(d) != tokenize({"w": d["x"], "y": d["y"], "z": 1})
+    assert tokenize(d) != tokenize({k: v.tolist() for k, v in d.items() if k != "z"})
+
+    # Keys and values of other types than arrays keep their type
+    a = np.arange(3)
+    assert tokenize({1: a}) != tokenize({"1": a})
+    assert tokenize({"x": a, "y": 1}) != tokenize({"x": a, "y": "1"})
+    assert tokenize({"x": a, "y": None}) != tokenize({"x": a, "y": "None"})
+    assert tokenize({"x": a, "y": 1}) != tokenize({"x": a, "y": 1.0})
+    assert tokenize({"x": a, "y": (1,)}) != tokenize({"x": a, "y": [1]})
 
 
 def test_tokenize_set():
@@ -1,16 +1,21 @@
+import importlib
+import os
+import subprocess
+import sys
+import threading
 from operator import add
 from time import sleep
 
 import pytest
 
-from dask.cache import Cache
+import dask
+from dask import delayed
+from dask.cache import Cache, DiskTier, MemoryTier, ResultCache
 from dask.callbacks import Callback
+from dask.delayed import Delayed
 from dask.local import get_sync
 from dask.threaded import get
 
-cachey = pytest.importorskip("cachey")
-
-
 flag = []
 
 
@@ -20,14 +25,13 @@ def inc(x):
 
 
 def test_cache():
-    c = cachey.Cache(10000)
-    cc = Cache(c)
+    cc = Cache(10000)
 
     with cc:
         assert get({"x": (inc, 1)}, "x") == 2
 
     assert flag == [1]
-    assert c.data["x"] == 2
+    assert len(cc.cache.tiers[0]) == 1
 
     assert not cc.starttimes
     assert not cc.durations
@@ -44,10 +48,12 @@ def test_cache():
 
 
 def test_cache_with_number():
-    c = Cache(10000, limit=1)
-    assert isinstance(c.cache, cachey.Cache)
-    assert c.cache.available_bytes == 10000
-    assert c.cache.limit == 1
+    c = Cache(10000, halflife=10)
+    assert isinstance(c.cache, ResultCache)
+    [tier] = c.cache.tiers
+    assert isinstance(tier, MemoryTier)
+    assert tier.available_bytes == 10000
+    assert tier.halflife == 10
 
 
 def test_cache_correctness():
@@ -63,6 +69,167 @@ def test_cache_correctness():
         assert (o.compute() == 1).all()
 
 
+def test_cache_keyed_by_token():
+    # Same keys, different inputs
+    cc = Cache(10000)
+    with cc:
+        assert get_sync({"x": 1, "y": (inc, "x")}, "y") == 2
+        assert get_sync({"x": 10, "y": (inc, "x")}, "y") == 11
+        assert get_sync({"x": 1, "y": (inc, "x")}, "y") == 2
+    assert cc.cache.hits == 1
+
+
+def test_cache_skips_upstream_tasks():
+    cc = Cache(10000)
+    dsk = {"x": (inc, 1), "y": (inc, "x"), "z": (inc, "y")}
+    with cc:
+        assert get(dsk, "z") == 4
+    del flag[:]
+
+    dsk["w"] = (add, "z", 10)
+    with cc:
+        assert get(dsk, "w") == 14
+    assert flag == []
+
+    # Values that look like tasks are not computed again
+    cc = Cache(10000)
+    dsk = {"x": (tuple, [inc, 1])}
+    with cc:
+        assert get_sync(dsk, "x") == (inc, 1)
+        assert get_sync(dsk, "x") == (inc, 1)
+
+
+def test_cache_counters():
+    cc = Cache(10000)
+    dsk = {"x": (inc, 1), "y": (inc, "x")}
+    with cc:
+        get_sync(dsk, "y")
+        get_sync(dsk, "y")
+        # Same keys, different tasks
+        get_sync({"x": (inc, 2), "y": (inc, "x")}, "y")
+    stats = cc.cache.stats
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["evictions"] == 0
+    assert stats["tiers"]["memory"]["results"] == 4
+
+
+def test_cache_only_tokenizes_keys_that_can_hit():
+    cc = Cache(10000)
+    dsk = {"x": (inc, 1), "y": (inc, "x"), "z": (inc, "y")}
+    cc._start(dsk)
+    assert not cc.tokens
+
+    with cc:
+        get_sync({"x": (inc, 1), "y": (inc, "x")}, "y")
+    dsk["w"] = (inc, 5)
+    cc._start(dsk)
+    # y can hit, so it and the tasks upstream of it are tokenized
+    assert set(cc.tokens) == {"x", "y"}
+    assert dsk["y"] == 3
+    assert dsk["z"] == (inc, "y")
+
+
+def test_cache_notices_function_changes(tmpdir, monkeypatch):
+    # Functions of importable modules are pickled by reference, which does
+    # not change when their code is edited
+    monkeypatch.syspath_prepend(str(tmpdir))
+    tmpdir.join("cache_edited_module.py").write("def f(x):\n    return x + 1\n")
+    import cache_edited_module
+
+    directory = str(tmpdir.join("cache"))
+    with Cache(10000, directory=directory):
+        assert get_sync({"x": (cache_edited_module.f, 1)}, "x") == 2
+
+    tmpdir.join("cache_edited_module.py").write("def f(x):\n    return x + 20\n")
+    importlib.reload(cache_edited_module)
+    cc = Cache(10000, directory=directory)
+    with cc:
+        assert get_sync({"x": (cache_edited_module.f, 1)}, "x") == 21
+    assert cc.cache.hits == 0
+
+
+def test_cache_arguments():
+    with pytest.raises(TypeError, match="number of bytes"):
+        Cache([MemoryTier(100)], directory="foo")
+    with pytest.raises(TypeError, match="list of tiers"):
+        Cache("100 MB")
+    with pytest.raises(TypeError, match="list of tiers"):
+        Cache([1, 2])
+    with pytest.raises(ValueError, match="positive"):
+        Cache(-1)
+    assert Cache([MemoryTier(100)]).cache.tiers[0].available_bytes == 100
+
+
+def test_cache_cachey():
+    cachey = pytest.importorskip("cachey")
+    with pytest.warns(FutureWarning, match="cachey"):
+        cc = Cache(cachey.Cache(10000))
+    dsk = {"x": (inc, 1), "y": (inc, "x")}
+    with cc:
+        assert get_sync(dsk, "y") == 3
+        assert get_sync(dsk, "y") == 3
+    assert cc.cache.hits == 1
+
+
+def test_memory_tier_evicts_cheapest_per_byte():
+    tier = MemoryTier(3000)
+    tier.put("a", b"0" * 1000, cost=1)
+    tier.put("b", b"0" * 1000, cost=0.001)
+    tier.put("c", b"0" * 500, cost=1)
+    assert tier.evictions == 1
+    assert set(tier) == {"a", "c"}
+    assert tier.total_bytes <= 3000
+
+    # Repeated use keeps cheap results around
+    for _ in range(100):
+        tier.get("c")
+    tier.put("d", b"0" * 1000, cost=1)
+    assert "c" in tier and "a" not in tier
+
+    assert not tier.put("e", b"0" * 4000, cost=100)
+    assert "e" not in tier
+
+
+def test_disk_tier(tmpdir):
+    tier = DiskTier(str(tmpdir), available_bytes=2000)
+    assert tier.put("a", b"0" * 1000, cost=1)
+    assert tier.put("b", b"1" * 1000, cost=10)
+    assert tier.get("b") == (b"1" * 1000, 10)
+    assert "a" not in tier
+    assert tier.evictions == 1
+    assert sorted(os.listdir(str(tmpdir))) == ["b.data", "b.meta"]
+
+    assert not tier.put("lock", threading.Lock(), cost=10)
+    assert sorted(os.listdir(str(tmpdir))) == ["b.data", "b.meta"]
+
+    # Read again by a new tier
+    tier2 = DiskTier(str(tmpdir))
+    assert tier2.get("b") == (b"1" * 1000, 10)
+
+    os.remove(os.path.join(str(tmpdir), "b.data"))
+    with pytest.raises(KeyError):
+        tier2.get("b")
+    assert "b" not in tier2
+
+    tier3 = DiskTier(str(tmpdir), min_duration=1)
+    assert not tier3.put("c", 1, cost=0.5)
+
+
+def test_result_cache_promotes(tmpdir):
+    memory = MemoryTier(10000)
+    disk = DiskTier(str(tmpdir))
+    cache = ResultCache([memory, disk])
+    cache.put("x", 1, cost=1)
+    assert "x" in memory and "x" in disk
+    memory.clear()
+    assert cache["x"] == 1
+    assert "x" in memory
+    with pytest.raises(KeyError):
+        cache["y"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
 def f(duration, size, *args):
     sleep(duration)
     return [0] * size
@@ -74,4 +241,100 @@ def test_prefer_cheap_dependent():
     with c:
         get_sync(dsk, "y")
 
-    assert c.cache.scorer.cost["x"] < c.cache.scorer.cost["y"]
+    [tier] = c.cache.tiers
+    score = {tier.cost[t]: s for t, s in tier.score.items()}
+    x, y = sorted(score)
+    assert score[x] < score[y]
+
+
+def test_cache_persists_across_processes(tmpdir):
+    code = """if True:
+        import sys, time
+        from dask.cache import Cache
+        from dask.local import get_sync
+
+        calls = []
+
+        def slow(x):
+            calls.append(x)
+            time.sleep(0.01)
+            return x + 1
+
+        cache = Cache(1e6, directory=sys.argv[1])
+        with cache:
+            assert get_sync({"x": (slow, 1), "y": (slow, "x")}, "y") == 3
+        print(len(calls), cache.cache.hits)
+    """
+    outputs = [
+        subprocess.check_output([sys.executable, "-c", code, str(tmpdir)])
+        for _ in range(2)
+    ]
+    assert outputs[0].split() == [b"2", b"0"]
+    assert outputs[1].split() == [b"0", b"1"]
+
+
+def test_compute_cache_dir(tmpdir):
+    da = pytest.importorskip("dask.array")
+
+    x = da.arange(20, chunks=5)
+    y = x.map_blocks(inc, dtype=x.dtype)
+    del flag[:]
+    assert dask.compute(y.sum(), cache_dir=str(tmpdir)) == (210,)
+    assert len(flag) == 4
+    [fn] = os.listdir(str(tmpdir))
+
+    # A new graph with the same tasks loads the result
+    y = da.arange(20, chunks=5).map_blocks(inc, dtype=x.dtype)
+    del flag[:]
+    assert y.sum().compute(cache_dir=str(tmpdir)) == 210
+    assert not flag
+
+    # Persisted blocks are reused downstream, and culled upstream
+    (y2,) = dask.persist(y, cache_dir=str(tmpdir))
+    assert len(flag) == 4
+    assert sum(fn.endswith(".npy") for fn in os.listdir(str(tmpdir))) == 4
+    z = (y * 2).sum()
+    del flag[:]
+    assert z.compute(cache_dir=str(tmpdir)) == 420
+    assert not flag
+
+
+def test_compute_cache_dir_function_code(tmpdir):
+    # Results are not reused after the code of a function changes
+    namespace = {}
+    exec("def f(x):\n    return x + 1", namespace)
+    assert Delayed("x", {"x": (namespace["f"], 1)}).compute(cache_dir=str(tmpdir)) == 2
+    exec("def f(x):\n    return x + 2", namespace)
+    assert Delayed("x", {"x": (namespace["f"], 1)}).compute(cache_dir=str(tmpdir)) == 3
+    # The stale result is replaced
+    assert len(os.listdir(str(tmpdir))) == 1
+    assert Delayed("x", {"x": (namespace["f"], 1)}).compute(cache_dir=str(tmpdir)) == 3
+
+
+def test_compute_cache_dir_nondeterministic(tmpdir):
+    class Opaque:
+        pass
+
+    obj = Opaque()
+    x = delayed(type, pure=True)(obj)
+    assert dask.compute(x, cache_dir=str(tmpdir)) == (Opaque,)
+    assert not os.listdir(str(tmpdir))
+
+
+def test_result_store_formats(tmpdir):
+    np = pytest.importorskip("numpy")
+    pd = pytest.importorskip("pandas")
+    from dask.cache import load_result, write_result
+
+    path = str(tmpdir.join("x"))
+    x = np.arange(10)
+    assert write_result(x, path) == ".npy"
+    np.testing.assert_array_equal(load_result(path + ".npy"), x)
+    assert write_result(x.astype(object), path) == ".pkl"
+    assert write_result(np.ma.masked_array(x), path) == ".pkl"
+
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}, index=[10, 20])
+    ext = write_result(df, path)
+    pd.testing.assert_frame_equal(load_result(path + ext), df)
+    ext = write_result(pd.DataFrame({0: [1]}), path)
+    assert ext == ".pkl"
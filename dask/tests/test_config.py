@@ -286,6 +286,28 @@ def test_set():
     assert d["abc"]["x"] == 123
 
 
+def test_get_cached_lookups_see_changes():
+    assert dask.config.get("abc.x", None) is None
+    with dask.config.set({"abc.x": 1}):
+        assert dask.config.get("abc.x") == 1
+        assert dask.config.get("abc") == {"x": 1}
+        with dask.config.set({"abc.x": 2}):
+            assert dask.config.get("abc.x") == 2
+        assert dask.config.get("abc.x") == 1
+    assert dask.config.get("abc.x", None) is None
+    with pytest.raises(KeyError):
+        dask.config.get("abc.x")
+
+    try:
+        dask.config.update(dask.config.global_config, {"abc": {"x": 3}})
+        assert dask.config.get("abc.x") == 3
+    finally:
+        dask.config.global_config.pop("abc")
+        dask.config.refresh()
+        dask.config._initialize()
+    assert dask.config.get("abc.x", None) is None
+
+
 def test_set_kwargs():
     with dask.config.set(foo__bar=1, foo__baz=2):
         assert config["foo"] == {"bar": 1, "baz": 2}
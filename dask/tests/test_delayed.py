@@ -1,5 +1,7 @@
+import gc
 import pickle
 import types
+import weakref
 from collections import namedtuple
 from dataclasses import dataclass, field
 from functools import partial
@@ -538,6 +540,82 @@ def test_kwargs():
     assert dmysum(1, 2, c=c, four=4).key != dmysum(2, 2, c=c, four=4).key
 
 
+def test_map():
+    def mysum(a, b, c=0):
+        return a + b + c
+
+    one = delayed(1)
+    results = delayed.map(mysum, [one, 2, 3], [10, delayed(20), 30], c=one)
+    assert all(isinstance(r, Delayed) for r in results)
+    # All calls are built into one layer of one graph
+    graph = results[0].dask
+    assert all(r.dask is graph for r in results)
+    assert len({r.__dask_layers__() for r in results}) == 1
+    graph.validate()
+    assert compute(*results) == (12, 23, 34)
+
+    keys = [r.key for r in delayed.map(mysum, [1, 2], [3, 4], pure=True)]
+    assert keys == [r.key for r in delayed.map(mysum, [1, 2], [3, 4], pure=True)]
+    assert keys != [r.key for r in delayed.map(mysum, [1, 2], [3, 5], pure=True)]
+    assert keys != [r.key for r in delayed.map(mysum, [1, 2], [3, 4])]
+
+    # Settings of a delayed function are passed on
+    dmysum = delayed(mysum, pure=True)
+    assert [r.key for r in delayed.map(dmysum, [1, 2], [3, 4])] == [
+        r.key for r in delayed.map(dmysum, [1, 2], [3, 4])
+    ]
+
+    assert delayed.map(mysum, [], []) == []
+    with pytest.raises(TypeError, match="dask_key_name"):
+        delayed.map(mysum, [1], [2], dask_key_name="foo")
+    with pytest.raises(TypeError, match="can be mapped"):
+        delayed.map(delayed(mysum)(1, 2), [1])
+
+
+def test_map_nout():
+    (result,) = delayed.map(divmod, [7], [2], nout=2)
+    q, r = result
+    assert compute(q, r) == (3, 1)
+    (result,) = delayed.map(delayed(divmod, nout=2), [7], [2])
+    assert len(result) == 2
+
+
+def test_map_method_of_wrapped_object():
+    class Mappable:
+        def map(self, func):
+            return func(1)
+
+    # ``map`` of delayed objects is still the ``map`` of the wrapped object
+    assert delayed(Mappable()).map(inc).compute() == 2
+
+
+def test_opaque_type_cache_is_weak():
+    class Opaque:
+        pass
+
+    assert isinstance(delayed(type)(Opaque()).compute(), type)
+    ref = weakref.ref(Opaque)
+    del Opaque
+    gc.collect()
+    assert ref() is None
+
+
+def test_unpack_collections_with_getattr():
+    # Instances can forward the dask collection interface through __getattr__,
+    # so their types are always inspected
+    class Proxy:
+        def __init__(self, obj):
+            self.obj = obj
+
+        def __getattr__(self, attr):
+            if attr == "obj":
+                raise AttributeError(attr)
+            return getattr(self.obj, attr)
+
+    x = Tuple({"a": 1, "b": 2, "c": (add, "a", "b")}, ["a", "b", "c"])
+    assert delayed(len)(Proxy(x)).compute() == 3
+
+
 def test_custom_delayed():
     x = Tuple({"a": 1, "b": 2, "c": (add, "a", "b")}, ["a", "b", "c"])
     x2 = delayed(add, pure=True)(x, (4, 5, 6))
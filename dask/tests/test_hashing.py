@@ -1,6 +1,13 @@
 import pytest
 
-from dask.hashing import hash_buffer, hash_buffer_hex, hashers
+import dask
+from dask.hashing import (
+    hash_buffer,
+    hash_buffer_hex,
+    hashers,
+    new_hasher,
+    streaming_hashers,
+)
 
 np = pytest.importorskip("numpy")
 
@@ -40,3 +47,38 @@ def test_hashers(hasher):
     h = hasher(x)
     assert isinstance(h, bytes)
     assert 8 <= len(h) < 32
+
+
+@pytest.mark.parametrize("name", list(streaming_hashers))
+def test_new_hasher(name):
+    h = new_hasher(name)
+    for x in buffers:
+        h.update(x)
+    h2 = new_hasher(name)
+    h2.update(b"".join(bytes(memoryview(x)) for x in buffers))
+    assert h.digest() == h2.digest()
+    assert 8 <= len(h.digest()) <= 32
+
+    with dask.config.set({"tokenize.hasher": name}):
+        h = new_hasher()
+        h.update(b"x")
+        assert h.digest() == hash_buffer(b"x")
+        assert hash_buffer(b"x") == hash_buffer(b"x", hasher=name)
+
+
+def test_new_hasher_unknown():
+    with pytest.raises(ValueError, match="Unknown hasher 'foo'"):
+        new_hasher("foo")
+    with dask.config.set({"tokenize.hasher": "foo"}):
+        with pytest.raises(ValueError, match="Unknown hasher"):
+            hash_buffer(b"x")
+
+
+def test_hash_buffer_follows_config():
+    default = hash_buffer(b"x")
+    with dask.config.set({"tokenize.hasher": "blake2b"}):
+        assert hash_buffer(b"x") == hash_buffer(b"x", hasher="blake2b")
+        with dask.config.set({"tokenize.hasher": "sha1"}):
+            assert hash_buffer(b"x") == hash_buffer(b"x", hasher="sha1")
+        assert hash_buffer(b"x") == hash_buffer(b"x", hasher="blake2b")
+    assert hash_buffer(b"x") == default
@@ -6,7 +6,9 @@ import pytest
 
 import dask
 from dask.blockwise import Blockwise, blockwise_token
+from dask.core import flatten
 from dask.highlevelgraph import HighLevelGraph, Layer, MaterializedLayer, to_graphviz
+from dask.optimization import cull
 from dask.utils_test import inc
 
 
@@ -234,6 +236,101 @@ def test_blockwise_cull(flat):
         assert not layer.is_materialized()
 
 
+def _layer_collections():
+    da = pytest.importorskip("dask.array")
+    dd = pytest.importorskip("dask.dataframe")
+    pd = pytest.importorskip("pandas")
+    from dask.array.overlap import overlap_internal
+    from dask.dataframe.shuffle import shuffle
+
+    x = da.ones((10, 12), chunks=(3, 4))
+    df = dd.from_pandas(pd.DataFrame({"a": range(100), "b": 1}), npartitions=9)
+    small = dd.from_pandas(pd.DataFrame({"a": range(10), "c": 2}), npartitions=2)
+    return {
+        "ArrayOverlapLayer": overlap_internal(x, {0: 1, 1: 2}),
+        "ArrayOverlapLayer-asymmetric": overlap_internal(x, {0: (1, 0), 1: (0, 0)}),
+        "Blockwise": da.outer(x[:, 0], x[0]).T,
+        "SimpleShuffleLayer": shuffle(df, "a", shuffle="tasks"),
+        "ShuffleLayer": shuffle(df, "a", shuffle="tasks", max_branch=2),
+        "BroadcastJoinLayer-inner": dd.merge(
+            df, small, on="a", how="inner", broadcast=True, shuffle="tasks"
+        ),
+        "BroadcastJoinLayer-left": dd.merge(
+            df, small, on="a", how="left", broadcast=True, shuffle="tasks"
+        ),
+        "DataFrameTreeReduction": df.a.sum(split_every=2),
+        "DataFrameTreeReduction-split_out": df.drop_duplicates(
+            split_out=2, split_every=2
+        ),
+    }
+
+
+@pytest.mark.parametrize(
+    "collection",
+    [
+        "ArrayOverlapLayer",
+        "ArrayOverlapLayer-asymmetric",
+        "Blockwise",
+        "SimpleShuffleLayer",
+        "ShuffleLayer",
+        "BroadcastJoinLayer-inner",
+        "BroadcastJoinLayer-left",
+        "DataFrameTreeReduction",
+        "DataFrameTreeReduction-split_out",
+    ],
+)
+def test_layer_get_dependencies_does_not_materialize(collection):
+    # Materialize one copy of the graph to get the expected dependencies
+    # and query a fresh copy symbolically
+    expected = _layer_collections()[collection].__dask_graph__()
+    dsk = _layer_collections()[collection].__dask_graph__()
+    layer_type = collection.split("-")[0]
+    assert any(type(layer).__name__ == layer_type for layer in dsk.layers.values())
+
+    all_keys = expected.keys()
+    for name, layer in dsk.layers.items():
+        if layer.is_materialized():
+            continue
+        for key in expected.layers[name]:
+            deps = MaterializedLayer(expected.layers[name]).get_dependencies(
+                key, all_keys
+            )
+            assert layer.get_dependencies(key, all_keys) == deps
+        assert not layer.is_materialized()
+        assert len(layer) == len(expected.layers[name])
+
+    assert dsk.get_all_dependencies() == expected.get_all_dependencies()
+
+
+@pytest.mark.parametrize(
+    "collection",
+    [
+        "ArrayOverlapLayer",
+        "SimpleShuffleLayer",
+        "ShuffleLayer",
+        "BroadcastJoinLayer-inner",
+        "DataFrameTreeReduction-split_out",
+    ],
+)
+def test_layer_cull_does_not_materialize(collection):
+    x = _layer_collections()[collection]
+    dsk = x.__dask_graph__()
+    key = next(iter(flatten(x.__dask_keys__())))
+    culled = dsk.cull({key})
+    assert not any(
+        layer.is_materialized()
+        for name, layer in dsk.layers.items()
+        if type(layer) is not MaterializedLayer
+    )
+
+    # The culled graph has the same tasks as culling the materialized graph
+    expected, _ = cull(dict(dsk), [key])
+    assert culled.to_dict().keys() == expected.keys()
+    assert culled.get_all_dependencies() == {
+        k: v for k, v in dsk.get_all_dependencies().items() if k in expected
+    }
+
+
 def test_len_does_not_materialize():
     a = {"x": 1}
     b = Blockwise(
@@ -1,7 +1,20 @@
+from time import sleep
+
 import pytest
 
 import dask
-from dask.local import finish_task, get_sync, sortkey, start_state_from_dask
+from dask.local import (
+    BatchSizer,
+    CompactState,
+    MemoryBudget,
+    chain_of,
+    finish_task,
+    get_sync,
+    pop_ready,
+    sortkey,
+    start_state_from_dask,
+    steal_ready,
+)
 from dask.order import order
 from dask.utils_test import GetFunctionTestMixin, add, inc
 
@@ -187,3 +200,305 @@ def test_complex_ordering():
     with Callback(pretask=track_order):
         get_sync(dsk, exp_order[-1])
     assert actual_order == exp_order
+
+
+def test_compact_state_matches_start_state():
+    pytest.importorskip("numpy")
+    dsk = {"x": 1, "y": 2, "z": (inc, "x"), "w": (add, "z", "y"), "v": (inc, "a")}
+    cache = {"a": 10}
+    expected = start_state_from_dask(dsk, cache=dict(cache))
+    state = CompactState.from_dask(dsk, cache=dict(cache))
+    for name in ["dependencies", "dependents", "waiting", "waiting_data"]:
+        assert dict(state[name]) == dict(expected[name])
+    assert state["cache"] == expected["cache"]
+    assert sorted(state["ready"]) == sorted(expected["ready"])
+    assert set(state["finished"]) == set(state["released"]) == set()
+
+
+def test_compact_state_finish_task():
+    pytest.importorskip("numpy")
+    dsk = {"x": 1, "y": 2, "z": (inc, "x"), "w": (add, "z", "y")}
+    expected = start_state_from_dask(dsk)
+    state = CompactState.from_dask(dsk)
+    sortkey = order(dsk).get
+    for s in [expected, state]:
+        s["ready"].remove("z")
+        s["running"].update({"z", "other-task"})
+        s["cache"]["z"] = 2
+        finish_task(dsk, "z", s, set(), sortkey)
+
+    assert state["ready"] == expected["ready"] == ["w"]
+    assert state["running"] == expected["running"] == {"other-task"}
+    assert state["finished"] == expected["finished"] == {"z"}
+    assert state["released"] == expected["released"] == {"x"}
+    assert state["cache"] == expected["cache"]
+    assert dict(state["waiting"]) == expected["waiting"] == {}
+    assert dict(state["waiting_data"]) == expected["waiting_data"]
+    # set operations used by diagnostics
+    assert state["released"] & {"x": 1}.keys() == {"x"}
+
+
+@pytest.mark.parametrize("scheduler", ["sync", "threads", "work-stealing"])
+def test_compact_state_get(scheduler):
+    pytest.importorskip("numpy")
+    from dask.base import get_scheduler
+    from dask.callbacks import Callback
+
+    get = get_scheduler(scheduler=scheduler)
+    dsk = {("x", i): (inc, i) for i in range(20)}
+    dsk.update({("y", i): (add, ("x", i), ("x", (i + 1) % 20)) for i in range(20)})
+    dsk["z"] = (sum, [("y", i) for i in range(20)])
+    expected = get_sync(dsk, ["z", ("x", 0)])
+
+    cached = []
+
+    def posttask(key, result, dsk, state, worker_id):
+        assert isinstance(state, CompactState)
+        assert key in state["finished"]
+        cached.append(len(state["cache"]))
+
+    with dask.config.set({"local-scheduler.compact-state": True}):
+        with Callback(posttask=posttask):
+            assert get(dsk, ["z", ("x", 0)]) == expected
+    assert len(cached) == len(dsk)
+    # Intermediate results are released as the computation proceeds
+    assert max(cached) < len(dsk)
+
+
+def test_compact_state_order():
+    pytest.importorskip("numpy")
+    L = []
+
+    def append(i):
+        L.append(i)
+
+    dsk = {("x", i): (append, i) for i in range(10)}
+    dsk["y"] = (lambda *args: None, sorted(dsk))
+    with dask.config.set({"local-scheduler.compact-state": True}):
+        get_sync(dsk, "y")
+    assert L == sorted(L)
+
+
+def test_compact_state_memory():
+    pytest.importorskip("numpy")
+    import tracemalloc
+
+    from dask.local import _start_state
+
+    # A tree reduction over 5000 leaves
+    dsk = {("x", 0, i): (inc, i) for i in range(5000)}
+    level, width = 0, 5000
+    while width > 1:
+        for i in range(-(width // -4)):
+            deps = [("x", level, j) for j in range(4 * i, min(4 * i + 4, width))]
+            dsk[("x", level + 1, i)] = (sum, deps)
+        level, width = level + 1, -(width // -4)
+    root = ("x", level, 0)
+
+    def peak(func):
+        func()  # leave one-off allocations out
+        tracemalloc.start()
+        try:
+            func()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    peaks = {}
+    for compact in [False, True]:
+        with dask.config.set({"local-scheduler.compact-state": compact}):
+            peaks[compact] = peak(lambda: _start_state(dsk, None))
+            peaks[compact, "get"] = peak(lambda: get_sync(dsk, root))
+    # Ordering works on the CSR arrays, no dict of dependencies is built
+    assert peaks[True] < 0.95 * peaks[False]
+    # Nor anywhere else while computing
+    assert peaks[True, "get"] < 1.07 * peaks[True]
+
+
+def test_get_runs_all_tasks_without_start_callbacks(monkeypatch):
+    import dask.local
+    from dask.callbacks import Callback
+
+    def cull(dsk, keys):
+        raise AssertionError("culled")
+
+    L = []
+    dsk = {"x": (inc, 1), "y": (L.append, 1)}
+    monkeypatch.setattr(dask.local, "cull", cull)
+    assert get_sync(dsk, "x") == 2
+    assert L == [1]
+    # Start callbacks that leave the graph alone don't cull it either
+    with Callback(start=lambda dsk: None):
+        assert get_sync(dsk, "x") == 2
+    assert L == [1, 1]
+
+
+def test_memory_budget_prefers_releasing_tasks():
+    dsk = {
+        "a": (bytes, 1000),
+        "b": (len, "a"),
+        "c": (bytes, 1000),
+        "d": (bytes, 1000),
+    }
+    state = start_state_from_dask(dsk)
+    state["memory"] = MemoryBudget(1500)
+    # "a" was computed and is held
+    state["ready"].remove("a")
+    state["running"].update({"a", "other-task"})
+    state["cache"]["a"] = b"0" * 1000
+    state["memory"].add("a", state["cache"]["a"])
+    finish_task(dsk, "a", state, set(), order(dsk).get)
+    # Make "b" the lowest priority ready task
+    state["ready"].remove("b")
+    state["ready"].insert(0, "b")
+
+    # Within budget the most recently readied task is run
+    assert not state["memory"].exceeded
+    assert pop_ready(state, list(state["ready"]), set()) == state["ready"][-1]
+
+    # Over budget only tasks that release data are run ...
+    state["memory"].add("other", b"0" * 1000)
+    assert state["memory"].exceeded
+    assert pop_ready(state, state["ready"], set()) == "b"
+    # ... or nothing while other tasks are running
+    assert pop_ready(state, state["ready"], set()) is None
+    assert state["memory"].npaused == 1
+    state["running"].clear()
+    assert pop_ready(state, state["ready"], set()) in ("c", "d")
+
+
+def test_memory_budget_steals_releasing_tasks():
+    from collections import deque
+
+    dsk = {"a": (bytes, 1000), "b": (len, "a"), "c": (bytes, 1000)}
+    state = start_state_from_dask(dsk)
+    state["memory"] = MemoryBudget(500)
+    state["cache"]["a"] = b"0" * 1000
+    state["running"].add("other-task")
+    victim = deque(["c", "b", "c"])
+
+    # Within budget the task furthest from the victim is stolen
+    assert steal_ready(state, deque(victim), set()) == "c"
+    # Over budget only tasks that release data are stolen ...
+    state["memory"].add("a", state["cache"]["a"])
+    assert steal_ready(state, victim, set()) == "b"
+    assert list(victim) == ["c", "c"]
+    # ... or nothing while other tasks are running
+    assert steal_ready(state, victim, set()) is None
+    state["running"].clear()
+    assert steal_ready(state, victim, set()) == "c"
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("scheduler", ["sync", "threads", "work-stealing"])
+def test_memory_limit(compact, scheduler):
+    if compact:
+        pytest.importorskip("numpy")
+    from dask.base import get_scheduler
+    from dask.callbacks import Callback
+
+    def make(n, r):
+        sleep(0.001)
+        return bytes(n)
+
+    def slow():
+        sleep(0.05)
+        return 0
+
+    # Every "y" waits for the slow "w".  Meanwhile the other workers can make
+    # all of the "x", which are only ready once "r" ran, and have to be
+    # stolen by all but one worker.
+    get = get_scheduler(scheduler=scheduler)
+    dsk = {"r": (int, 0), "w": (slow,)}
+    dsk.update({("x", i): (make, 1000, "r") for i in range(40)})
+    dsk.update({("y", i): (add, (len, ("x", i)), "w") for i in range(40)})
+    dsk["z"] = (sum, [("y", i) for i in range(40)])
+
+    memory = []
+
+    def finish(dsk, state, errored):
+        memory.append(state["memory"])
+
+    with dask.config.set({"local-scheduler.compact-state": compact}):
+        with Callback(finish=finish):
+            for limit in ["1 GB", "2 kB"]:
+                assert get(dsk, "z", memory_limit=limit, num_workers=4) == 40000
+
+    unbounded, memory = memory
+    assert memory.limit == 2000
+    if scheduler != "sync":
+        # A single worker never runs "w" while making the "x"
+        assert unbounded.high_water >= 40000
+        assert 2000 < memory.high_water < 10000
+    # only the result is held at the end
+    assert memory.total == memory.nbytes["z"]
+
+
+def test_memory_limit_config():
+    dsk = {"x": (bytes, 100), "y": (len, "x")}
+    memory = []
+    from dask.callbacks import Callback
+
+    with dask.config.set({"local-scheduler.memory-limit": 10}):
+        with Callback(finish=lambda dsk, state, errored: memory.append(state)):
+            assert get_sync(dsk, "y") == 100
+    assert memory[0]["memory"].limit == 10
+    assert memory[0]["memory"].high_water >= 100
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_chain_of(compact):
+    if compact:
+        pytest.importorskip("numpy")
+    dsk = {
+        "a": (inc, 1),
+        "b": (inc, "a"),
+        "c": (inc, "b"),
+        "d": (add, "c", "e"),
+        "e": (inc, 1),
+        "f": (inc, "c"),
+    }
+    if compact:
+        state = CompactState.from_dask(dsk)
+    else:
+        state = start_state_from_dask(dsk)
+    assert chain_of(state, "a", set()) == ["b", "c"]
+    # "b" is requested, so the chain ends there and "b" is sent back
+    assert chain_of(state, "a", {"b"}) == ["b"]
+    # "d" also waits on "e"
+    assert chain_of(state, "e", set()) == []
+
+
+def test_batch_sizer():
+    sizer = BatchSizer(target=0.5, maximum=50)
+    assert sizer.chunksize(100, 2) == 1
+    # overhead of 0.1 s against 0.1 s per task
+    sizer.update(ntasks=10, duration=1.0, roundtrip=1.1)
+    assert sizer.chunksize(100, 2) == 2
+    for _ in range(20):
+        sizer.update(ntasks=1, duration=0.001, roundtrip=0.101)
+    # overhead of 0.1 s against 0.001 s per task
+    assert sizer.chunksize(1000, 2) == 50
+    assert sizer.chunksize(10, 4) == 3
+    sizer.update(ntasks=10, duration=0.0, roundtrip=0.1)
+    assert sizer.chunksize(1000, 2) == 50
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("memory_limit", [None, "1 kB"])
+def test_chunksize_auto(compact, memory_limit):
+    if compact:
+        pytest.importorskip("numpy")
+    from dask.threaded import get
+
+    dsk = {("x", i): (inc, i) for i in range(50)}
+    dsk.update({("y", i): (inc, ("x", i)) for i in range(50)})
+    dsk.update({("z", i): (add, ("y", i), ("y", (i + 1) % 50)) for i in range(50)})
+    dsk["total"] = (sum, [("z", i) for i in range(50)])
+    expected = get_sync(dsk, ["total", ("y", 1)])
+
+    with dask.config.set({"local-scheduler.compact-state": compact}):
+        result = get(
+            dsk, ["total", ("y", 1)], chunksize="auto", memory_limit=memory_limit
+        )
+    assert result == expected
@@ -1,4 +1,5 @@
 import multiprocessing
+import os
 import pickle
 import sys
 from concurrent.futures import ProcessPoolExecutor
@@ -8,6 +9,7 @@ import pytest
 
 import dask
 from dask import compute, delayed
+from dask.callbacks import Callback
 from dask.multiprocessing import _dumps, _loads, get, get_context, remote_exception
 from dask.system import CPU_COUNT
 from dask.utils_test import inc
@@ -153,6 +155,87 @@ def test_optimize_graph_false():
     assert len(keys) == 2
 
 
+def test_chunksize_auto():
+    dsk = {("x", i): (inc, i) for i in range(20)}
+    dsk.update({("y", i): (inc, ("x", i)) for i in range(20)})
+    dsk.update({("z", i): (add, ("y", i), 10) for i in range(20)})
+    dsk["total"] = (sum, [("z", i) for i in range(20)])
+    expected = sum(i + 12 for i in range(20))
+    assert get(dsk, "total", chunksize="auto", optimize_graph=False) == expected
+    with dask.config.set(chunksize="auto"):
+        # Intermediate results of chains that were requested come back too
+        assert get(dsk, [("y", 3), "total"], optimize_graph=False) == (5, expected)
+
+
+def test_chunksize_auto_callbacks():
+    d = {"x": 1, "y": (inc, "x"), "z": (add, 10, "y")}
+    results = {}
+
+    def posttask(key, result, *args):
+        results[key] = result
+
+    with Callback(posttask=posttask):
+        assert get(d, "z", chunksize="auto", optimize_graph=False) == 12
+    assert results == {"y": 2, "z": 12}
+
+
+def test_chunksize_auto_errors_propagate():
+    dsk = {"x": (inc, 1), "y": (bad,), "z": (add, "x", "y")}
+
+    with pytest.raises(ValueError, match="12345"):
+        get(dsk, "z", chunksize="auto")
+
+
+def test_shared_memory(tmpdir):
+    np = pytest.importorskip("numpy")
+    from dask.multiprocessing import SharedMemoryStore, SharedRef
+
+    dsk = {
+        "x": (np.arange, 100000),
+        "y": (np.add, "x", 1),
+        "z": (np.sum, "y"),
+        "small": (inc, 1),
+        "w": (add, "z", "small"),
+    }
+    expected = get(dsk, ["y", "w"])
+    with dask.config.set({"multiprocessing.shared-memory": "100 kB"}):
+        y, w = get(dsk, ["y", "w"], optimize_graph=False)
+    assert (y == expected[0]).all()
+    assert w == expected[1]
+
+    store = SharedMemoryStore(1000, directory=str(tmpdir))
+    results = []
+    with Callback(posttask=lambda key, result, *args: results.append(result)):
+        graph = store.share(dsk)
+        assert get(graph, "w", cache=store, optimize_graph=False) == w
+    assert any(isinstance(r, SharedRef) for r in results)
+    # Released results are removed from shared memory
+    assert len(os.listdir(store.directory)) == 0
+    store.close()
+    assert not os.listdir(str(tmpdir))
+
+
+def test_shared_memory_store(tmpdir):
+    np = pytest.importorskip("numpy")
+    from dask.multiprocessing import SharedMemoryStore, SharedRef, execute_shared
+    from dask.sizeof import sizeof
+
+    store = SharedMemoryStore("1 kB", directory=str(tmpdir))
+    assert store.threshold == 1000
+    ref = execute_shared((np.ones, 1000), [], [], store.directory, store.threshold)
+    assert isinstance(ref, SharedRef)
+    assert sizeof(ref) >= 8000
+    assert execute_shared((inc, 1), [], [], store.directory, store.threshold) == 2
+    out = execute_shared((np.sum, "x"), ["x"], [ref], store.directory, 1000)
+    assert out == 1000
+
+    store["x"] = ref
+    assert store.resolve(("a", [store["x"]]))[1][0].sum() == 1000
+    del store["x"]
+    assert not os.path.exists(ref.path)
+    store.close()
+
+
 def test_works_with_highlevel_graph():
     """Previously `dask.multiprocessing.get` would accidentally forward
     `HighLevelGraph` graphs through the dask optimization/scheduling routines,
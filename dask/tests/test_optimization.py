@@ -11,6 +11,7 @@ from dask.local import get_sync
 from dask.optimization import (
     SubgraphCallable,
     cull,
+    default_fused_keys_renamer,
     functions_of,
     fuse,
     fuse_linear,
@@ -225,6 +226,30 @@ def test_fuse_keys():
     )
 
 
+def test_default_fused_keys_renamer():
+    assert default_fused_keys_renamer(["a-1", "b-2", "a-3"]) == "b-a-3"
+    assert default_fused_keys_renamer([("a-1", 0), ("b-2", 0), ("c-3", 0)]) == (
+        "a-b-c-3",
+        0,
+    )
+    # Names are looked up the same way for every kind of key
+    assert default_fused_keys_renamer([(b"x-1", 0), "y-2", ("z-3", 0)]) == (
+        "Other-y-z-3",
+        0,
+    )
+    assert default_fused_keys_renamer([1, 2]) is None
+
+    keys = [("a" * 100, 0), ("b" * 100, 0)]
+    name, index = default_fused_keys_renamer(keys)
+    assert len(name) == 120
+    assert name.startswith("a" * 100 + "-" + "b" * 14)
+    assert default_fused_keys_renamer(keys) == (name, index)
+    assert default_fused_keys_renamer(keys, max_fused_key_length=None) == (
+        "a" * 100 + "-" + "b" * 100,
+        0,
+    )
+
+
 def test_inline():
     d = {"a": 1, "b": (inc, "a"), "c": (inc, "b"), "d": (add, "a", "c")}
     assert inline(d) == {"a": 1, "b": (inc, 1), "c": (inc, "b"), "d": (add, 1, "c")}
@@ -2,7 +2,7 @@ import pytest
 
 import dask
 from dask.core import get_deps
-from dask.order import diagnostics, ndependencies, order
+from dask.order import critical_path_order, diagnostics, ndependencies, order, simulate
 from dask.utils_test import add, inc
 
 
@@ -653,6 +653,47 @@ def test_order_cycle():
     with pytest.raises(RuntimeError, match="Cycle detected"):
         order({"a": (f, "b"), "b": (f, "c"), "c": (f, "a", "d"), "d": (f, "b")})
 
+    # Large graphs, where a root depends on a cycle
+    dsk = {("x", i): (f, ("x", i - 1)) for i in range(1, 3000)}
+    dsk[("x", 0)] = (f, ("x", 10))
+    dsk["root"] = (f, ("x", 2999))
+    with pytest.raises(RuntimeError, match="Cycle detected"):
+        order(dsk)
+
+
+def test_order_metrics_vectorized():
+    np = pytest.importorskip("numpy")
+    from dask.order import (
+        _adjacency,
+        _metrics_python,
+        _metrics_vectorized,
+        _reverse_adjacency,
+    )
+
+    rng = np.random.default_rng(42)
+    dsk = {("x", 0, i): (f,) for i in range(1000)}
+    for j in range(1, 5):
+        for i in range(1000 // j):
+            deps = rng.choice(1000 // (j - 1 or 1), size=rng.integers(1, 5))
+            dsk[("x", j, i)] = (f, [("x", j - 1, int(k)) for k in deps])
+    dependencies, _ = get_deps(dsk)
+    keys = list(dependencies)
+    sets, ptr, idx = _adjacency(dependencies, keys)
+    rptr, ridx = _reverse_adjacency(len(keys), ptr, idx, True)
+    dependents = [set(ridx[a:b]) for a, b in zip(rptr, rptr[1:])]
+
+    expected = _metrics_python(sets, dependents)
+    assert _metrics_vectorized(ptr, idx, rptr, ridx) == expected
+
+    # Fall back to Python on deep graphs
+    dsk = {("x", i): (f, ("x", i - 1)) for i in range(1, 3000)}
+    dsk[("x", 0)] = (f,)
+    dependencies, _ = get_deps(dsk)
+    _, ptr, idx = _adjacency(dependencies, list(dependencies))
+    rptr, ridx = _reverse_adjacency(len(dsk), ptr, idx, True)
+    assert _metrics_vectorized(ptr, idx, rptr, ridx) is None
+    assert order(dsk)[("x", 2999)] == 2999
+
 
 def test_order_empty():
     assert order({}) == {}
@@ -1065,3 +1106,109 @@ def test_diagnostics(abcde):
         (d, 1): 2,
         (e, 1): 1,
     }
+
+
+def test_simulate():
+    dsk = {("x", i): (f,) for i in range(8)}
+    dsk.update({("y", i): (f, ("x", i)) for i in range(8)})
+    dsk["z"] = (f, [("y", i) for i in range(8)])
+
+    info = simulate(dsk)
+    assert info.makespan == 17
+    assert info.critical_path == 3
+    assert info.idle_time == 0
+    assert info.peak_memory == 2 + 7
+    assert info.memory[-1] == (17, 1)
+
+    info = simulate(dsk, num_workers=4)
+    assert info.makespan == 5
+    assert info.critical_path == 3
+    assert info.idle_time == 4 * 5 - 17
+
+    # Running all inputs first holds them all in memory
+    dsk2 = {("x", i): (f,) for i in range(16)}
+    dsk2.update({("y", i): (f, ("x", i), ("x", i + 8)) for i in range(8)})
+    o = {key: i for i, key in enumerate(dsk2)}
+    assert simulate(dsk2, o, keys=[]).peak_memory == 10
+    assert simulate(dsk2, keys=[]).peak_memory == 3
+
+    info = simulate(
+        dsk,
+        num_workers=4,
+        durations={("x", 0): 10},
+        nbytes=lambda key: 100 if key[0] == "x" else 1,
+        keys=[("y", 0)],
+    )
+    assert info.makespan == info.critical_path == 12
+    assert info.memory[-1] == (12, 1)
+
+    # Data is in memory from the start, without taking time or a worker
+    dsk = {("x", i): i for i in range(4)}
+    dsk.update({("y", i): (f, ("x", i)) for i in range(4)})
+    info = simulate(dsk, num_workers=2)
+    assert (info.makespan, info.critical_path) == (2, 1)
+    assert info.idle_time == 0
+    assert info.memory[0] == (0, 4)
+    assert info.peak_memory == 5
+
+    # The critical path does not rely on priorities being topological
+    dsk = {"a": (f,), "b": (f, "a"), "c": (f, "b")}
+    info = simulate(dsk, {"a": 2, "b": 1, "c": 0}, durations={"a": 2})
+    assert info.makespan == info.critical_path == 4
+
+
+def test_critical_path_order():
+    # A long chain next to a wide reduction
+    dsk = {("c", 0): 0}
+    dsk.update({("c", i): (inc, ("c", i - 1)) for i in range(1, 30)})
+    dsk.update({("x", i): 0 for i in range(100)})
+    dsk.update({("y", i): (inc, ("x", i)) for i in range(100)})
+    dsk["z"] = (sum, [("y", i) for i in range(100)])
+
+    o = critical_path_order(dsk)
+    assert o[("c", 0)] == 0
+    assert sorted(o.values()) == list(range(len(dsk)))
+    dependencies, _ = get_deps(dsk)
+    assert all(o[dep] < o[key] for key, deps in dependencies.items() for dep in deps)
+    assert simulate(dsk, o, num_workers=8).makespan == 29
+    assert simulate(dsk, order(dsk), num_workers=8).makespan > 29
+
+    with dask.config.set({"order.strategy": "critical-path"}):
+        assert order(dsk) == o
+        assert dask.get(dsk, "z") == 100
+    with dask.config.set({"order.strategy": "foo"}):
+        with pytest.raises(ValueError, match="order.strategy"):
+            order(dsk)
+
+    # Durations by key or by name
+    o = critical_path_order(dsk, durations={"y": 100})
+    assert o[("x", 0)] == 0
+    o = critical_path_order(dsk, durations={("x", 5): 100, "y": 0.1})
+    assert o[("x", 5)] == 0
+    with dask.config.set({"order.durations": {"y": 100}}):
+        assert critical_path_order(dsk)[("x", 0)] == 0
+
+
+def test_critical_path_order_memory_guard():
+    da = pytest.importorskip("dask.array")
+    from dask.order import _held
+
+    (x,) = dask.optimize((da.ones((2000, 2000), chunks=(100, 100)) + 1).mean())
+    dsk = dict(x.__dask_graph__())
+    dependencies, dependents = get_deps(dsk)
+
+    def held(o):
+        return _held(sorted(o, key=o.__getitem__), dependencies, dependents)
+
+    baseline = held(order(dsk))
+    unguarded = held(critical_path_order(dsk, memory_guard=None))
+    guarded = held(critical_path_order(dsk, memory_guard=1))
+    assert baseline <= guarded <= baseline + 1 < unguarded
+    # The guard is a multiple of what order holds
+    assert guarded < held(critical_path_order(dsk, memory_guard=2)) <= 2 * baseline + 1
+
+    # Defaults to the configuration, where None means no limit as well
+    with dask.config.set({"order.memory-guard": 1}):
+        assert critical_path_order(dsk) == critical_path_order(dsk, memory_guard=1)
+    with dask.config.set({"order.memory-guard": None}):
+        assert held(critical_path_order(dsk)) == unguarded
@@ -0,0 +1,120 @@
+import os
+import threading
+
+import pytest
+
+import dask
+from dask.callbacks import Callback
+from dask.local import get_sync
+from dask.spill import SpillCache, dump_to_file, load_from_file
+from dask.threaded import get
+from dask.utils_test import add, inc
+
+
+def test_dump_load_roundtrip(tmpdir):
+    path = str(tmpdir.join("x"))
+    frames = dump_to_file({"a": [1, 2, 3], "b": "hello"}, path)
+    assert load_from_file(path, frames) == {"a": [1, 2, 3], "b": "hello"}
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_dump_load_numpy_out_of_band(tmpdir, use_mmap):
+    np = pytest.importorskip("numpy")
+    path = str(tmpdir.join("x"))
+    x = np.arange(100_000, dtype="f8")
+    frames = dump_to_file(x, path)
+    # the array buffer is written out-of-band, without copying into the pickle
+    assert len(frames) == 2
+    assert frames[1] == x.nbytes
+    y = load_from_file(path, frames, use_mmap=use_mmap)
+    np.testing.assert_array_equal(x, y)
+    y[0] = -1  # reloaded arrays are writable
+    os.remove(path)
+    assert y[0] == -1 and y[1] == 1
+
+
+def test_spill_cache_priority(tmpdir):
+    needed = {"a": 1, "b": 3, "c": 2}
+    cache = SpillCache(2500, directory=str(tmpdir), priority=needed.__getitem__)
+    for k in "abc":
+        cache[k] = b"0" * 1000
+    # "b" is needed last so it is spilled first
+    assert set(cache.fast) == {"a", "c"}
+    assert set(cache.slow) == {"b"}
+    assert cache.nspilled == 1
+    assert cache.spilled_bytes > 1000
+    assert len(cache) == 3
+    assert set(cache) == {"a", "b", "c"}
+    assert "b" in cache
+
+    assert cache["b"] == b"0" * 1000
+    assert cache.nunspilled == 1
+    assert cache.unspilled_bytes > 1000
+    assert cache.total <= cache.limit
+
+    del cache["a"], cache["b"], cache["c"]
+    assert len(cache) == 0
+    cache.close()
+    assert not os.listdir(str(tmpdir))
+
+
+def test_spill_cache_oldest_first():
+    cache = SpillCache(1500)
+    cache["x"] = b"0" * 1000
+    cache["y"] = b"0" * 1000
+    assert list(cache.slow) == ["x"]
+    directory = cache.directory
+    assert os.listdir(directory)
+    cache.close()
+    assert not os.path.exists(directory)
+
+
+def test_spill_cache_unpicklable():
+    cache = SpillCache(10)
+    lock = threading.Lock()
+    cache["lock"] = lock
+    cache["x"] = b"0" * 100
+    assert cache["lock"] is lock
+    assert "lock" in cache.unspillable
+    assert list(cache.slow) == ["x"]
+    cache.close()
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("get", [get_sync, get])
+def test_spill_compute(tmpdir, get, compact):
+    if compact:
+        pytest.importorskip("numpy")
+    dsk = {("x", i): (bytes, 1000) for i in range(10)}
+    dsk.update({("y", i): (add, ("x", i), ("x", (i + 1) % 10)) for i in range(10)})
+    dsk["z"] = (sum, [(len, ("y", i)) for i in range(10)])
+
+    stats = []
+
+    def finish(dsk, state, errored):
+        stats.append(state["cache"].stats)
+
+    with dask.config.set(
+        {
+            "local-scheduler.compact-state": compact,
+            "local-scheduler.spill.limit": "2.5 kB",
+            "local-scheduler.spill.directory": str(tmpdir),
+        }
+    ):
+        with Callback(finish=finish):
+            assert get(dsk, "z") == 20000
+
+    (stats,) = stats
+    assert stats["nspilled"] > 0
+    assert stats["spilled_bytes"] > 0
+    assert stats["unspilled_bytes"] > 0
+    assert stats["spill_time"] >= 0 and stats["unspill_time"] >= 0
+    # spill files are cleaned up
+    assert not os.listdir(str(tmpdir))
+
+
+def test_spill_not_used_with_explicit_cache(tmpdir):
+    cache = {}
+    with dask.config.set({"local-scheduler.spill.limit": 1}):
+        assert get_sync({"x": (inc, 1), "y": (inc, "x")}, "y", cache=cache) == 3
+    assert cache == {"y": 3}
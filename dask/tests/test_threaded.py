@@ -1,7 +1,8 @@
+import multiprocessing
 import os
 import signal
 import threading
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from multiprocessing.pool import ThreadPool
 from time import sleep, time
 
@@ -9,8 +10,8 @@ import pytest
 
 import dask
 from dask.system import CPU_COUNT
-from dask.threaded import get
-from dask.utils_test import add, inc
+from dask.threaded import get, get_stealing
+from dask.utils_test import GetFunctionTestMixin, add, inc
 
 
 def test_get():
@@ -176,3 +177,104 @@ def test_interrupt():
         get(dsk, "x")
     stop = time()
     assert stop < start + 6
+
+
+class TestGetStealing(GetFunctionTestMixin):
+    get = staticmethod(get_stealing)
+
+
+def test_get_stealing():
+    dsk = {("x", i): (inc, i) for i in range(100)}
+    dsk.update({("y", i): (add, ("x", i), ("x", (i + 1) % 100)) for i in range(100)})
+    dsk["z"] = (sum, [("y", i) for i in range(100)])
+    expected = get(dsk, "z")
+    for num_workers in [1, 2, 4]:
+        assert get_stealing(dsk, "z", num_workers=num_workers) == expected
+    assert get_stealing(dsk, ["z", ("x", 0)]) == (expected, 1)
+
+
+def test_get_stealing_uses_all_workers():
+    def f():
+        sleep(0.01)
+        return threading.get_ident()
+
+    dsk = {("x", i): (f,) for i in range(30)}
+    dsk["x"] = (len, (set, [("x", i) for i in range(len(dsk))]))
+
+    with ThreadPoolExecutor(3) as pool:
+        assert get_stealing(dsk, "x", pool=pool) == 3
+
+
+def test_get_stealing_exceptions():
+    dsk = {("x", i): (inc, i) for i in range(10)}
+    dsk["y"] = (bad, ("x", 0))
+    dsk["z"] = (add, "y", ("x", 1))
+    with pytest.raises(ValueError):
+        get_stealing(dsk, "z", num_workers=4)
+
+
+@pytest.mark.parametrize("get", [get, get_stealing])
+def test_get_stealing_callbacks(get):
+    # The work-stealing scheduler calls callbacks like the threaded one does
+    from dask.callbacks import Callback
+
+    dsk = {("x", i): (inc, i) for i in range(20)}
+    dsk["y"] = (sum, list(dsk))
+    events = []
+
+    def start(dsk):
+        events.append(("start", None))
+
+    def start_state(dsk, state):
+        assert sorted(state["ready"], key=str) == sorted(dsk.keys() - {"y"}, key=str)
+        events.append(("start_state", None))
+
+    def pretask(key, dsk, state):
+        assert key in state["running"]
+        assert all(dep in state["cache"] for dep in state["dependencies"][key])
+        events.append(("pretask", key))
+
+    def posttask(key, result, dsk, state, worker_id):
+        # Called after finish_task: "y" is ready once all of the "x" finished,
+        # and their data is released once "y" finished
+        assert key in state["finished"] and key not in state["running"]
+        assert result == (sum(range(1, 21)) if key == "y" else key[1] + 1)
+        if key == "y":
+            assert not any(dep in state["cache"] for dep in state["dependencies"]["y"])
+        else:
+            ready = "y" in state["ready"] or "y" in state["running"]
+            assert ready == (len(state["finished"]) == 20)
+        events.append(("posttask", key))
+
+    def finish(dsk, state, errored):
+        assert state["finished"] == dsk.keys()
+        events.append(("finish", errored))
+
+    with Callback(start, start_state, pretask, posttask, finish):
+        assert get(dsk, "y", num_workers=4) == sum(range(1, 21))
+
+    assert events[:2] == [("start", None), ("start_state", None)]
+    assert events[-3:] == [("pretask", "y"), ("posttask", "y"), ("finish", False)]
+    tasks = events[2:-3]
+    assert len(tasks) == 2 * 20
+    for i in range(20):
+        assert tasks.index(("pretask", ("x", i))) < tasks.index(("posttask", ("x", i)))
+
+
+def test_get_stealing_rejects_process_pools():
+    dsk = {"x": (inc, 1)}
+    with multiprocessing.Pool(1) as pool:
+        with pytest.raises(TypeError, match="ThreadPool"):
+            get_stealing(dsk, "x", pool=pool)
+    with ProcessPoolExecutor(1) as pool:
+        with pytest.raises(TypeError, match="ThreadPool"):
+            get_stealing(dsk, "x", pool=pool)
+    with ThreadPool(2) as pool:
+        assert get_stealing(dsk, "x", pool=pool) == 2
+
+
+def test_get_stealing_scheduler_name():
+    x = dask.delayed(inc)(1)
+    assert x.compute(scheduler="work-stealing") == 2
+    with dask.config.set(scheduler="work-stealing"):
+        assert dask.delayed(add)(x, x).compute() == 4
@@ -15,7 +15,7 @@ from concurrent.futures import Executor, ThreadPoolExecutor
 from threading import Lock, current_thread
 
 from dask import config
-from dask.local import MultiprocessingPoolExecutor, get_async
+from dask.local import MultiprocessingPoolExecutor, get_async, get_async_stealing
 from dask.system import CPU_COUNT
 
 
@@ -65,6 +65,92 @@ def get(
     >>> get(dsk, ['w', 'y'])
     (4, 2)
     """
+    pool = _get_pool(pool, num_workers)
+    thread = current_thread()
+
+    results = get_async(
+        pool.submit,
+        pool._max_workers,
+        dsk,
+        keys,
+        cache=cache,
+        get_id=_thread_get_id,
+        pack_exception=pack_exception,
+        **kwargs,
+    )
+
+    _cleanup_pools(thread)
+
+    return results
+
+
+def get_stealing(
+    dsk: Mapping,
+    keys: Sequence[Hashable] | Hashable,
+    cache=None,
+    num_workers=None,
+    pool=None,
+    **kwargs,
+):
+    """Threaded work-stealing implementation of dask.get
+
+    Like ``get``, but every thread keeps its own deque of ready tasks, starts
+    dependent tasks directly when it finishes a task and steals work from
+    other threads when it runs dry.  This avoids the central scheduling loop
+    of ``get``, which helps on graphs of many small tasks and many cores.
+
+    Selected with ``scheduler="work-stealing"``.
+
+    Parameters
+    ----------
+
+    dsk: dict
+        A dask dictionary specifying a workflow
+    keys: key or list of keys
+        Keys corresponding to desired data
+    num_workers: integer of thread count
+        The number of threads to use in the ThreadPool that will actually execute tasks
+    cache: dict-like (optional)
+        Temporary storage of results
+
+    Examples
+    --------
+    >>> inc = lambda x: x + 1
+    >>> add = lambda x, y: x + y
+    >>> dsk = {'x': 1, 'y': 2, 'z': (inc, 'x'), 'w': (add, 'z', 'y')}
+    >>> get_stealing(dsk, 'w')
+    4
+    >>> get_stealing(dsk, ['w', 'y'])
+    (4, 2)
+
+    See Also
+    --------
+    dask.local.get_async_stealing
+    """
+    pool = _get_pool(pool, num_workers, threads_only=True)
+    thread = current_thread()
+
+    results = get_async_stealing(
+        pool.submit,
+        pool._max_workers,
+        dsk,
+        keys,
+        cache=cache,
+        get_id=_thread_get_id,
+        **kwargs,
+    )
+
+    _cleanup_pools(thread)
+
+    return results
+
+
+def _get_pool(pool, num_workers, threads_only=False):
+    """Find or create the executor to run on for the current thread
+
+    With ``threads_only``, raise a ``TypeError`` for pools that do not run
+    their tasks in threads of this process.
+    """
     global default_pool
     pool = pool or config.get("pool", None)
     num_workers = num_workers or config.get("num_workers", None)
@@ -83,21 +169,21 @@ def get(
                 pool = ThreadPoolExecutor(num_workers)
                 atexit.register(pool.shutdown)
                 pools[thread][num_workers] = pool
+        elif threads_only and not isinstance(
+            pool, (ThreadPoolExecutor, multiprocessing.pool.ThreadPool)
+        ):
+            raise TypeError(
+                "The work-stealing scheduler shares its state between workers, "
+                "it needs a ThreadPoolExecutor or a multiprocessing ThreadPool, "
+                f"got {type(pool).__name__}"
+            )
         elif isinstance(pool, multiprocessing.pool.Pool):
             pool = MultiprocessingPoolExecutor(pool)
+    return pool
 
-    results = get_async(
-        pool.submit,
-        pool._max_workers,
-        dsk,
-        keys,
-        cache=cache,
-        get_id=_thread_get_id,
-        pack_exception=pack_exception,
-        **kwargs,
-    )
 
-    # Cleanup pools associated to dead threads
+def _cleanup_pools(thread):
+    """Cleanup pools associated to dead threads"""
     with pools_lock:
         active_threads = set(threading.enumerate())
         if thread is not main_thread:
@@ -105,5 +191,3 @@ def get(
                 if t not in active_threads:
                     for p in pools.pop(t).values():
                         p.shutdown()
-
-    return results
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import codecs
 import functools
+import gc
 import inspect
 import os
 import re
@@ -305,6 +306,23 @@ def tmp_cwd(dir=None):
             yield dirname
 
 
+@contextmanager
+def _gc_paused(pause=True):
+    """Disable the garbage collector within this context, if enabled
+
+    Building large graphs creates many containers, which triggers the
+    collector over and over although none of them are garbage.
+    """
+    enabled = pause and gc.isenabled()
+    if enabled:
+        gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 class IndexCallable:
     """Provide getitem syntax for functions
 
@@ -1832,6 +1850,16 @@ def key_split(s):
         s = s.decode()
     if type(s) is tuple:
         s = s[0]
+    try:
+        return _key_split(s)
+    except TypeError:  # not hashable
+        return "Other"
+
+
+@lru_cache(maxsize=100_000)
+def _key_split(s):
+    # Keys of a collection share their name, so fusing or ordering large
+    # graphs splits the same strings over and over
     try:
         words = s.split("-")
         if not words[0][0].isalpha():